@@ -1,18 +1,78 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from datetime import datetime
+from functools import wraps
+from hashlib import sha1
+import gzip
 import json
 import os
+import uuid
+from tempfile import SpooledTemporaryFile
 from werkzeug.utils import secure_filename
-from models import Project, Task, Employee
+from models import (Project, Task, Employee, WorkCalendar, dependency_names, format_ordinal, pattern_to_mask,
+                    whole_number)
+from date_ranges import to_ordinal
+from holiday_rules import parse_holiday_entries
 from excel_export import export_to_excel
+from export_jobs import ExportJobs, ExportQueueFullError
 from excel_import import import_from_excel, ExcelImportError
+from schedule_cache import ScheduleCache
+from project_registry import ProjectRegistry, UnknownProjectError
+from project_store import ProjectStore
+from schedule_snapshot import moved_tasks, publish
+from schedule_events import ScheduleEvents
+from response_cache import ResponseCache
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = '/tmp'
-
-# In-memory storage for the current project
-current_project = None
+app.config['SCHEDULE_CACHE_BYTES'] = 64 * 1024 * 1024  # memory bound of the schedule cache
+app.config['SCHEDULE_WORKERS'] = 1  # processes scheduling independent task groups (1: none; None: one per CPU)
+app.config['FORECAST_MAX_TRIALS'] = 100000  # upper bound on Monte Carlo trials per request
+app.config['MAX_PROJECTS'] = 100  # projects held in memory; the least recently used are evicted
+app.config['PROJECT_IDLE_TIMEOUT'] = 3600  # seconds before an unused project is evicted (None: never)
+app.config['RESPONSE_CACHE_BYTES'] = 32 * 1024 * 1024  # memory bound of the serialized Gantt responses
+app.config['GZIP_MIN_BYTES'] = 1024  # smaller responses are sent uncompressed
+app.config['EXPORT_WORKERS'] = 2  # threads running background Excel exports
+app.config['EXPORT_MAX_PENDING'] = 16  # background exports waiting for a thread before new ones are refused
+app.config['EXPORT_EXPIRY'] = 600  # seconds a finished background export can be downloaded
+app.config['EXPORT_SPOOL_BYTES'] = 8 * 1024 * 1024  # workbooks beyond this size go to an anonymous temporary file
+app.config['EVENTS_HISTORY'] = 100  # events kept per project for clients reconnecting with Last-Event-ID
+app.config['EVENTS_MAX_QUEUED'] = 100  # events waiting for a slow client before it is told to reload instead
+app.config['EVENTS_KEEPALIVE'] = 15  # seconds between comments keeping an idle event stream open
+app.config['PROJECT_DATABASE'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'projects.db')
+
+# Projects are written through to SQLite and loaded back on first access
+# after a restart or an eviction from memory
+store = ProjectStore(app.config['PROJECT_DATABASE'])
+
+
+def load_project(project_id):
+    """Load a stored project, publishing its stored schedule for readers."""
+    project = store.load_project(project_id)
+    if project is not None and project.tasks and project.schedule_is_current():
+        publish(project)
+    return project
+
+
+# In-memory storage of the projects, by project ID
+projects = ProjectRegistry(app.config['MAX_PROJECTS'], app.config['PROJECT_IDLE_TIMEOUT'],
+                           loader=load_project)
+
+# Computed schedules by a hash of their inputs, so recalculating unchanged
+# or earlier inputs skips the scheduler
+schedule_cache = ScheduleCache(app.config['SCHEDULE_CACHE_BYTES'])
+
+# Serialized Gantt responses by ETag, which names the snapshot serial and
+# the query; SERVER_TOKEN tells apart the serials of another server run
+gantt_cache = ResponseCache(app.config['RESPONSE_CACHE_BYTES'])
+SERVER_TOKEN = uuid.uuid4().hex[:8]
+
+export_jobs = ExportJobs(app.config['EXPORT_WORKERS'], app.config['EXPORT_MAX_PENDING'],
+                         app.config['EXPORT_EXPIRY'], app.config['EXPORT_SPOOL_BYTES'])
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Project and schedule changes pushed to the clients of /events
+events = ScheduleEvents(SERVER_TOKEN, app.config['EVENTS_HISTORY'], app.config['EVENTS_MAX_QUEUED'])
 
 
 @app.route('/')
@@ -21,12 +81,69 @@ def index():
     return render_template('index.html')
 
 
-@app.route('/api/project', methods=['POST'])
-def create_project():
-    """Create or update the project with basic information."""
-    global current_project
+def with_project(view):
+    """Pass the ID and the project addressed by the URL to a view, holding its lock."""
+    @wraps(view)
+    def wrapper(project_id, **kwargs):
+        try:
+            with projects.checkout(project_id) as project:
+                return view(project_id, project, **kwargs)
+        except UnknownProjectError:
+            return jsonify({'error': 'Project not found'}), 404
+    return wrapper
+
+
+def with_schedule(view):
+    """
+    Pass the ID and the last published schedule snapshot of the project
+    addressed by the URL to a view. The project is not locked, so readers
+    are not held up by a recalculation.
+    """
+    @wraps(view)
+    def wrapper(project_id, **kwargs):
+        try:
+            snapshot = projects.get(project_id).schedule_snapshot
+        except UnknownProjectError:
+            return jsonify({'error': 'Project not found'}), 404
+        if snapshot is None:
+            return jsonify({'error': 'Schedule not calculated'}), 400
+        return view(project_id, snapshot, **kwargs)
+    return wrapper
 
-    data = request.json
+
+@app.route('/api/projects', methods=['GET'])
+def get_project_stats():
+    """Get the project registry counters for monitoring."""
+    return jsonify(projects.stats())
+
+
+@app.route('/api/projects', methods=['POST'])
+def create_project():
+    """Create a project with basic information."""
+    project = Project('Unnamed Project', datetime.now())
+    error = _apply_project_info(project, request.json)
+    if error:
+        return error
+    project_id = projects.add(project)
+    store.save_project(project_id, project)
+    return jsonify({'message': 'Project created successfully', 'project_id': project_id, 'name': project.name})
+
+
+@app.route('/api/projects/<project_id>', methods=['POST'])
+@with_project
+def update_project(project_id, project):
+    """Update the project's basic information."""
+    # Update in place so that an unchanged schedule is not recomputed
+    error = _apply_project_info(project, request.json)
+    if error:
+        return error
+    store.save_info(project_id, project)
+    _project_changed(project_id, project, 'info')
+    return jsonify({'message': 'Project updated successfully', 'name': project.name})
+
+
+def _apply_project_info(project, data):
+    """Set a project's name, start date, holidays, calendars and mode; returns an error response or None."""
     project_name = data.get('name', 'Unnamed Project')
     start_date_str = data.get('start_date')
 
@@ -35,117 +152,579 @@ def create_project():
     except (ValueError, TypeError):
         return jsonify({'error': 'Invalid start date format. Use YYYY-MM-DD'}), 400
 
-    current_project = Project(project_name, start_date)
-
-    # Add global holidays if provided
-    global_holidays = data.get('global_holidays', [])
-    for holiday in global_holidays:
-        current_project.add_global_holiday(holiday)
-
-    return jsonify({'message': 'Project created successfully', 'name': project_name})
-
-
-@app.route('/api/employees', methods=['POST'])
-def add_employees():
+    # Holidays are single dates, inclusive ranges ('YYYY-MM-DD/YYYY-MM-DD')
+    # or recurring rules ('yearly 25/12', 'last Monday of May', 'Easter+1')
+    try:
+        global_holidays, holiday_rules = parse_holiday_entries(data.get('global_holidays', []))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid global holiday format. Use YYYY-MM-DD, YYYY-MM-DD/YYYY-MM-DD '
+                                 'or a recurring rule such as "yearly 25/12"'}), 400
+
+    # Shared calendars: [{name, work_pattern, holidays}, ...]
+    calendars = None
+    if 'calendars' in data:
+        calendars = []
+        for cal_data in data['calendars'] or []:
+            calendar = WorkCalendar(cal_data['name'], cal_data.get('work_pattern'))
+            try:
+                holidays, rules = parse_holiday_entries(cal_data.get('holidays', []))
+            except (ValueError, TypeError):
+                return jsonify({'error': f'Invalid holiday for calendar "{calendar.name}". Use YYYY-MM-DD, '
+                                         f'YYYY-MM-DD/YYYY-MM-DD or a recurring rule such as "yearly 25/12"'}), 400
+            calendar.set_holidays(holidays)
+            calendar.set_holiday_rules(rules)
+            calendars.append(calendar)
+
+    project.name = project_name
+    project.start_date = start_date
+    project.set_global_holidays(global_holidays)
+    project.set_global_holiday_rules(holiday_rules)
+    if calendars is not None:
+        project.set_calendars(calendars)
+    if 'resource_levelling' in data:
+        project.resource_levelling = bool(data['resource_levelling'])
+    return None
+
+
+@app.route('/api/projects/<project_id>/employees', methods=['POST'])
+@with_project
+def add_employees(project_id, project):
     """Add employees to the project."""
-    global current_project
-
-    if not current_project:
-        return jsonify({'error': 'Project not initialized'}), 400
-
     data = request.json
     employees_data = data.get('employees', [])
 
-    # Clear existing employees to avoid duplicates when resubmitting
-    current_project.employees.clear()
-
-    for emp_data in employees_data:
-        emp = Employee(emp_data['name'])
-
-        # Set work pattern if provided (list of weekday numbers)
-        if 'work_pattern' in emp_data:
-            emp.set_work_pattern(emp_data['work_pattern'])
-
-        # Add individual holidays if provided
-        if 'holidays' in emp_data:
-            for holiday in emp_data['holidays']:
-                emp.add_holiday(holiday)
+    try:
+        employees = [_parse_employee(project, emp_data) for emp_data in employees_data]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        current_project.add_employee(emp)
+    # Replace the employee list; unchanged employees keep their schedules
+    project.set_employees(employees)
+    store.save_employees(project_id, project)
+    _project_changed(project_id, project, 'employees')
 
     return jsonify({'message': f'{len(employees_data)} employee(s) added successfully'})
 
 
-@app.route('/api/tasks', methods=['POST'])
-def add_tasks():
-    """Add tasks to the project."""
-    global current_project
+@app.route('/api/projects/<project_id>/employees', methods=['PATCH'])
+@with_project
+def patch_employees(project_id, project):
+    """
+    Change several employees at once: {"employees": {name: fields or null}}.
 
-    if not current_project:
-        return jsonify({'error': 'Project not initialized'}), 400
+    null deletes the employee, fields create it or update the fields given
+    (as PATCH of a single employee does). Nothing changes if any entry is
+    invalid.
+    """
+    try:
+        changes = _bulk_changes('employees')
+        employees = [_parse_employee(project, dict(fields, name=name), project.employees.get(name))
+                     for name, fields in changes.items() if fields is not None]
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    deleted = [name for name, fields in changes.items() if fields is None]
+    missing = [name for name in deleted if name not in project.employees]
+    if missing:
+        return jsonify({'error': f'Employee "{missing[0]}" not found'}), 404
+
+    for name in deleted:
+        project.remove_employee(name)
+    changed = [project.put_employee(employee) for employee in employees]
+    store.save_employee_changes(project_id, changed, deleted)
+    _project_changed(project_id, project, 'employees')
+    return jsonify({'message': f'{len(changes)} employee change(s) applied successfully'})
+
+
+@app.route('/api/projects/<project_id>/employees/<name>', methods=['PUT', 'PATCH'])
+@with_project
+def put_employee(project_id, project, name):
+    """
+    Create or replace one employee (PUT), or change the fields given of an
+    existing one (PATCH). Only the tasks of an employee whose calendar, work
+    pattern or holidays changed are rescheduled.
+    """
+    existing = project.employees.get(name)
+    if request.method == 'PATCH' and existing is None:
+        return jsonify({'error': 'Employee not found'}), 404
+    try:
+        employee = _parse_employee(project, dict(_request_fields(), name=name),
+                                   existing if request.method == 'PATCH' else None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    employee = project.put_employee(employee)
+    store.save_employee_changes(project_id, [employee])
+    _project_changed(project_id, project, 'employees')
+    return jsonify({'message': f'Employee "{name}" {"created" if existing is None else "updated"} successfully'})
+
+
+@app.route('/api/projects/<project_id>/employees/<name>', methods=['DELETE'])
+@with_project
+def delete_employee(project_id, project, name):
+    """Remove one employee; their tasks can't be scheduled until reassigned."""
+    if name not in project.employees:
+        return jsonify({'error': 'Employee not found'}), 404
+    project.remove_employee(name)
+    store.save_employee_changes(project_id, deleted=[name])
+    _project_changed(project_id, project, 'employees')
+    return jsonify({'message': f'Employee "{name}" deleted successfully'})
+
+
+def _request_fields():
+    """The fields of a single item edit: the JSON object of the body. Raises ValueError for anything else."""
+    fields = request.get_json(silent=True)
+    if fields is None:
+        return {}
+    if not isinstance(fields, dict):
+        raise ValueError('Expected a JSON object of fields')
+    return fields
+
+
+def _bulk_changes(key):
+    """
+    The entries of a bulk PATCH body, {key: {name: fields or null}}.
+    Raises ValueError if the body has another shape.
+    """
+    body = request.get_json(silent=True)
+    changes = body.get(key, {}) if isinstance(body, dict) else None
+    if not isinstance(changes, dict) or any(fields is not None and not isinstance(fields, dict)
+                                            for fields in changes.values()):
+        raise ValueError(f'Expected {{"{key}": {{name: fields or null}}}}')
+    return changes
+
+
+def _parse_employee(project, emp_data, existing=None):
+    """
+    Build an Employee from request data. Fields left out are taken from
+    existing, if given. Raises ValueError with a message for the client.
+    """
+    if not emp_data.get('name'):
+        raise ValueError('Employee name is required')
+    if 'calendar' in emp_data:
+        calendar_name = emp_data['calendar'] or None
+    else:
+        calendar_name = existing.calendar if existing is not None else None
+    emp = Employee(emp_data['name'], calendar_name)
+    calendar = project.calendars.get(emp.calendar) if emp.calendar else None
+    if emp.calendar and calendar is None:
+        raise ValueError(f'Calendar "{emp.calendar}" not found for employee "{emp.name}"')
+
+    # Set work pattern if provided (list of weekday numbers); a pattern
+    # identical to the employee's calendar is not a personal override
+    if 'work_pattern' in emp_data:
+        if calendar is None or pattern_to_mask(emp_data['work_pattern']) != calendar.work_mask:
+            emp.set_work_pattern(emp_data['work_pattern'])
+    elif existing is not None and existing.work_mask_override is not None:
+        emp.set_work_pattern(existing.work_pattern)
 
+    # Add individual holidays if provided (single dates, date ranges or recurring rules)
+    if 'holidays' in emp_data:
+        try:
+            holidays, holiday_rules = parse_holiday_entries(emp_data['holidays'])
+        except (ValueError, TypeError):
+            raise ValueError(f'Invalid holiday for employee "{emp.name}". Use YYYY-MM-DD, '
+                             f'YYYY-MM-DD/YYYY-MM-DD or a recurring rule such as "yearly 25/12"')
+        emp.set_holidays(holidays)
+        emp.set_holiday_rules(holiday_rules)
+    elif existing is not None:
+        emp.set_holidays(existing.holidays)
+        emp.set_holiday_rules(existing.holiday_rules)
+    return emp
+
+
+@app.route('/api/projects/<project_id>/tasks', methods=['POST'])
+@with_project
+def add_tasks(project_id, project):
+    """Add tasks to the project."""
     data = request.json
     tasks_data = data.get('tasks', [])
 
-    # Clear existing tasks to avoid duplicates when resubmitting
-    current_project.tasks.clear()
-
-    for task_data in tasks_data:
-        task = Task(
-            name=task_data['name'],
-            estimated_duration=task_data['estimated_duration'],
-            assigned_to=task_data['assigned_to']
-        )
+    try:
+        tasks = [_parse_task(task_data) for task_data in tasks_data]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        # Set optional fields
-        if 'dependency' in task_data and task_data['dependency']:
-            task.dependency = task_data['dependency']
+    # Replace the task list; only new or edited tasks get rescheduled
+    project.set_tasks(tasks)
+    store.save_tasks(project_id, project)
+    _project_changed(project_id, project, 'tasks')
 
-        task.availability = task_data.get('availability', 100)
-        task.contingency_margin = task_data.get('contingency_margin', 0)
+    return jsonify({'message': f'{len(tasks_data)} task(s) added successfully'})
 
-        # Set custom start date if provided
-        if 'custom_start_date' in task_data and task_data['custom_start_date']:
-            try:
-                task.custom_start_date = datetime.strptime(task_data['custom_start_date'], '%Y-%m-%d')
-            except (ValueError, TypeError):
-                return jsonify({'error': f'Invalid custom start date for task "{task.name}". Use YYYY-MM-DD format'}), 400
 
-        current_project.add_task(task)
+@app.route('/api/projects/<project_id>/tasks', methods=['PATCH'])
+@with_project
+def patch_tasks(project_id, project):
+    """
+    Change several tasks at once: {"tasks": {name: fields or null}}.
 
-    return jsonify({'message': f'{len(tasks_data)} task(s) added successfully'})
+    null deletes the task, fields create it (appended at the end) or update
+    the fields given, which may include a new name. Deletions are applied
+    first. Nothing changes if any entry is invalid.
+    """
+    try:
+        changes = _bulk_changes('tasks')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    deleted = [name for name, fields in changes.items() if fields is None]
+    missing = [name for name in deleted if project.task_position(name) is None]
+    if missing:
+        return jsonify({'error': f'Task "{missing[0]}" not found'}), 404
 
+    edits = []
+    claimed = set()
+    try:
+        for name, fields in changes.items():
+            if fields is None:
+                continue
+            if project.task_position(name) is None:
+                edits.append((name, _parse_task(dict(fields, name=name))))
+            else:
+                updates = _task_updates(fields, name)
+                _check_rename(project, name, updates, changes, claimed)
+                edits.append((name, updates))
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
 
-@app.route('/api/calculate', methods=['POST'])
-def calculate_schedule():
+    project.remove_tasks(deleted)
+    changed = []
+    for name, edit in edits:
+        if isinstance(edit, Task):
+            changed.append((name, project.add_task(edit)))
+        else:
+            task = project.get_task(name)
+            for field, value in edit.items():
+                setattr(task, field, value)
+            changed.append((name, task))
+    store.save_task_changes(project_id, changed, deleted)
+    _project_changed(project_id, project, 'tasks')
+    return jsonify({'message': f'{len(changes)} task change(s) applied successfully'})
+
+
+@app.route('/api/projects/<project_id>/tasks/<name>', methods=['PUT'])
+@with_project
+def put_task(project_id, project, name):
+    """Create or replace one task; an existing task keeps its schedule if nothing changed."""
+    created = project.task_position(name) is None
+    try:
+        task = _parse_task(dict(_request_fields(), name=name))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    task = project.put_task(task)
+    store.save_task_changes(project_id, [(name, task)])
+    _project_changed(project_id, project, 'tasks')
+    return jsonify({'message': f'Task "{name}" {"created" if created else "updated"} successfully'})
+
+
+@app.route('/api/projects/<project_id>/tasks/<name>', methods=['PATCH'])
+@with_project
+def patch_task(project_id, project, name):
+    """Change the fields given of one task, which may include a new name."""
+    task = project.get_task(name)
+    if task is None:
+        return jsonify({'error': 'Task not found'}), 404
+    try:
+        updates = _task_updates(_request_fields(), name)
+        _check_rename(project, name, updates)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    for field, value in updates.items():
+        setattr(task, field, value)
+    store.save_task_changes(project_id, [(name, task)])
+    _project_changed(project_id, project, 'tasks')
+    return jsonify({'message': f'Task "{name}" updated successfully'})
+
+
+@app.route('/api/projects/<project_id>/tasks/<name>', methods=['DELETE'])
+@with_project
+def delete_task(project_id, project, name):
+    """Remove one task; tasks that depend on it can't be scheduled until changed."""
+    if project.task_position(name) is None:
+        return jsonify({'error': 'Task not found'}), 404
+    project.remove_task(name)
+    store.save_task_changes(project_id, deleted=[name])
+    _project_changed(project_id, project, 'tasks')
+    return jsonify({'message': f'Task "{name}" deleted successfully'})
+
+
+def _parse_task(task_data):
+    """Build a Task from request data. Raises ValueError with a message for the client."""
+    if any(task_data.get(field) in (None, '') for field in ('name', 'estimated_duration', 'assigned_to')):
+        raise ValueError('A task needs a name, estimated_duration and assigned_to')
+    updates = _task_updates(task_data)
+    task = Task(
+        name=updates.pop('name'),
+        estimated_duration=updates.pop('estimated_duration'),
+        assigned_to=updates.pop('assigned_to')
+    )
+    for field, value in updates.items():
+        setattr(task, field, value)
+    return task
+
+
+def _task_updates(task_data, name=''):
+    """
+    The task attributes to set for the fields present in request data of
+    task name, checked so that setting them cannot fail. Raises ValueError
+    with a message for the client.
+    """
+    task_name = task_data.get('name', name)
+    updates = {}
+    for field in ('name', 'assigned_to'):
+        if field in task_data:
+            if not isinstance(task_data[field], str) or not task_data[field]:
+                raise ValueError(f'Task {field} must be a non-empty string')
+            updates[field] = task_data[field]
+    for field in ('estimated_duration', 'availability', 'contingency_margin'):
+        if field in task_data:
+            try:
+                updates[field] = whole_number(task_data[field])
+            except ValueError:
+                raise ValueError(f'Invalid {field} for task "{task_name}". Use a whole number')
+
+    # One antecedent name or a list of names
+    if 'dependency' in task_data:
+        dependency = task_data['dependency'] or None
+        if not (dependency is None or isinstance(dependency, str)
+                or (isinstance(dependency, list) and all(isinstance(name, str) for name in dependency))):
+            raise ValueError(f'Invalid dependency for task "{task_name}". Use a task name or a list of names')
+        updates['dependency'] = dependency
+
+    if 'custom_start_date' in task_data:
+        try:
+            updates['custom_start_day'] = (datetime.strptime(task_data['custom_start_date'], '%Y-%m-%d').toordinal()
+                                           if task_data['custom_start_date'] else None)
+        except (ValueError, TypeError):
+            raise ValueError(f'Invalid custom start date for task "{task_data.get("name", "")}". '
+                             f'Use YYYY-MM-DD format')
+    return updates
+
+
+def _check_rename(project, name, updates, changes=None, claimed=None):
+    """
+    Raise ValueError if updates rename a task to the name of another one.
+    In a bulk patch, changes are all its entries (a task it deletes frees
+    its name) and claimed collects the new names taken so far.
+    """
+    new_name = updates.get('name', name)
+    if new_name == name:
+        return
+    if changes is not None and new_name in changes:
+        taken = changes[new_name] is not None
+    else:
+        taken = project.task_position(new_name) is not None
+    if taken or (claimed is not None and new_name in claimed):
+        raise ValueError(f'Task "{new_name}" already exists')
+    if claimed is not None:
+        claimed.add(new_name)
+
+
+@app.route('/api/projects/<project_id>/calculate', methods=['POST'])
+@with_project
+def calculate_schedule(project_id, project):
     """Calculate the project schedule."""
-    global current_project
-
-    if not current_project:
-        return jsonify({'error': 'Project not initialized'}), 400
-
-    if not current_project.tasks:
+    if not project.tasks:
         return jsonify({'error': 'No tasks defined'}), 400
 
+    project.schedule_workers = app.config['SCHEDULE_WORKERS']
     try:
-        current_project.calculate_schedule()
-        return jsonify({'message': 'Schedule calculated successfully'})
+        cached = schedule_cache.calculate(project)
+        store.save_schedule(project_id, project)
+        previous = project.schedule_snapshot
+        snapshot = publish(project)
+        events.publish(project_id, 'schedule', _schedule_event(previous, snapshot))
+        return jsonify({'message': 'Schedule calculated successfully', 'cached': cached,
+                        'version': snapshot.version})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 
-@app.route('/api/gantt', methods=['GET'])
-def get_gantt_data():
-    """Get the Gantt chart data for visualization."""
-    global current_project
+def _project_changed(project_id, project, changed):
+    """Tell the clients of /events that the project's info, employees or tasks changed."""
+    snapshot = project.schedule_snapshot
+    events.publish(project_id, 'project', {
+        'changed': changed,
+        'version': snapshot.version if snapshot is not None else None,
+        'schedule_current': project.schedule_is_current(),
+    })
+
+
+def _schedule_event(previous, snapshot):
+    """
+    The data of a 'schedule' event: the new version and date range, and
+    the tasks that moved since the previous snapshot in the layout of
+    /gantt?format=columns (days as offsets from start_date, flat spans),
+    with their names; removed lists the names of the tasks that are gone.
+    Offsets are from the new start_date, so a client showing another start
+    date needs the whole Gantt again.
+    """
+    moved, removed = moved_tasks(previous, snapshot)
+    start_day, end_day = snapshot.get_day_range()
+
+    def offset_of(day):
+        return day - start_day if day is not None else None
+
+    def spans(days):
+        flat = []
+        for start, length in days.spans():
+            flat += (start - start_day, length)
+        return flat
+
+    tasks = [snapshot.tasks[position] for position in moved]
+    return {
+        'version': snapshot.version,
+        'start_date': format_ordinal(start_day),
+        'end_date': format_ordinal(end_day) if end_day else None,
+        'total': len(snapshot.tasks),
+        'moved': {
+            'index': moved,
+            'name': [task.name for task in tasks],
+            'start': [offset_of(task.start_day) for task in tasks],
+            'end': [offset_of(task.end_day) for task in tasks],
+            'working_spans': [spans(task.working_days) for task in tasks],
+            'holiday_spans': [spans(task.holiday_days) for task in tasks],
+            'total_float': [task.total_float for task in tasks],
+            'free_float': [task.free_float for task in tasks],
+        },
+        'removed': removed,
+    }
+
 
-    if not current_project:
-        return jsonify({'error': 'Project not initialized'}), 400
+@app.route('/api/projects/<project_id>/events', methods=['GET'])
+def stream_events(project_id):
+    """
+    Server-sent events of a project, for clients to follow its changes
+    without polling: 'schedule' when it is recalculated (with the tasks
+    that moved, see _schedule_event()), 'project' when its info, employees
+    or tasks are edited, 'deleted' when it is deleted, and 'reset' when
+    the client missed events and should reload the whole Gantt instead.
+    A client reconnecting with Last-Event-ID gets the events it missed.
+    """
+    try:
+        projects.get(project_id)
+    except UnknownProjectError:
+        return jsonify({'error': 'Project not found'}), 404
+    last_event_id = request.headers.get('Last-Event-ID')
+    keepalive = app.config['EVENTS_KEEPALIVE']
+
+    def stream():
+        # Subscribed once streaming starts, so that finally always unsubscribes
+        subscription = events.subscribe(project_id, last_event_id)
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                event = subscription.get(timeout=keepalive)
+                # A comment line keeps proxies from closing an idle stream
+                yield event.text if event is not None else ': keep-alive\n\n'
+                if event is not None and event.type == 'deleted':
+                    return
+        finally:
+            events.unsubscribe(project_id, subscription)
+
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+    return response
+
+
+@app.route('/api/cache', methods=['GET'])
+def get_cache_stats():
+    """Get the schedule cache counters for monitoring (and those of the Gantt response cache and event streams)."""
+    stats = schedule_cache.stats()
+    stats['responses'] = gantt_cache.stats()
+    stats['event_streams'] = events.stats()
+    return jsonify(stats)
+
+
+@app.route('/api/projects/<project_id>/gantt', methods=['GET'])
+@with_schedule
+def get_gantt_data(project_id, snapshot):
+    """
+    Get the Gantt chart data of the last calculated schedule for visualization.
+
+    Optional query parameters select part of the chart: from and to
+    (YYYY-MM-DD) keep the tasks scheduled on any day of that window,
+    assignee keeps one employee's tasks, and offset and limit page through
+    what is left. With a window, the working and holiday spans are clipped
+    to it unless clip=0.
+
+    format=columns asks for the compact layout of _gantt_columns() instead
+    of a list of task objects. Responses are gzip-compressed for clients
+    that accept it.
+
+    The response carries an ETag for the snapshot version and query; a
+    client sending it back in If-None-Match gets 304 Not Modified until the
+    schedule is recalculated. Bodies are serialized (and compressed) once
+    per version and query and kept in gantt_cache.
+    """
+    try:
+        first_day = to_ordinal(request.args['from']) if request.args.get('from') else None
+        last_day = to_ordinal(request.args['to']) if request.args.get('to') else None
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args['limit']) if request.args.get('limit') else None
+    except ValueError:
+        return jsonify({'error': 'Invalid query: from and to are YYYY-MM-DD dates, offset and limit numbers'}), 400
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({'error': 'Offset and limit must not be negative'}), 400
+    layout = request.args.get('format', 'tasks')
+    if layout not in ('tasks', 'columns'):
+        return jsonify({'error': 'Format must be tasks or columns'}), 400
+    windowed = first_day is not None or last_day is not None
+    clip = windowed and request.args.get('clip', '1').lower() not in ('0', 'false', 'no')
+    assignee = request.args.get('assignee')
+
+    query = repr((first_day, last_day, assignee, offset, limit, clip, layout)).encode()
+    etag = f"{SERVER_TOKEN}-{snapshot.serial}-{sha1(query).hexdigest()[:16]}"
+    # The compressed body is another representation, with its own tag
+    compress = request.accept_encodings['gzip'] > 0
+    if compress:
+        etag += '-gzip'
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        body = gantt_cache.get((project_id, etag))
+        if body is None:
+            build = _gantt_columns if layout == 'columns' else _gantt_data
+            body = app.json.dumps(build(snapshot, first_day, last_day, assignee, offset, limit, clip),
+                                  separators=(',', ':')).encode()
+            if compress and len(body) >= app.config['GZIP_MIN_BYTES']:
+                body = gzip.compress(body, compresslevel=6)
+            gantt_cache.put((project_id, etag), body)
+        response = app.response_class(body, mimetype='application/json')
+        if body[:2] == b'\x1f\x8b':  # gzip magic; JSON never starts with it
+            response.content_encoding = 'gzip'
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    # Cached by the browser, but checked with the server before each use
+    response.cache_control.no_cache = True
+    return response
+
+
+def _select_tasks(snapshot, first_day, last_day, assignee, offset, limit):
+    """(positions matching the query, the page of them to send)"""
+    # Only the selected rows are looked at, through the snapshot's indexes
+    positions = snapshot.task_index.query(first_day, last_day, assignee)
+    return positions, positions[offset:offset + limit if limit is not None else None]
+
+
+def _gantt_data(snapshot, first_day, last_day, assignee, offset, limit, clip):
+    """The /gantt response of a snapshot for the given (parsed) query."""
+    positions, selected = _select_tasks(snapshot, first_day, last_day, assignee, offset, limit)
+
+    def spans(days):
+        # Runs of consecutive days as [first date, number of days]
+        if clip:
+            runs = days.spans_between(first_day if first_day is not None else float('-inf'),
+                                      last_day if last_day is not None else float('inf'))
+        else:
+            runs = days.spans()
+        return [[format_ordinal(start), length] for start, length in runs]
 
     # Prepare data for frontend
     tasks_data = []
-    for task in current_project.tasks:
+    for position in selected:
+        task = snapshot.tasks[position]
         task_info = {
+            'index': position,
             'name': task.name,
             'assigned_to': task.assigned_to,
             'estimated_duration': task.estimated_duration,
@@ -153,70 +732,247 @@ def get_gantt_data():
             'availability': task.availability,
             'contingency_margin': task.contingency_margin,
             'dependency': task.dependency,
-            'custom_start_date': task.custom_start_date.strftime('%Y-%m-%d') if task.custom_start_date else None,
-            'start_date': task.start_date.strftime('%Y-%m-%d') if task.start_date else None,
-            'end_date': task.end_date.strftime('%Y-%m-%d') if task.end_date else None,
-            'working_dates': [d.strftime('%Y-%m-%d') for d in task.working_dates],
-            'holiday_dates': [d.strftime('%Y-%m-%d') for d in task.holiday_dates]
+            'dependencies': list(dependency_names(task.dependency)),
+            'custom_start_date': format_ordinal(task.custom_start_day) if task.custom_start_day is not None else None,
+            'start_date': format_ordinal(task.start_day) if task.start_day is not None else None,
+            'end_date': format_ordinal(task.end_day) if task.end_day is not None else None,
+            'working_spans': spans(task.working_days),
+            'holiday_spans': spans(task.holiday_days),
+            # Working days the task can slip without moving the project end / any successor
+            'total_float': task.total_float,
+            'free_float': task.free_float,
+            'critical': task.total_float == 0
         }
         tasks_data.append(task_info)
 
-    start_date, end_date = current_project.get_date_range()
+    start_day, end_day = snapshot.get_day_range()
 
     response = {
-        'project_name': current_project.name,
-        'start_date': start_date.strftime('%Y-%m-%d'),
-        'end_date': end_date.strftime('%Y-%m-%d') if end_date else None,
+        'project_name': snapshot.name,
+        'version': snapshot.version,
+        'start_date': format_ordinal(start_day),
+        'end_date': format_ordinal(end_day) if end_day else None,
+        # Tasks matching the query before offset and limit
+        'total': len(positions),
+        'offset': offset,
         'tasks': tasks_data
     }
-
-    return jsonify(response)
+    return response
+
+
+def _gantt_columns(snapshot, first_day, last_day, assignee, offset, limit, clip):
+    """
+    The /gantt?format=columns response: the same fields as _gantt_data(),
+    but one array per field under 'columns' (critical is total_float == 0),
+    days as offsets from start_date and working/holiday days as flat
+    [offset, number of days, offset, number of days, ...] arrays per task.
+    """
+    positions, selected = _select_tasks(snapshot, first_day, last_day, assignee, offset, limit)
+    start_day, end_day = snapshot.get_day_range()
+    low = first_day if first_day is not None else float('-inf')
+    high = last_day if last_day is not None else float('inf')
+
+    def offset_of(day):
+        return day - start_day if day is not None else None
+
+    def spans(days):
+        runs = days.spans_between(low, high) if clip else days.spans()
+        flat = []
+        for start, length in runs:
+            flat += (start - start_day, length)
+        return flat
+
+    tasks = [snapshot.tasks[position] for position in selected]
+    return {
+        'format': 'columns',
+        'project_name': snapshot.name,
+        'version': snapshot.version,
+        'start_date': format_ordinal(start_day),
+        'end_date': format_ordinal(end_day) if end_day else None,
+        'total': len(positions),
+        'offset': offset,
+        'columns': {
+            'index': list(selected),
+            'name': [task.name for task in tasks],
+            'assigned_to': [task.assigned_to for task in tasks],
+            'estimated_duration': [task.estimated_duration for task in tasks],
+            'actual_duration': [task.actual_duration for task in tasks],
+            'availability': [task.availability for task in tasks],
+            'contingency_margin': [task.contingency_margin for task in tasks],
+            'dependency': [task.dependency for task in tasks],
+            'custom_start': [offset_of(task.custom_start_day) for task in tasks],
+            'start': [offset_of(task.start_day) for task in tasks],
+            'end': [offset_of(task.end_day) for task in tasks],
+            'working_spans': [spans(task.working_days) for task in tasks],
+            'holiday_spans': [spans(task.holiday_days) for task in tasks],
+            'total_float': [task.total_float for task in tasks],
+            'free_float': [task.free_float for task in tasks],
+        }
+    }
 
 
-@app.route('/api/export', methods=['POST'])
-def export_excel():
-    """Export the Gantt chart to Excel."""
-    global current_project
+@app.route('/api/projects/<project_id>/forecast', methods=['POST'])
+@with_project
+def forecast_completion(project_id, project):
+    """
+    Monte Carlo forecast of the completion dates.
 
-    if not current_project:
-        return jsonify({'error': 'Project not initialized'}), 400
+    Optional JSON fields: trials (default 10000), percentiles (default
+    [50, 80, 95]), optimistic and pessimistic (percent below and above each
+    estimate, default 10 and 30), distributions ({task name: [low, most
+    likely, high] estimated days}) and seed.
+    """
+    if not project.tasks:
+        return jsonify({'error': 'No tasks defined'}), 400
 
+    data = request.json or {}
     try:
-        data = request.json
-        custom_filename = data.get('filename', '').strip()
-
-        # Use custom filename or default to project name
-        if custom_filename:
-            # Add .xlsx extension if not provided
-            if not custom_filename.endswith('.xlsx'):
-                filename = f"{custom_filename}.xlsx"
-            else:
-                filename = custom_filename
-        else:
-            filename = f"{current_project.name.replace(' ', '_')}_gantt.xlsx"
+        trials = int(data.get('trials', 10000))
+        percentiles = [float(value) for value in data.get('percentiles', [50, 80, 95])]
+        optimistic = float(data.get('optimistic', 10))
+        pessimistic = float(data.get('pessimistic', 30))
+        distributions = {name: tuple(float(value) for value in values)
+                         for name, values in (data.get('distributions') or {}).items()}
+    except (ValueError, TypeError, AttributeError):
+        return jsonify({'error': 'Invalid forecast parameters'}), 400
+    if not 1 <= trials <= app.config['FORECAST_MAX_TRIALS']:
+        return jsonify({'error': f"Trials must be between 1 and {app.config['FORECAST_MAX_TRIALS']}"}), 400
+    if not percentiles or not all(0 <= value <= 100 for value in percentiles):
+        return jsonify({'error': 'Percentiles must be between 0 and 100'}), 400
 
-        # Sanitize filename (remove potentially problematic characters)
-        filename = filename.replace('/', '_').replace('\\', '_')
+    try:
+        task_days, project_days = project.forecast_completion(
+            trials, optimistic, pessimistic, distributions, percentiles, data.get('seed'))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
 
-        filepath = export_to_excel(current_project, filename)
-        return send_file(filepath, as_attachment=True, download_name=filename)
+    def by_percentile(days):
+        # {'p50': 'YYYY-MM-DD', ...}; fractional percentiles keep their digits
+        return {f"p{value:g}": format_ordinal(day) for value, day in zip(percentiles, days)}
+
+    return jsonify({
+        'trials': trials,
+        'project': by_percentile(project_days),
+        'tasks': [{'name': task.name, 'end_dates': by_percentile(days) if days is not None else None}
+                  for task, days in zip(project.tasks, task_days)]
+    })
+
+
+@app.route('/api/projects/<project_id>/export', methods=['POST'])
+@with_schedule
+def export_excel(project_id, snapshot):
+    """Export the Gantt chart of the last calculated schedule to Excel."""
+    # Built in memory (spilling to an anonymous temporary file if large) and
+    # streamed from there; the file is closed once the response is sent
+    filename = _export_filename(request.get_json(silent=True) or {}, snapshot)
+    workbook = SpooledTemporaryFile(app.config['EXPORT_SPOOL_BYTES'])
+    try:
+        export_to_excel(snapshot, workbook)
+        size = workbook.tell()
+        workbook.seek(0)
+        response = send_file(workbook, as_attachment=True, download_name=filename, mimetype=XLSX_MIMETYPE)
+        response.content_length = size
+        return response
     except Exception as e:
+        workbook.close()
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/reset', methods=['POST'])
-def reset_project():
-    """Reset the current project."""
-    global current_project
-    current_project = None
-    return jsonify({'message': 'Project reset successfully'})
+@app.route('/api/projects/<project_id>/export/jobs', methods=['POST'])
+@with_schedule
+def start_export_job(project_id, snapshot):
+    """
+    Export the last calculated schedule in the background; returns the job
+    to poll (202). Requests for the same schedule and file name share one job.
+    """
+    filename = _export_filename(request.get_json(silent=True) or {}, snapshot)
+    try:
+        job = export_jobs.submit((project_id, snapshot.serial, filename), snapshot, filename)
+    except ExportQueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    response = jsonify(job.to_dict())
+    response.status_code = 202
+    response.headers['Location'] = f'/api/projects/{project_id}/export/jobs/{job.id}'
+    return response
+
+
+@app.route('/api/exports', methods=['GET'])
+def get_export_stats():
+    """Get the background export counters for monitoring."""
+    return jsonify(export_jobs.stats())
+
+
+def _project_export_job(project_id, job_id):
+    job = export_jobs.get(job_id)
+    return job if job is not None and job.key[0] == project_id else None
+
+
+@app.route('/api/projects/<project_id>/export/jobs/<job_id>', methods=['GET'])
+def get_export_job(project_id, job_id):
+    """Status and progress of a background export."""
+    job = _project_export_job(project_id, job_id)
+    if job is None:
+        return jsonify({'error': 'Export job not found'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/projects/<project_id>/export/jobs/<job_id>/download', methods=['GET'])
+def download_export_job(project_id, job_id):
+    """The workbook of a finished background export."""
+    job = _project_export_job(project_id, job_id)
+    if job is None:
+        return jsonify({'error': 'Export job not found'}), 404
+    if job.status == 'failed':
+        return jsonify({'error': job.error}), 500
+    if job.status != 'done':
+        return jsonify({'error': 'Export not finished'}), 400
+    workbook = job.open()
+    if workbook is None:
+        return jsonify({'error': 'Export job not found'}), 404
+    # The reader keeps the workbook until the response is sent
+    response = send_file(workbook, as_attachment=True, download_name=job.filename, mimetype=XLSX_MIMETYPE)
+    response.content_length = job.size
+    return response
+
+
+def _export_filename(data, snapshot):
+    """The download name of an export: the requested one or the project name."""
+    custom_filename = data.get('filename', '').strip()
+
+    # Use custom filename or default to project name
+    if custom_filename:
+        # Add .xlsx extension if not provided
+        if not custom_filename.endswith('.xlsx'):
+            filename = f"{custom_filename}.xlsx"
+        else:
+            filename = custom_filename
+    else:
+        filename = f"{snapshot.name.replace(' ', '_')}_gantt.xlsx"
+
+    # Sanitize filename (remove potentially problematic characters)
+    return filename.replace('/', '_').replace('\\', '_')
+
+
+@app.route('/api/projects/<project_id>', methods=['DELETE'])
+def delete_project(project_id):
+    """Delete a project."""
+    # Under the project's lock, so no edit in progress writes it back; the
+    # requests waiting for the lock then find it gone. Deleted from the store
+    # first so that it cannot be loaded back
+    try:
+        with projects.checkout(project_id):
+            store.delete_project(project_id)
+            projects.discard(project_id)
+    except UnknownProjectError:
+        return jsonify({'error': 'Project not found'}), 404
+    events.publish(project_id, 'deleted', {})
+    events.forget(project_id)
+    return jsonify({'message': 'Project deleted successfully'})
 
 
 @app.route('/api/import', methods=['POST'])
 def import_excel():
-    """Import project data from an uploaded Excel file."""
-    global current_project
-
+    """Import project data from an uploaded Excel file (the client then creates a project from it)."""
     # Check if file was uploaded
     if 'file' not in request.files:
         return jsonify({'error': 'No file uploaded'}), 400
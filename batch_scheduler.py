@@ -0,0 +1,216 @@
+from typing import List, Optional, Sequence, Tuple
+
+from date_ranges import DaySpans
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; Project falls back to the task loop
+    np = None
+
+
+# numpy.datetime64[D] counts days from 1970-01-01
+EPOCH_ORDINAL = 719163
+
+
+def available() -> bool:
+    """Check if the batch engine can run (NumPy is installed)."""
+    return np is not None
+
+
+def actual_durations(estimated_durations, availabilities, contingency_margins):
+    """
+    models.actual_duration() for whole columns at once.
+
+    Returns None when an input is not numeric or an availability is zero,
+    so that the task loop reports the error instead.
+    """
+    estimated = np.asarray(estimated_durations)
+    availability = np.asarray(availabilities)
+    contingency = np.asarray(contingency_margins)
+    if any(values.dtype.kind not in 'iuf' for values in (estimated, availability, contingency)):
+        return None
+    if not availability.all():
+        return None
+    # Same operations in the same order as actual_duration(), so the floats
+    # (and the round-half-to-even) match exactly
+    duration = (estimated / availability * 100) * (1 + contingency / 100)
+    return np.round(duration).astype(np.int64)
+
+
+class BatchCalendars:
+    """
+    The working days of several calendar indexes over a common horizon.
+
+    Each index becomes a numpy.busdaycalendar (its weekmask and holidays),
+    which gives its working days over [lo, hi). Their running counts and
+    their lists of working days are stacked into one array each, so the
+    first and N-th working day of tasks on different calendars are two
+    array lookups per task, the same answer busday_offset() gives one
+    calendar at a time.
+    """
+
+    def __init__(self, indexes: Sequence, lo: int, hi: int):
+        self.indexes = list(indexes)
+        self.lo = lo
+        self._build(hi)
+
+    def _build(self, hi: int):
+        self.hi = hi
+        days = hi - self.lo
+        dates = np.arange(self.lo - EPOCH_ORDINAL, hi - EPOCH_ORDINAL).astype('datetime64[D]')
+
+        self.busdays = []
+        self.holidays = []
+        prefixes = []
+        workdays = []
+        for number, index in enumerate(self.indexes):
+            weekmask = [index.work_mask >> day & 1 for day in range(7)]
+            holidays = np.array(index.holidays_between(self.lo, hi - 1), dtype=np.int64)
+            calendar = np.busdaycalendar(weekmask=weekmask,
+                                         holidays=(holidays - EPOCH_ORDINAL).astype('datetime64[D]'))
+            busdays = np.is_busday(dates, busdaycal=calendar)
+            self.busdays.append(busdays)
+            # Sorted holidays that fall on one of the pattern's work days
+            self.holidays.append(holidays)
+
+            prefix = np.empty(days + 1, dtype=np.int64)
+            prefix[0] = 0
+            np.cumsum(busdays, out=prefix[1:])
+            # Offset each calendar's counts past the previous one's
+            prefixes.append(prefix + number * (days + 1))
+            workdays.append(np.flatnonzero(busdays) + self.lo)
+        self._prefix = np.concatenate(prefixes) if prefixes else np.zeros(0, dtype=np.int64)
+        # Working days of calendar i start at _workday_starts[i] in _workdays
+        self._totals = np.array([len(days) for days in workdays], dtype=np.int64)
+        self._workday_starts = np.cumsum(self._totals) - self._totals
+        self._workdays = np.concatenate(workdays) if workdays else np.zeros(0, dtype=np.int64)
+        self._runs = {}
+
+    def grow(self):
+        """Double the horizon."""
+        self._build(self.lo + 2 * (self.hi - self.lo))
+
+    def place(self, calendar_ids, earliest_days, counts) -> Optional[Tuple]:
+        """
+        First and count-th working day on or after each earliest day.
+
+        Same contract as CalendarIndex.add_working_days(), for arrays; the
+        days are 0 where the count is below 1. Returns None when a task
+        runs past the horizon.
+        """
+        width = self.hi - self.lo + 1
+        offsets = earliest_days - self.lo
+        if offsets.size and offsets.max() >= width - 1:
+            return None
+        block = calendar_ids * width
+        # Working days of the task's calendar before its earliest day
+        before = self._prefix[block + offsets] - block
+        positive = counts >= 1
+        steps = np.where(positive, counts, 1)
+        if (before + steps > self._totals[calendar_ids]).any():
+            return None
+
+        first_pos = self._workday_starts[calendar_ids] + before
+        first = self._workdays[first_pos]
+        last = self._workdays[first_pos + steps - 1]
+        return np.where(positive, first, 0), np.where(positive, last, 0)
+
+    def _working_runs(self, calendar_id: int):
+        runs = self._runs.get(calendar_id)
+        if runs is None:
+            edges = np.diff(self.busdays[calendar_id].astype(np.int8), prepend=0, append=0)
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1) - 1
+            runs = self._runs[calendar_id] = (starts + self.lo, ends + self.lo)
+        return runs
+
+    def spans(self, calendar_ids, earliest_days, first_days, last_days) -> Tuple[List[DaySpans], List[DaySpans]]:
+        """Working and holiday DaySpans of each task, as _schedule_window() returns them."""
+        count = len(calendar_ids)
+        working: List[DaySpans] = [DaySpans()] * count
+        holidays: List[DaySpans] = [DaySpans()] * count
+        scheduled = first_days > 0
+        for calendar_id in np.unique(calendar_ids[scheduled]):
+            rows = np.flatnonzero(scheduled & (calendar_ids == calendar_id))
+            first, last = first_days[rows], last_days[rows]
+            run_starts, run_ends = self._working_runs(calendar_id)
+            # Runs from the one holding the first day to the one holding the last
+            run_lo = np.searchsorted(run_ends, first).tolist()
+            run_hi = np.searchsorted(run_starts, last, side='right').tolist()
+            starts, ends = run_starts.tolist(), run_ends.tolist()
+
+            days = self.holidays[calendar_id]
+            holiday_lo = np.searchsorted(days, earliest_days[rows]).tolist()
+            holiday_hi = np.searchsorted(days, last, side='right').tolist()
+            days = days.tolist()
+
+            for row, first_day, last_day, i, j, h, k in zip(rows.tolist(), first.tolist(), last.tolist(),
+                                                            run_lo, run_hi, holiday_lo, holiday_hi):
+                span_starts = starts[i:j]
+                span_ends = ends[i:j]
+                span_starts[0] = first_day
+                span_ends[-1] = last_day
+                working[row] = DaySpans.from_runs(span_starts, [end - start + 1 for start, end
+                                                                in zip(span_starts, span_ends)])
+                if k > h:
+                    holidays[row] = DaySpans.from_days(days[h:k])
+        return working, holidays
+
+
+def schedule_levels(levels: Sequence[Sequence[int]], predecessors, fixed_earliest, durations,
+                    calendar_ids, indexes: Sequence):
+    """
+    Place a batch of tasks, one dependency level at a time.
+
+    Tasks are numbered 0..n-1 in the batch. levels lists the tasks of each
+    level, predecessors gives the tuple of each task's antecedents in the
+    batch, fixed_earliest the earliest day any constraint from outside the
+    batch allows (0 for none), and calendar_ids picks its entry in indexes.
+    A task starts on the later of its fixed earliest day and the day after
+    its last antecedent in the batch ends.
+
+    Returns (earliest, first, last, working spans, holiday spans); the days
+    are numpy arrays with 0 for tasks of zero duration. Returns None when a
+    task follows one of zero duration, which has no end to start after.
+    """
+    count = len(predecessors)
+    # One (task, antecedent) pair per edge in the batch
+    edge_tasks = np.fromiter((task for task, preds in enumerate(predecessors) for _ in preds), dtype=np.int64)
+    edge_preds = np.fromiter((pred for preds in predecessors for pred in preds), dtype=np.int64)
+    if (durations[edge_preds] < 1).any():
+        return None
+    fixed_earliest = np.asarray(fixed_earliest, dtype=np.int64)
+    calendar_ids = np.asarray(calendar_ids, dtype=np.int64)
+
+    # Group the edges by the level of their task
+    level_of = np.zeros(count, dtype=np.int64)
+    for number, level in enumerate(levels):
+        level_of[np.asarray(level, dtype=np.int64)] = number
+    edge_levels = level_of[edge_tasks]
+    by_level = np.argsort(edge_levels, kind='stable')
+    edge_tasks, edge_preds = edge_tasks[by_level], edge_preds[by_level]
+    bounds = np.searchsorted(edge_levels[by_level], np.arange(len(levels) + 1)).tolist()
+
+    earliest = fixed_earliest.copy()
+    first = np.zeros(count, dtype=np.int64)
+    last = np.zeros(count, dtype=np.int64)
+
+    roots = fixed_earliest[np.bincount(edge_tasks, minlength=count) == 0]
+    lo = int(roots.min()) if roots.size else 0
+    latest = int(roots.max()) if roots.size else 0
+    calendars = BatchCalendars(indexes, lo, max(latest + 1, lo) + 366)
+
+    for number, level in enumerate(levels):
+        level = np.asarray(level, dtype=np.int64)
+        edges = slice(bounds[number], bounds[number + 1])
+        # Start the day after the last antecedent ends
+        np.maximum.at(earliest, edge_tasks[edges], last[edge_preds[edges]] + 1)
+        while True:
+            placed = calendars.place(calendar_ids[level], earliest[level], durations[level])
+            if placed is not None:
+                break
+            calendars.grow()
+        first[level], last[level] = placed
+
+    working, holidays = calendars.spans(calendar_ids, earliest, first, last)
+    return earliest, first, last, working, holidays
@@ -0,0 +1,243 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional, Tuple
+
+from date_ranges import DaySpans
+
+
+# Number of calendar days covered when an index is first built. The horizon
+# doubles whenever a lookup runs past its end.
+DEFAULT_HORIZON_DAYS = 366
+
+
+def weekday_of(ordinal: int) -> int:
+    """Weekday (0=Monday, 6=Sunday) of a proleptic Gregorian day ordinal."""
+    # date.fromordinal(1) is Monday 0001-01-01
+    return (ordinal - 1) % 7
+
+
+class CalendarIndex:
+    """
+    Precomputed working-day calendar for one work pattern and set of holidays.
+
+    One index is shared by every employee on the same calendar (see
+    CalendarOverlay for personal holidays).
+
+    Days are addressed by their ordinal (date.toordinal()). Over the indexed
+    horizon the index keeps a working-day bitmap, the running count of working
+    days before each day, and the sorted list of holidays that fall on one of
+    the pattern's work days. This makes "add N working days" a binary search
+    instead of a day-by-day walk.
+    """
+
+    def __init__(self, work_mask: int, holiday_sets: Iterable, origin: int,
+                 days: int = DEFAULT_HORIZON_DAYS, owner: str = ''):
+        # Weekday bitmask, bit 0 = Monday
+        self.work_mask = work_mask & 0b1111111
+        if not self.work_mask:
+            raise ValueError(f"Employee '{owner}' has no working days in their work pattern")
+
+        self.owner = owner
+        # Holiday sources merged into the index: anything with a
+        # ranges_between(start, end) method (DateRangeSet, RecurringHolidays)
+        self.holiday_sets = tuple(holiday_sets)
+        self.origin = origin
+        self._bits = bytearray()
+        self._prefix = array('l', [0])
+        self._holiday_days: List[int] = []
+        self._build(origin, max(days, 7))
+
+    @property
+    def end(self) -> int:
+        """First ordinal past the indexed horizon."""
+        return self.origin + len(self._bits)
+
+    def _build(self, origin: int, days: int):
+        """(Re)build the bitmap, prefix counts and holiday list for a horizon."""
+        # Repeat the weekly pattern, aligned so that position 0 is `origin`
+        week = bytes(self.work_mask >> weekday_of(origin + offset) & 1 for offset in range(7))
+        weeks, remainder = divmod(days, 7)
+        bits = bytearray(week * weeks + week[:remainder])
+
+        holiday_days = []
+        for holidays in self.holiday_sets:
+            for start, end in holidays.ranges_between(origin, origin + days - 1):
+                for offset in range(start - origin, end + 1 - origin):
+                    if bits[offset]:
+                        bits[offset] = 0
+                        holiday_days.append(origin + offset)
+        holiday_days.sort()
+
+        self.origin = origin
+        self._bits = bits
+        self._prefix = array('l', [0])
+        self._prefix.extend(accumulate(bits))
+        self._holiday_days = holiday_days
+
+    def _cover(self, start: int, end: int):
+        """Make sure the horizon covers the ordinals in [start, end)."""
+        if start >= self.origin and end <= self.end:
+            return
+        origin = min(start, self.origin)
+        days = max(end, self.end) - origin
+        self._build(origin, max(days, 2 * len(self._bits)))
+
+    def _offset(self, day: int) -> int:
+        self._cover(day, day + 1)
+        return day - self.origin
+
+    def is_working_day(self, day: int) -> bool:
+        """Check if the employee works on the given day."""
+        offset = self._offset(day)
+        return bool(self._bits[offset])
+
+    def count_working_days(self, start: int, end: int) -> int:
+        """Number of working days in the inclusive range [start, end]."""
+        if end < start:
+            return 0
+        self._cover(start, end + 1)
+        return self._prefix[end + 1 - self.origin] - self._prefix[start - self.origin]
+
+    def add_working_days(self, start: int, count: int) -> Optional[Tuple[int, int]]:
+        """
+        Find the first and the count-th working day on or after `start`.
+
+        Returns (first_day, last_day) as ordinals, or None when count < 1.
+        """
+        if count < 1:
+            return None
+
+        offset = self._offset(start)
+        base = self._prefix[offset]
+        target = base + count
+
+        # Grow the horizon until it contains enough working days
+        while self._prefix[-1] < target:
+            self._cover(self.origin, self.end + len(self._bits))
+            base = self._prefix[start - self.origin]
+            target = base + count
+
+        # prefix[k] counts working days before origin + k, so the n-th working
+        # day after `start` sits just before the first k where prefix[k] hits
+        # base + n.
+        first = bisect_left(self._prefix, base + 1) - 1 + self.origin
+        last = bisect_left(self._prefix, target) - 1 + self.origin
+        return first, last
+
+    def working_spans_between(self, start: int, end: int) -> DaySpans:
+        """Working days in the inclusive range [start, end], as runs of consecutive days."""
+        if end < start:
+            return DaySpans()
+        self._cover(start, end + 1)
+        bits = self._bits
+        origin = self.origin
+        stop = end + 1 - origin
+        spans = []
+        # Scan the bitmap run by run rather than day by day
+        pos = bits.find(1, start - origin, stop)
+        while pos != -1:
+            run_end = bits.find(0, pos, stop)
+            if run_end == -1:
+                run_end = stop
+            spans.append((origin + pos, run_end - pos))
+            pos = bits.find(1, run_end, stop)
+        return DaySpans(spans)
+
+    def holidays_between(self, start: int, end: int) -> List[int]:
+        """Ordinals of holidays falling on a work-pattern day in [start, end]."""
+        if end < start:
+            return []
+        self._cover(start, end + 1)
+        days = self._holiday_days
+        return days[bisect_left(days, start):bisect_right(days, end)]
+
+
+
+class CalendarOverlay:
+    """
+    A shared CalendarIndex with one employee's personal holidays on top.
+
+    The base index (work pattern, global and calendar holidays) is built once
+    per calendar and shared by everyone on it. The overlay only looks at the
+    personal holidays inside the window being queried, so an employee with a
+    few days off costs no bitmap of their own.
+    """
+
+    def __init__(self, base: CalendarIndex, holiday_sets: Iterable):
+        self.base = base
+        self.holiday_sets = tuple(holiday_sets)
+
+    @property
+    def work_mask(self) -> int:
+        return self.base.work_mask
+
+    def _personal_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Personal holiday ranges intersecting [start, end], clipped and merged."""
+        ranges = sorted(r for holidays in self.holiday_sets for r in holidays.ranges_between(start, end))
+        merged: List[Tuple[int, int]] = []
+        for range_start, range_end in ranges:
+            if merged and range_start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+        return merged
+
+    def _blocked(self, start: int, end: int) -> int:
+        """Number of base working days in [start, end] taken by personal holidays."""
+        return sum(self.base.count_working_days(s, e) for s, e in self._personal_ranges(start, end))
+
+    def is_working_day(self, day: int) -> bool:
+        return self.base.is_working_day(day) and not self._personal_ranges(day, day)
+
+    def count_working_days(self, start: int, end: int) -> int:
+        if end < start:
+            return 0
+        return self.base.count_working_days(start, end) - self._blocked(start, end)
+
+    def add_working_days(self, start: int, count: int) -> Optional[Tuple[int, int]]:
+        """Same contract as CalendarIndex.add_working_days()."""
+        if count < 1:
+            return None
+
+        # First working day: hop over personal holidays one range at a time
+        first = self.base.add_working_days(start, 1)[0]
+        ranges = self._personal_ranges(first, first)
+        while ranges:
+            first = self.base.add_working_days(ranges[0][1] + 1, 1)[0]
+            ranges = self._personal_ranges(first, first)
+
+        # Each pass adds back the days lost to personal holidays in the span
+        # it covered, until a pass covers none
+        cursor, remaining = first, count
+        while remaining:
+            _, last = self.base.add_working_days(cursor, remaining)
+            remaining = self._blocked(cursor, last)
+            cursor = last + 1
+        return first, last
+
+    def working_spans_between(self, start: int, end: int) -> DaySpans:
+        spans = self.base.working_spans_between(start, end)
+        ranges = self._personal_ranges(start, end)
+        if not ranges:
+            return spans
+        # Cut the personal holiday ranges out of the base runs
+        result = []
+        for span_start, length in spans.spans():
+            span_end = span_start + length - 1
+            for range_start, range_end in ranges:
+                if range_end < span_start or range_start > span_end:
+                    continue
+                if range_start > span_start:
+                    result.append((span_start, range_start - span_start))
+                span_start = range_end + 1
+            if span_start <= span_end:
+                result.append((span_start, span_end - span_start + 1))
+        return DaySpans(result)
+
+    def holidays_between(self, start: int, end: int) -> List[int]:
+        days = set(self.base.holidays_between(start, end))
+        work_mask = self.base.work_mask
+        for range_start, range_end in self._personal_ranges(start, end):
+            days.update(day for day in range(range_start, range_end + 1) if work_mask >> weekday_of(day) & 1)
+        return sorted(days)
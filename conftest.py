@@ -0,0 +1,55 @@
+"""Fixtures and project builders shared by the tests."""
+
+from datetime import datetime
+
+import pytest
+
+from models import Project, Task, Employee
+from project_store import ProjectStore
+
+# Compared by schedule_rows() unless other fields are given
+SCHEDULE_FIELDS = ('actual_duration', 'start_day', 'end_day', 'working_days', 'holiday_days')
+
+
+def make_project(name, employees=(), tasks=(), use_table=False, calendars=()):
+    """
+    A project starting on Monday 6 January 2025 with the given calendars,
+    employees (Employee objects or names) and tasks, added after switching
+    to a TaskTable if use_table. Tasks are Task objects or (name, estimated
+    duration, assigned to, dependency) tuples.
+    """
+    project = Project(name, datetime(2025, 1, 6))
+    for calendar in calendars:
+        project.add_calendar(calendar)
+    for employee in employees:
+        project.add_employee(Employee(employee) if isinstance(employee, str) else employee)
+    if use_table:
+        project.use_task_table()
+    for task in tasks:
+        if not isinstance(task, Task):
+            task_name, estimated_duration, assigned_to, dependency = task
+            task = Task(task_name, estimated_duration, assigned_to)
+            task.dependency = dependency
+        project.add_task(task)
+    return project
+
+
+def schedule_rows(project, fields=SCHEDULE_FIELDS):
+    """The name and the given fields of every task, to compare two schedules."""
+    return [(task.name,) + tuple(getattr(task, field) for field in fields) for task in project.tasks]
+
+
+@pytest.fixture(params=[False, True], ids=['list', 'table'])
+def use_table(request):
+    """Run a test with tasks in a list, then in a TaskTable."""
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def temporary_store(tmp_path, monkeypatch):
+    """Write what the app's routes store to a database in a temporary directory instead of projects.db."""
+    import app
+    store = ProjectStore(str(tmp_path / "projects.db"))
+    monkeypatch.setattr(app, 'store', store)
+    yield store
+    store.close()
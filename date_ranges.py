@@ -0,0 +1,240 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+
+DateLike = Union[int, str, date, datetime]
+
+
+def to_ordinal(value: DateLike) -> int:
+    """
+    Convert a date to its day ordinal (date.toordinal()).
+
+    Accepts an ordinal, a date/datetime, or a string in YYYY-MM-DD format.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value).toordinal()
+    return value.toordinal()
+
+
+class DateRangeSet:
+    """
+    A set of days stored as merged, sorted, inclusive ranges of day ordinals.
+
+    Long holidays (parental leave, sabbaticals) cost one range instead of one
+    entry per day. Membership is a binary search over the range starts.
+    Iterating yields the individual day ordinals, so the set can stand in
+    for a plain set of days.
+    """
+
+    __slots__ = ('_starts', '_ends')
+
+    def __init__(self, days: Iterable = ()):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for day in days:
+            self.add(day)
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[Tuple[int, int]]) -> 'DateRangeSet':
+        """Build a set from (start, end) ordinal pairs, merging overlaps."""
+        result = cls()
+        merged: List[List[int]] = []
+        for start, end in sorted(ranges):
+            if end < start:
+                raise ValueError(f"Range start {start} is after end {end}")
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        result._starts = [start for start, _ in merged]
+        result._ends = [end for _, end in merged]
+        return result
+
+    def add(self, day):
+        """Add a single day."""
+        day = to_ordinal(day)
+        self.add_range(day, day)
+
+    def add_range(self, start, end):
+        """Add every day in the inclusive range [start, end]."""
+        start, end = to_ordinal(start), to_ordinal(end)
+        if end < start:
+            raise ValueError(f"Range start {start} is after end {end}")
+
+        # Ranges that overlap or touch [start, end] are merged into it
+        lo = bisect_left(self._ends, start - 1)
+        hi = bisect_right(self._starts, end + 1)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def __contains__(self, day) -> bool:
+        day = to_ordinal(day)
+        pos = bisect_right(self._starts, day) - 1
+        return pos >= 0 and day <= self._ends[pos]
+
+    def __len__(self) -> int:
+        """Number of days in the set."""
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in zip(self._starts, self._ends):
+            yield from range(start, end + 1)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DateRangeSet):
+            return self._starts == other._starts and self._ends == other._ends
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"DateRangeSet({self.ranges()!r})"
+
+    def copy(self) -> 'DateRangeSet':
+        result = DateRangeSet()
+        result._starts = list(self._starts)
+        result._ends = list(self._ends)
+        return result
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """The (start, end) ordinal pairs, sorted and non-overlapping."""
+        return list(zip(self._starts, self._ends))
+
+    def ranges_between(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """The ranges intersecting [start, end], clipped to it."""
+        lo = bisect_left(self._ends, start)
+        hi = bisect_right(self._starts, end)
+        return [(max(s, start), min(e, end)) for s, e in zip(self._starts[lo:hi], self._ends[lo:hi])]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check if any day in [start, end] is in the set."""
+        lo = bisect_left(self._ends, start)
+        return lo < len(self._starts) and self._starts[lo] <= end
+
+    def symmetric_difference(self, other: 'DateRangeSet') -> 'DateRangeSet':
+        """Days in exactly one of the two sets, computed on range boundaries."""
+        # Each range toggles membership at start and at end + 1; boundaries
+        # shared by both sets cancel out.
+        boundaries = Counter()
+        for ranges in (self, other):
+            boundaries.update(ranges._starts)
+            boundaries.update(end + 1 for end in ranges._ends)
+        points = sorted(point for point, count in boundaries.items() if count % 2)
+        return DateRangeSet.from_ranges(zip(points[0::2], (point - 1 for point in points[1::2])))
+
+    def iso_entries(self) -> List[str]:
+        """Compact ISO form: 'YYYY-MM-DD' for single days, 'YYYY-MM-DD/YYYY-MM-DD' for ranges."""
+        entries = []
+        for start, end in zip(self._starts, self._ends):
+            entry = date.fromordinal(start).isoformat()
+            if end != start:
+                entry += '/' + date.fromordinal(end).isoformat()
+            entries.append(entry)
+        return entries
+
+
+def parse_iso_ranges(entries: Optional[Iterable[str]]) -> DateRangeSet:
+    """
+    Parse holiday entries in compact ISO form.
+
+    Each entry is a date 'YYYY-MM-DD' or an inclusive range
+    'YYYY-MM-DD/YYYY-MM-DD'. Raises ValueError on malformed entries.
+    """
+    ranges = []
+    for entry in entries or ():
+        start_str, _, end_str = str(entry).strip().partition('/')
+        start = date.fromisoformat(start_str).toordinal()
+        end = date.fromisoformat(end_str).toordinal() if end_str else start
+        if end < start:
+            raise ValueError(f"Start date {start_str} is after end date {end_str}")
+        ranges.append((start, end))
+    return DateRangeSet.from_ranges(ranges)
+
+
+class DaySpans:
+    """
+    An immutable sorted set of days stored as runs of consecutive days.
+
+    Each run is a (start ordinal, length) span, so a task's working days cost
+    one span per uninterrupted stretch of work rather than one entry per day.
+    Iteration yields the day ordinals lazily and membership is a binary
+    search over the span starts.
+    """
+
+    __slots__ = ('_starts', '_lengths', '_count')
+
+    def __init__(self, spans: Iterable[Tuple[int, int]] = ()):
+        self._starts: List[int] = []
+        self._lengths: List[int] = []
+        for start, length in spans:
+            if length < 1:
+                continue
+            if self._starts and start < self._starts[-1] + self._lengths[-1]:
+                raise ValueError("Spans must be sorted and must not overlap")
+            if self._starts and start == self._starts[-1] + self._lengths[-1]:
+                self._lengths[-1] += length
+            else:
+                self._starts.append(start)
+                self._lengths.append(length)
+        self._count = sum(self._lengths)
+
+    @classmethod
+    def from_days(cls, days: Iterable[int]) -> 'DaySpans':
+        """Build from sorted, distinct day ordinals."""
+        return cls((day, 1) for day in days)
+
+    @classmethod
+    def from_runs(cls, starts: List[int], lengths: List[int]) -> 'DaySpans':
+        """Build from maximal runs that are already sorted and separated, without checking them."""
+        result = cls.__new__(cls)
+        result._starts = starts
+        result._lengths = lengths
+        result._count = sum(lengths)
+        return result
+
+    def spans(self) -> List[Tuple[int, int]]:
+        """The (start ordinal, length) runs, in order."""
+        return list(zip(self._starts, self._lengths))
+
+    def spans_between(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """The (start ordinal, length) runs intersecting [start, end], clipped to it."""
+        lo = max(bisect_right(self._starts, start) - 1, 0)
+        hi = bisect_right(self._starts, end)
+        result = []
+        for span_start, length in zip(self._starts[lo:hi], self._lengths[lo:hi]):
+            first, last = max(span_start, start), min(span_start + length - 1, end)
+            if first <= last:
+                result.append((first, last - first + 1))
+        return result
+
+    def __len__(self) -> int:
+        """Number of days."""
+        return self._count
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __iter__(self) -> Iterator[int]:
+        for start, length in zip(self._starts, self._lengths):
+            yield from range(start, start + length)
+
+    def __contains__(self, day) -> bool:
+        day = to_ordinal(day)
+        pos = bisect_right(self._starts, day) - 1
+        return pos >= 0 and day < self._starts[pos] + self._lengths[pos]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DaySpans):
+            return self._starts == other._starts and self._lengths == other._lengths
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"DaySpans({self.spans()!r})"
@@ -1,20 +1,69 @@
+from typing import BinaryIO, Callable, Optional, Union
 from openpyxl import Workbook
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-from datetime import datetime, timedelta
-from models import Project
+from models import Project, TaskTable, dependency_names, format_ordinal
 
 
-def _convert_date_to_display(date_str):
-    """Convert YYYY-MM-DD to dd/mm/yyyy format."""
-    try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        return date_obj.strftime("%d/%m/%Y")
-    except (ValueError, AttributeError):
-        return date_str  # Return as-is if conversion fails
+def _convert_date_to_display(day):
+    """Convert a day ordinal to dd/mm/yyyy format."""
+    return format_ordinal(day, "%d/%m/%Y")
 
 
-def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
-    """Export the project Gantt chart to an Excel file."""
+def _format_holidays(holidays, rules=()):
+    """
+    Format holidays as comma-separated dd/mm/yyyy dates and dd/mm/yyyy-dd/mm/yyyy
+    ranges, followed by the text of any recurring holiday rules.
+    """
+    entries = []
+    for start, end in holidays.ranges():
+        if start == end:
+            entries.append(_convert_date_to_display(start))
+        else:
+            entries.append(f"{_convert_date_to_display(start)}-{_convert_date_to_display(end)}")
+    entries.extend(str(rule) for rule in rules)
+    return ", ".join(entries)
+
+
+def _task_rows(project: Project):
+    """
+    Yield one tuple per task: (name, dependency, assigned_to, estimated_duration,
+    availability, contingency_margin, actual_duration, custom_start_day,
+    start_day, end_day, working_days, holiday_days). Missing days are None.
+    """
+    tasks = project.tasks
+    if isinstance(tasks, TaskTable):
+        # Read the columns directly rather than through a view per row
+        for row in zip(tasks.names, tasks.dependency, tasks.assigned_to, tasks.estimated_duration,
+                       tasks.availability, tasks.contingency_margin, tasks.actual_duration,
+                       tasks.custom_start_day, tasks.start_day, tasks.end_day,
+                       tasks.working_days, tasks.holiday_days):
+            yield row[:7] + (row[7] or None, row[8] or None, row[9] or None) + row[10:]
+        return
+
+    for task in tasks:
+        yield (task.name, task.dependency, task.assigned_to, task.estimated_duration,
+               task.availability, task.contingency_margin, task.actual_duration,
+               task.custom_start_day, task.start_day, task.end_day,
+               task.working_days, task.holiday_days)
+
+
+# Rows of the Gantt sheet between two progress reports
+PROGRESS_INTERVAL = 100
+
+
+def export_to_excel(project: Project, target: Union[str, BinaryIO] = "gantt_chart.xlsx",
+                    progress: Optional[Callable[[int, int], None]] = None):
+    """
+    Export the project Gantt chart to an Excel file.
+
+    target is a file name, or a seekable binary file object (e.g. BytesIO or
+    SpooledTemporaryFile) that the workbook is written to and that is left
+    open, positioned after it. Returns target.
+
+    project may also be a ScheduleSnapshot, which offers the same attributes.
+    progress, if given, is called with (tasks written, number of tasks) as
+    the Gantt sheet fills up.
+    """
 
     wb = Workbook()
     ws = wb.active
@@ -34,17 +83,13 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
         bottom=Side(style='thin')
     )
 
-    # Get date range
-    start_date, end_date = project.get_date_range()
-    if not end_date:
-        end_date = start_date
+    # Get date range (as day ordinals)
+    start_day, end_day = project.get_day_range()
+    if not end_day:
+        end_day = start_day
 
     # Create date list (all calendar days from start to end)
-    date_list = []
-    current = start_date
-    while current <= end_date:
-        date_list.append(current)
-        current += timedelta(days=1)
+    date_list = range(start_day, end_day + 1)
 
     # Header row 1: Fixed columns
     headers = ["Task Name", "Depends On", "Assigned To", "Estimated Duration", "Availability (%)", "Contingency (%)", "Actual Duration", "Custom Start Date", "Start Date", "End Date"]
@@ -62,7 +107,7 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
     for idx, date in enumerate(date_list):
         col = col_offset + idx
         cell = ws.cell(row=1, column=col)
-        cell.value = date.strftime("%m/%d")
+        cell.value = format_ordinal(date, "%m/%d")
         cell.fill = header_fill
         cell.font = header_font
         cell.alignment = Alignment(horizontal="center", vertical="center", text_rotation=90)
@@ -73,7 +118,7 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
     for idx, date in enumerate(date_list):
         col = col_offset + idx
         cell = ws.cell(row=2, column=col)
-        cell.value = date.strftime("%a")[0]  # M, T, W, T, F, S, S
+        cell.value = format_ordinal(date, "%a")[0]  # M, T, W, T, F, S, S
         cell.fill = header_fill
         cell.font = header_font
         cell.alignment = Alignment(horizontal="center", vertical="center")
@@ -91,55 +136,67 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
     ws.column_dimensions['I'].width = 12  # Start Date
     ws.column_dimensions['J'].width = 12  # End Date
 
+    # Critical path of the calculated schedule
+    try:
+        total_floats, free_floats = project.schedule_floats()
+    except ValueError:
+        total_floats = free_floats = [None] * len(project.tasks)
+    critical_font = Font(color="C00000", bold=True)
+    task_count = len(project.tasks)
+
     # Data rows
-    for task_idx, task in enumerate(project.tasks, start=3):
+    for task_idx, (name, dependency, assigned_to, estimated_duration, availability, contingency_margin,
+                   actual_duration, custom_start_day, task_start, task_end,
+                   working_days, holiday_days) in enumerate(_task_rows(project), start=3):
         # Fixed columns
-        ws.cell(row=task_idx, column=1).value = task.name
-        ws.cell(row=task_idx, column=2).value = task.dependency if task.dependency else ""
-        ws.cell(row=task_idx, column=3).value = task.assigned_to
-        ws.cell(row=task_idx, column=4).value = task.estimated_duration
-        ws.cell(row=task_idx, column=5).value = task.availability
-        ws.cell(row=task_idx, column=6).value = task.contingency_margin
-        ws.cell(row=task_idx, column=7).value = task.actual_duration
-        ws.cell(row=task_idx, column=8).value = task.custom_start_date.strftime("%d/%m/%Y") if task.custom_start_date else ""
-        ws.cell(row=task_idx, column=9).value = task.start_date.strftime("%d/%m/%Y") if task.start_date else ""
-        ws.cell(row=task_idx, column=10).value = task.end_date.strftime("%d/%m/%Y") if task.end_date else ""
+        ws.cell(row=task_idx, column=1).value = name
+        # Several antecedents are listed "Design; Build"
+        ws.cell(row=task_idx, column=2).value = "; ".join(dependency_names(dependency))
+        ws.cell(row=task_idx, column=3).value = assigned_to
+        ws.cell(row=task_idx, column=4).value = estimated_duration
+        ws.cell(row=task_idx, column=5).value = availability
+        ws.cell(row=task_idx, column=6).value = contingency_margin
+        ws.cell(row=task_idx, column=7).value = actual_duration
+        ws.cell(row=task_idx, column=8).value = _convert_date_to_display(custom_start_day) if custom_start_day is not None else ""
+        ws.cell(row=task_idx, column=9).value = _convert_date_to_display(task_start) if task_start is not None else ""
+        ws.cell(row=task_idx, column=10).value = _convert_date_to_display(task_end) if task_end is not None else ""
+        if progress is not None and (task_idx - 3) % PROGRESS_INTERVAL == 0:
+            progress(task_idx - 3, task_count)
 
         # Apply borders to fixed columns
         for col in range(1, 11):
             ws.cell(row=task_idx, column=col).border = border
             ws.cell(row=task_idx, column=col).alignment = Alignment(vertical="center")
+        if total_floats[task_idx - 3] == 0:
+            ws.cell(row=task_idx, column=1).font = critical_font
 
         # Date columns - highlight working days and holidays
-        working_dates_set = {d.strftime("%Y-%m-%d") for d in task.working_dates}
-        holiday_dates_set = {d.strftime("%Y-%m-%d") for d in task.holiday_dates}
-        for idx, date in enumerate(date_list):
-            col = col_offset + idx
-            cell = ws.cell(row=task_idx, column=col)
-            cell.border = border
-
-            date_str = date.strftime("%Y-%m-%d")
-            if date_str in working_dates_set:
-                cell.fill = task_fill
-                cell.font = task_font
-                cell.value = 1
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            elif date_str in holiday_dates_set:
-                cell.fill = holiday_fill
-                cell.font = holiday_font
-                cell.value = 0
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+        for idx in range(len(date_list)):
+            ws.cell(row=task_idx, column=col_offset + idx).border = border
+
+        # Fill straight from the (start, length) spans; the two never overlap
+        for days, fill, font, value in ((working_days, task_fill, task_font, 1),
+                                        (holiday_days, holiday_fill, holiday_font, 0)):
+            for span_start, length in days.spans():
+                for date in range(max(span_start, start_day), min(span_start + length, end_day + 1)):
+                    cell = ws.cell(row=task_idx, column=col_offset + date - start_day)
+                    cell.fill = fill
+                    cell.font = font
+                    cell.value = value
+                    cell.alignment = Alignment(horizontal="center", vertical="center")
+    if progress is not None:
+        progress(task_count, task_count)
 
     # Add project info sheet
     info_ws = wb.create_sheet("Project Info")
     info_ws['A1'] = "Project Name:"
     info_ws['B1'] = project.name
     info_ws['A2'] = "Start Date:"
-    info_ws['B2'] = project.start_date.strftime("%d/%m/%Y")
+    info_ws['B2'] = _convert_date_to_display(project.start_day)
     info_ws['A3'] = "End Date:"
-    info_ws['B3'] = end_date.strftime("%d/%m/%Y") if end_date else ""
+    info_ws['B3'] = _convert_date_to_display(end_day) if end_day else ""
     info_ws['A4'] = "Total Duration (days):"
-    info_ws['B4'] = (end_date - project.start_date).days + 1 if end_date else 0
+    info_ws['B4'] = end_day - project.start_day + 1 if end_day else 0
 
     # Bold the labels
     for row in range(1, 5):
@@ -168,6 +225,14 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
         cell.alignment = Alignment(horizontal="center", vertical="center")
         cell.border = border
 
+    # Shared calendar followed by each employee
+    cell = work_ws.cell(row=1, column=9)
+    cell.value = "Calendar"
+    cell.font = header_font
+    cell.fill = header_fill
+    cell.alignment = Alignment(horizontal="center", vertical="center")
+    cell.border = border
+
     # Add employee work patterns
     for row_idx, (emp_name, employee) in enumerate(sorted(project.employees.items()), start=2):
         work_ws.cell(row=row_idx, column=1).value = emp_name
@@ -178,15 +243,58 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
         for day_num in range(7):  # 0=Monday, 6=Sunday
             col = day_num + 2
             cell = work_ws.cell(row=row_idx, column=col)
-            if day_num in employee.work_pattern:
+            if employee.work_mask >> day_num & 1:
                 cell.value = "X"
                 cell.alignment = Alignment(horizontal="center", vertical="center")
             cell.border = border
 
+        cell = work_ws.cell(row=row_idx, column=9)
+        cell.value = employee.calendar
+        cell.border = border
+        cell.alignment = Alignment(vertical="center")
+
     # Set column widths for Work Schedules
     work_ws.column_dimensions['A'].width = 20
     for col in range(2, 9):
         work_ws.column_dimensions[work_ws.cell(row=1, column=col).column_letter].width = 12
+    work_ws.column_dimensions['I'].width = 20
+
+    # Add Calendars sheet (shared work patterns and holidays) if any are defined
+    if project.calendars:
+        calendar_ws = wb.create_sheet("Calendars")
+        headers = ["Calendar Name"] + days_of_week + ["Holidays"]
+        for col_idx, header in enumerate(headers, start=1):
+            cell = calendar_ws.cell(row=1, column=col_idx)
+            cell.value = header
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.border = border
+
+        for row_idx, (cal_name, calendar) in enumerate(sorted(project.calendars.items()), start=2):
+            calendar_ws.cell(row=row_idx, column=1).value = cal_name
+            calendar_ws.cell(row=row_idx, column=1).border = border
+            calendar_ws.cell(row=row_idx, column=1).alignment = Alignment(vertical="center")
+
+            for day_num in range(7):
+                cell = calendar_ws.cell(row=row_idx, column=day_num + 2)
+                if calendar.work_mask >> day_num & 1:
+                    cell.value = "X"
+                    cell.alignment = Alignment(horizontal="center", vertical="center")
+                cell.border = border
+
+            cell = calendar_ws.cell(row=row_idx, column=9)
+            if calendar.holidays or calendar.holiday_rules:
+                cell.value = _format_holidays(calendar.holidays, calendar.holiday_rules)
+            else:
+                cell.value = "None"
+            cell.border = border
+            cell.alignment = Alignment(vertical="center", wrap_text=True)
+
+        calendar_ws.column_dimensions['A'].width = 20
+        for col in range(2, 9):
+            calendar_ws.column_dimensions[calendar_ws.cell(row=1, column=col).column_letter].width = 12
+        calendar_ws.column_dimensions['I'].width = 60
 
     # Add Holiday Schedule sheet
     holiday_ws = wb.create_sheet("Holiday Schedule")
@@ -210,11 +318,9 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
     holiday_ws['A2'].border = border
     holiday_ws['A2'].alignment = Alignment(vertical="center")
 
-    if project.global_holidays:
-        sorted_global_holidays = sorted(project.global_holidays)
-        # Convert dates to dd/mm/yyyy format
-        formatted_holidays = [_convert_date_to_display(h) for h in sorted_global_holidays]
-        holiday_ws.cell(row=2, column=2).value = ", ".join(formatted_holidays)
+    if project.global_holidays or project.holiday_rules:
+        # Consecutive days are written as a single range
+        holiday_ws.cell(row=2, column=2).value = _format_holidays(project.global_holidays, project.holiday_rules)
     else:
         holiday_ws.cell(row=2, column=2).value = "None"
     holiday_ws.cell(row=2, column=2).border = border
@@ -227,11 +333,8 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
         holiday_ws.cell(row=row_idx, column=1).border = border
         holiday_ws.cell(row=row_idx, column=1).alignment = Alignment(vertical="center")
 
-        if employee.holidays:
-            sorted_holidays = sorted(employee.holidays)
-            # Convert dates to dd/mm/yyyy format
-            formatted_holidays = [_convert_date_to_display(h) for h in sorted_holidays]
-            holiday_ws.cell(row=row_idx, column=2).value = ", ".join(formatted_holidays)
+        if employee.holidays or employee.holiday_rules:
+            holiday_ws.cell(row=row_idx, column=2).value = _format_holidays(employee.holidays, employee.holiday_rules)
         else:
             holiday_ws.cell(row=row_idx, column=2).value = "None"
         holiday_ws.cell(row=row_idx, column=2).border = border
@@ -242,6 +345,38 @@ def export_to_excel(project: Project, filename: str = "gantt_chart.xlsx"):
     holiday_ws.column_dimensions['A'].width = 20
     holiday_ws.column_dimensions['B'].width = 60
 
+    # Add Critical Path sheet: float of every task, in working days
+    critical_ws = wb.create_sheet("Critical Path")
+    headers = ["Task Name", "Start Date", "End Date", "Total Float", "Free Float", "Critical"]
+    for col_idx, header in enumerate(headers, start=1):
+        cell = critical_ws.cell(row=1, column=col_idx)
+        cell.value = header
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.border = border
+
+    for row_idx, (row, total_float, free_float) in enumerate(zip(_task_rows(project), total_floats, free_floats),
+                                                             start=2):
+        name, task_start, task_end = row[0], row[8], row[9]
+        values = [name,
+                  _convert_date_to_display(task_start) if task_start is not None else "",
+                  _convert_date_to_display(task_end) if task_end is not None else "",
+                  total_float if total_float is not None else "",
+                  free_float if free_float is not None else "",
+                  "Yes" if total_float == 0 else ""]
+        for col_idx, value in enumerate(values, start=1):
+            cell = critical_ws.cell(row=row_idx, column=col_idx)
+            cell.value = value
+            cell.border = border
+            cell.alignment = Alignment(vertical="center")
+        if total_float == 0:
+            critical_ws.cell(row=row_idx, column=1).font = critical_font
+
+    critical_ws.column_dimensions['A'].width = 30
+    for col in "BCDEF":
+        critical_ws.column_dimensions[col].width = 12
+
     # Save the file
-    wb.save(filename)
-    return filename
+    wb.save(target)
+    return target
@@ -2,6 +2,13 @@ from openpyxl import load_workbook
 from datetime import datetime, timedelta
 import re
 
+from date_ranges import DateRangeSet
+from holiday_rules import is_date_entry, parse_holiday_rule
+
+
+# Separates the antecedents in the Depends On column ("Design; Build")
+DEPENDENCY_SEPARATOR = ';'
+
 
 class ExcelImportError(Exception):
     """Custom exception for Excel import errors."""
@@ -38,7 +45,7 @@ def _parse_date_flexible(date_str):
     raise ValueError(f"Invalid date format: {date_str}. Expected dd/mm/yyyy or YYYY-MM-DD")
 
 
-def _parse_date_ranges(date_input):
+def _parse_date_range_pairs(date_input):
     """
     Parse date ranges and individual dates from a string.
 
@@ -47,13 +54,14 @@ def _parse_date_ranges(date_input):
     - Date ranges: dd/mm/yyyy-dd/mm/yyyy or dd/mm/yyyy - dd/mm/yyyy
     - Multiple entries separated by commas
 
-    Returns a list of dates in YYYY-MM-DD format.
+    Returns a list of (start, end) datetime pairs, one per entry.
+    Invalid entries are skipped.
     """
     if not date_input or not str(date_input).strip():
         return []
 
     date_input = str(date_input).strip()
-    result_dates = []
+    result_ranges = []
 
     # Split by commas
     entries = [entry.strip() for entry in date_input.split(',')]
@@ -80,11 +88,7 @@ def _parse_date_ranges(date_input):
                 if start_date > end_date:
                     raise ValueError(f"Start date {start_str} is after end date {end_str}")
 
-                # Generate all dates in the range
-                current_date = start_date
-                while current_date <= end_date:
-                    result_dates.append(current_date.strftime('%Y-%m-%d'))
-                    current_date += timedelta(days=1)
+                result_ranges.append((start_date, end_date))
             except ValueError as e:
                 # Skip invalid date ranges but continue processing
                 pass
@@ -93,22 +97,75 @@ def _parse_date_ranges(date_input):
             try:
                 parsed_date = _parse_date_flexible(entry)
                 if parsed_date:
-                    result_dates.append(parsed_date)
+                    single_date = datetime.strptime(parsed_date, '%Y-%m-%d')
+                    result_ranges.append((single_date, single_date))
             except ValueError:
                 # Skip invalid dates but continue processing
                 pass
 
+    return result_ranges
+
+
+def _parse_date_ranges(date_input):
+    """
+    Parse date ranges and individual dates from a string.
+
+    Accepts the same formats as _parse_date_range_pairs().
+
+    Returns a list of dates in YYYY-MM-DD format, with ranges expanded.
+    """
+    result_dates = []
+    for start_date, end_date in _parse_date_range_pairs(date_input):
+        # Generate all dates in the range
+        current_date = start_date
+        while current_date <= end_date:
+            result_dates.append(current_date.strftime('%Y-%m-%d'))
+            current_date += timedelta(days=1)
+
     return result_dates
 
 
+def _parse_holiday_ranges(date_input):
+    """
+    Parse holidays into the compact form used by the API.
+
+    Accepts the same formats as _parse_date_range_pairs(), plus recurring
+    rules such as 'yearly 25/12' or 'Easter+1'. Returns a sorted list of
+    'YYYY-MM-DD' dates and 'YYYY-MM-DD/YYYY-MM-DD' ranges, with overlapping
+    and adjacent entries merged, followed by the rules in canonical form.
+    Invalid rules are skipped.
+    """
+    date_entries = []
+    rules = []
+    for entry in str(date_input).split(','):
+        entry = entry.strip()
+        if is_date_entry(entry):
+            date_entries.append(entry)
+        elif entry:
+            try:
+                rule = str(parse_holiday_rule(entry))
+            except ValueError:
+                continue
+            if rule not in rules:
+                rules.append(rule)
+
+    pairs = _parse_date_range_pairs(', '.join(date_entries))
+    holidays = DateRangeSet.from_ranges((start.toordinal(), end.toordinal()) for start, end in pairs)
+    return holidays.iso_entries() + rules
+
+
 def import_from_excel(filepath):
     """
     Import project data from an Excel file.
 
     Returns a dictionary with:
-    - project_info: {name, start_date, global_holidays}
-    - employees: [{name, work_pattern, holidays}, ...]
+    - project_info: {name, start_date, global_holidays, calendars}
+      (calendars: [{name, work_pattern, holidays}, ...] from the optional Calendars tab)
+    - employees: [{name, work_pattern, holidays, calendar}, ...]
+      (holidays are 'YYYY-MM-DD' dates, 'YYYY-MM-DD/YYYY-MM-DD' ranges
+      or recurring rules such as 'yearly 25/12')
     - tasks: [{name, dependency, assigned_to, estimated_duration, availability, contingency_margin, custom_start_date}, ...]
+      (dependency is a task name, or a list of names when it has several)
     """
     try:
         wb = load_workbook(filepath, data_only=True)
@@ -132,6 +189,9 @@ def import_from_excel(filepath):
     if has_holiday_tab:
         _extract_holidays(wb['Holiday Schedule'], project_info, employees)
 
+    if 'Calendars' in wb.sheetnames:
+        project_info['calendars'] = _extract_calendars(wb['Calendars'])
+
     tasks = _extract_tasks(wb['Gantt Chart'])
 
     wb.close()
@@ -148,7 +208,8 @@ def _extract_project_info(ws):
     project_info = {
         'name': None,
         'start_date': None,
-        'global_holidays': []
+        'global_holidays': [],
+        'calendars': []
     }
 
     # Read project name (A1:B1)
@@ -179,7 +240,8 @@ def _extract_employees(ws):
     employees = []
 
     # Header should be in row 1
-    # Columns: A=Employee Name, B-H=Mon-Sun
+    # Columns: A=Employee Name, B-H=Mon-Sun, I=Calendar (optional)
+    has_calendar_column = str(ws.cell(row=1, column=9).value or '').strip().lower() == 'calendar'
 
     # Start from row 2 (first data row)
     row = 2
@@ -198,10 +260,15 @@ def _extract_employees(ws):
             if cell_value and str(cell_value).strip().upper() == 'X':
                 work_pattern.append(day_num)
 
+        calendar = None
+        if has_calendar_column:
+            calendar = str(ws.cell(row=row, column=9).value or '').strip() or None
+
         employees.append({
             'name': emp_name,
             'work_pattern': work_pattern,
-            'holidays': []  # Will be filled in if Holiday Schedule exists
+            'holidays': [],  # Will be filled in if Holiday Schedule exists
+            'calendar': calendar
         })
 
         row += 1
@@ -228,10 +295,11 @@ def _extract_holidays(ws, project_info, employees):
         emp_name = str(emp_name).strip()
         holidays_str = ws.cell(row=row, column=2).value
 
-        # Parse holidays (supports individual dates and date ranges)
+        # Parse holidays (supports individual dates and date ranges),
+        # keeping ranges compact rather than expanding them day by day
         holidays = []
         if holidays_str and str(holidays_str).strip().upper() != 'NONE':
-            holidays = _parse_date_ranges(holidays_str)
+            holidays = _parse_holiday_ranges(holidays_str)
 
         # Assign to global or employee-specific
         if emp_name.upper() == 'GLOBAL':
@@ -242,6 +310,39 @@ def _extract_holidays(ws, project_info, employees):
         row += 1
 
 
+def _extract_calendars(ws):
+    """Extract shared calendars from Calendars tab."""
+    calendars = []
+
+    # Columns: A=Calendar Name, B-H=Mon-Sun, I=Holidays
+    row = 2
+    while True:
+        cal_name = ws.cell(row=row, column=1).value
+        if not cal_name:
+            break
+
+        work_pattern = []
+        for day_num in range(7):  # 0=Monday, 6=Sunday
+            cell_value = ws.cell(row=row, column=day_num + 2).value
+            if cell_value and str(cell_value).strip().upper() == 'X':
+                work_pattern.append(day_num)
+
+        holidays_str = ws.cell(row=row, column=9).value
+        holidays = []
+        if holidays_str and str(holidays_str).strip().upper() != 'NONE':
+            holidays = _parse_holiday_ranges(holidays_str)
+
+        calendars.append({
+            'name': str(cal_name).strip(),
+            'work_pattern': work_pattern,
+            'holidays': holidays
+        })
+
+        row += 1
+
+    return calendars
+
+
 def _extract_tasks(ws):
     """Extract tasks from Gantt Chart tab."""
     tasks = []
@@ -263,9 +364,13 @@ def _extract_tasks(ws):
         # Extract task data
         dependency = ws.cell(row=row, column=2).value  # Column B
         if dependency:
-            dependency = str(dependency).strip()
-            if not dependency:
-                dependency = None
+            # Several antecedents are separated by semicolons
+            names = [name.strip() for name in str(dependency).split(DEPENDENCY_SEPARATOR)]
+            names = [name for name in names if name]
+            if len(names) > 1:
+                dependency = names
+            else:
+                dependency = names[0] if names else None
         else:
             dependency = None
 
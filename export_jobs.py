@@ -0,0 +1,197 @@
+import io
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Callable, Dict, Hashable, Optional
+
+from excel_export import export_to_excel
+
+
+class ExportQueueFullError(RuntimeError):
+    """Raised when too many exports are already waiting for a worker."""
+
+
+class ExportJob:
+    """An Excel export run in the background, and its result once done."""
+
+    __slots__ = ('id', 'key', 'filename', 'status', 'written', 'total', 'error', 'result', 'size', 'finished',
+                 '_lock', '_readers', '_dropped')
+
+    def __init__(self, key: Hashable, filename: str, total: int):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.filename = filename  # download name
+        self.status = 'queued'  # then 'running', and 'done' or 'failed'
+        self.written = 0  # tasks written so far, out of total
+        self.total = total
+        self.error: Optional[str] = None
+        self.result: Optional[BinaryIO] = None  # the workbook, once done
+        self.size = 0
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()  # serialises reads of result
+        self._readers = 0  # open readers, which keep the workbook
+        self._dropped = False
+
+    def open(self) -> Optional[io.RawIOBase]:
+        """
+        A reader of the workbook of a finished job, from its start, or None
+        if the workbook was dropped. The workbook is kept until the reader
+        is closed, even if the job expires meanwhile.
+        """
+        with self._lock:
+            if self.result is None or self._dropped:
+                return None
+            self._readers += 1
+        return _ResultReader(self)
+
+    def close(self):
+        """Drop the workbook, once its open readers are closed."""
+        with self._lock:
+            self._dropped = True
+            if not self._readers and self.result is not None:
+                self.result.close()
+
+    def _release(self):
+        with self._lock:
+            self._readers -= 1
+            if self._dropped and not self._readers:
+                self.result.close()
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'filename': self.filename,
+            'tasks_written': self.written,
+            'tasks_total': self.total,
+            'progress': round(100 * self.written / self.total) if self.total else 100,
+            'error': self.error,
+        }
+
+
+class _ResultReader(io.RawIOBase):
+    """Reads a job's workbook independently of the other readers of it."""
+
+    def __init__(self, job: ExportJob):
+        self._job = job
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        job = self._job
+        with job._lock:
+            job.result.seek(self._position)
+            data = job.result.read(len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._job._release()
+        super().close()
+
+
+class ExportJobs:
+    """
+    Excel exports run by a bounded pool of worker threads, so a request
+    only submits the export and polls for it instead of waiting.
+
+    Jobs are keyed by what they export (e.g. the snapshot serial and the
+    download name): submitting a key that already has a queued, running or
+    finished job returns that job. At most max_pending jobs wait for a worker. Workbooks
+    are kept in memory up to spool_bytes (in an anonymous temporary file
+    beyond that) and dropped, with their job, expire_after seconds after
+    the job finished.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 16, expire_after: float = 600.0,
+                 spool_bytes: int = 8 * 1024 * 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_pending = max_pending
+        self.expire_after = expire_after
+        self.spool_bytes = spool_bytes
+        self._clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='excel-export')
+        self._jobs: Dict[str, ExportJob] = {}
+        self._by_key: Dict[Hashable, ExportJob] = {}
+        self._lock = threading.Lock()
+        self.expired = 0
+
+    def submit(self, key: Hashable, snapshot, filename: str) -> ExportJob:
+        """
+        Start exporting a schedule snapshot (or return the job already
+        exporting that key). Raises ExportQueueFullError when max_pending
+        jobs are queued.
+        """
+        with self._lock:
+            self._expire()
+            job = self._by_key.get(key)
+            if job is not None and job.status != 'failed':
+                return job
+            if sum(job.status == 'queued' for job in self._jobs.values()) >= self.max_pending:
+                raise ExportQueueFullError('Too many exports in progress, try again later')
+            job = ExportJob(key, filename, len(snapshot.tasks))
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+        self._pool.submit(self._run, job, snapshot)
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """A job that has not expired, or None."""
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def _run(self, job: ExportJob, snapshot):
+        job.status = 'running'
+        workbook = SpooledTemporaryFile(self.spool_bytes)
+        try:
+            export_to_excel(snapshot, workbook, progress=lambda written, total: setattr(job, 'written', written))
+        except Exception as e:
+            workbook.close()
+            job.error = str(e)
+            job.status = 'failed'
+        else:
+            job.size = workbook.tell()
+            job.result = workbook
+            job.status = 'done'
+        job.finished = self._clock()
+
+    def _expire(self):
+        """Drop the jobs (and workbooks) that finished too long ago; call holding the lock."""
+        now = self._clock()
+        for job in [job for job in self._jobs.values()
+                    if job.finished is not None and now - job.finished > self.expire_after]:
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+            job.close()
+            self.expired += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        with self._lock:
+            self._expire()
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                'jobs': len(statuses),
+                'queued': statuses.count('queued'),
+                'running': statuses.count('running'),
+                'done': statuses.count('done'),
+                'failed': statuses.count('failed'),
+                'max_pending': self.max_pending,
+                'expired': self.expired,
+            }
+
+    def shutdown(self):
+        """Stop the workers and drop every workbook."""
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            for job in self._jobs.values():
+                job.close()
+            self._jobs.clear()
+            self._by_key.clear()
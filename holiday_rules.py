@@ -0,0 +1,262 @@
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+import re
+
+from date_ranges import DateRangeSet, parse_iso_ranges, to_ordinal
+
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+ORDINAL_NAMES = {1: '1st', 2: '2nd', 3: '3rd', 4: '4th', 5: '5th', -1: 'last'}
+
+
+def easter_sunday(year: int) -> date:
+    """Date of Easter Sunday in the Gregorian calendar (anonymous algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+class HolidayRule:
+    """
+    A holiday that recurs every year.
+
+    Rules compare and hash by their canonical text (str(rule)), which is also
+    the form written to the Holiday Schedule sheet and returned by the API.
+    """
+
+    def occurrences(self, year: int) -> List[int]:
+        """Day ordinals on which the holiday falls in a given year."""
+        raise NotImplementedError
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, HolidayRule) and str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
+
+
+class FixedDateRule(HolidayRule):
+    """The same day and month every year, e.g. 'yearly 25/12'."""
+
+    def __init__(self, day: int, month: int):
+        if not 1 <= month <= 12 or not 1 <= day <= monthrange(2000, month)[1]:
+            raise ValueError(f"Invalid day/month {day}/{month}")
+        self.day = day
+        self.month = month
+
+    def occurrences(self, year: int) -> List[int]:
+        # 29/02 only occurs in leap years
+        if self.day > monthrange(year, self.month)[1]:
+            return []
+        return [date(year, self.month, self.day).toordinal()]
+
+    def __str__(self) -> str:
+        return f"yearly {self.day:02d}/{self.month:02d}"
+
+
+class NthWeekdayRule(HolidayRule):
+    """The nth (or last) weekday of a month, e.g. '1st Monday of May'."""
+
+    def __init__(self, nth: int, weekday: int, month: int):
+        if nth not in ORDINAL_NAMES:
+            raise ValueError(f"Invalid occurrence {nth}, expected 1-5 or last")
+        self.nth = nth
+        self.weekday = weekday
+        self.month = month
+
+    def occurrences(self, year: int) -> List[int]:
+        first_weekday, days_in_month = monthrange(year, self.month)
+        if self.nth == -1:
+            last_weekday = (first_weekday + days_in_month - 1) % 7
+            day = days_in_month - (last_weekday - self.weekday) % 7
+        else:
+            day = 1 + (self.weekday - first_weekday) % 7 + 7 * (self.nth - 1)
+            if day > days_in_month:
+                return []  # e.g. no 5th Monday this month
+        return [date(year, self.month, day).toordinal()]
+
+    def __str__(self) -> str:
+        return f"{ORDINAL_NAMES[self.nth]} {WEEKDAY_NAMES[self.weekday]} of {MONTH_NAMES[self.month - 1]}"
+
+
+class EasterRule(HolidayRule):
+    """A day relative to Easter Sunday, e.g. 'Easter-2' (Good Friday) or 'Easter+1'."""
+
+    def __init__(self, offset: int = 0):
+        self.offset = offset
+
+    def occurrences(self, year: int) -> List[int]:
+        return [easter_sunday(year).toordinal() + self.offset]
+
+    def __str__(self) -> str:
+        return f"Easter{self.offset:+d}" if self.offset else "Easter"
+
+
+_FIXED_PATTERN = re.compile(r'^yearly\s+(\d{1,2})/(\d{1,2})$', re.IGNORECASE)
+_NTH_PATTERN = re.compile(r'^(1st|2nd|3rd|4th|5th|last)\s+([a-z]+)\s+of\s+([a-z]+)$', re.IGNORECASE)
+_EASTER_PATTERN = re.compile(r'^easter\s*(?:([+-])\s*(\d+))?$', re.IGNORECASE)
+# Explicit dates and ranges start with a date: YYYY-MM-DD (the API) or
+# dd/mm/yyyy (the Holiday Schedule sheet); ordinal rules start with a digit too
+_DATE_ENTRY_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})\b')
+
+
+def _lookup_name(name: str, names: List[str], kind: str) -> int:
+    """Index of a weekday or month name; accepts unambiguous 3-letter abbreviations."""
+    name = name.lower()
+    for idx, full_name in enumerate(names):
+        if full_name.lower() == name or (len(name) >= 3 and full_name.lower().startswith(name)):
+            return idx
+    raise ValueError(f"Unknown {kind} '{name}'")
+
+
+def parse_holiday_rule(text: str) -> HolidayRule:
+    """
+    Parse a recurring holiday rule.
+
+    Accepts formats:
+    - Fixed date each year: yearly dd/mm
+    - Nth weekday of a month: 1st|2nd|3rd|4th|5th|last <weekday> of <month>
+    - Relative to Easter Sunday: Easter, Easter+N, Easter-N
+    """
+    text = str(text).strip()
+
+    match = _FIXED_PATTERN.match(text)
+    if match:
+        return FixedDateRule(int(match.group(1)), int(match.group(2)))
+
+    match = _NTH_PATTERN.match(text)
+    if match:
+        nth = {name: n for n, name in ORDINAL_NAMES.items()}[match.group(1).lower()]
+        weekday = _lookup_name(match.group(2), WEEKDAY_NAMES, 'weekday')
+        month = _lookup_name(match.group(3), MONTH_NAMES, 'month') + 1
+        return NthWeekdayRule(nth, weekday, month)
+
+    match = _EASTER_PATTERN.match(text)
+    if match:
+        offset = int(match.group(2) or 0)
+        return EasterRule(-offset if match.group(1) == '-' else offset)
+
+    raise ValueError(f"Invalid holiday rule '{text}'. Expected 'yearly dd/mm', "
+                     f"'<1st-5th|last> <weekday> of <month>' or 'Easter[+/-N]'")
+
+
+class RecurringHolidays:
+    """
+    A set of holiday rules, expanded lazily one year at a time.
+
+    Only the years a lookup touches are expanded, and each expanded year is
+    cached, so repeated schedules over the same window do not pay again.
+    """
+
+    __slots__ = ('_rules', '_years')
+
+    def __init__(self, rules: Iterable[HolidayRule] = ()):
+        self._rules: List[HolidayRule] = []
+        self._years: Dict[int, List[int]] = {}
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: HolidayRule):
+        if rule not in self._rules:
+            self._rules.append(rule)
+            self._years.clear()
+
+    @property
+    def rules(self) -> List[HolidayRule]:
+        return list(self._rules)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __iter__(self):
+        return iter(self._rules)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RecurringHolidays):
+            return set(self._rules) == set(other._rules)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RecurringHolidays({[str(rule) for rule in self._rules]!r})"
+
+    def _year(self, year: int) -> List[int]:
+        days = self._years.get(year)
+        if days is None:
+            days = sorted({day for rule in self._rules for day in rule.occurrences(year)})
+            self._years[year] = days
+        return days
+
+    def days_between(self, start: int, end: int) -> List[int]:
+        """Sorted day ordinals in [start, end] on which a rule falls."""
+        if end < start or not self._rules:
+            return []
+        result = []
+        # Easter offsets can move a holiday across a year boundary, so look
+        # one year either side of the window
+        for year in range(date.fromordinal(start).year - 1, date.fromordinal(end).year + 2):
+            days = self._year(year)
+            result.extend(days[bisect_left(days, start):bisect_right(days, end)])
+        result.sort()
+        return result
+
+    def ranges_between(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """The holidays in [start, end] as single-day ranges."""
+        return [(day, day) for day in self.days_between(start, end)]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check if any rule falls in [start, end]."""
+        return bool(self.days_between(start, end))
+
+    def __contains__(self, day) -> bool:
+        day = to_ordinal(day)
+        return bool(self.days_between(day, day))
+
+    def symmetric_difference(self, other: 'RecurringHolidays') -> 'RecurringHolidays':
+        """Rules present in exactly one of the two sets."""
+        return RecurringHolidays(set(self._rules) ^ set(other._rules))
+
+
+def is_date_entry(entry: str) -> bool:
+    """Whether a holiday entry is an explicit date or range rather than a recurring rule."""
+    return _DATE_ENTRY_PATTERN.match(entry.strip()) is not None
+
+
+def parse_holiday_entries(entries) -> Tuple[DateRangeSet, RecurringHolidays]:
+    """
+    Split API holiday entries into explicit dates and recurring rules.
+
+    Entries are 'YYYY-MM-DD' dates, 'YYYY-MM-DD/YYYY-MM-DD' ranges, or rules
+    accepted by parse_holiday_rule(). Raises ValueError on anything else.
+    """
+    dates = []
+    rules = RecurringHolidays()
+    for entry in entries or ():
+        entry = str(entry).strip()
+        if is_date_entry(entry):
+            dates.append(entry)
+        else:
+            rules.add(parse_holiday_rule(entry))
+    return parse_iso_ranges(dates), rules
+
+
+def format_holiday_entries(holidays: DateRangeSet, rules: RecurringHolidays) -> List[str]:
+    """The inverse of parse_holiday_entries(): compact dates and ranges, then rule texts."""
+    return holidays.iso_entries() + [str(rule) for rule in rules]
@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional, Sequence
+
+
+class IntervalIndex:
+    """
+    Static index of day intervals (a task's start and end day), answering
+    which of them overlap a window.
+
+    A binary tree over the intervals in their given order keeps the earliest
+    start and latest end below each node; a query only descends into nodes
+    that can hold an overlapping interval, so it costs about the number of
+    matches times the tree height rather than a scan of every interval.
+    Matches come out in the given order. Intervals without dates (None) never
+    overlap a window.
+    """
+
+    __slots__ = ('_items', '_size', '_min_start', '_max_end')
+
+    def __init__(self, items: Sequence[int], starts: Sequence[Optional[int]], ends: Sequence[Optional[int]]):
+        # items are what a query returns for each interval, e.g. task positions
+        self._items = list(items)
+        size = 1
+        while size < len(self._items):
+            size *= 2
+        self._size = size
+        # Leaves are the nodes size..2*size-1; empty ones never match
+        no_start, no_end = float('inf'), float('-inf')
+        min_start = [no_start] * (2 * size)
+        max_end = [no_end] * (2 * size)
+        for leaf, (start, end) in enumerate(zip(starts, ends), start=size):
+            if start is not None and end is not None:
+                min_start[leaf] = start
+                max_end[leaf] = end
+        for node in range(size - 1, 0, -1):
+            min_start[node] = min(min_start[2 * node], min_start[2 * node + 1])
+            max_end[node] = max(max_end[2 * node], max_end[2 * node + 1])
+        self._min_start = min_start
+        self._max_end = max_end
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def overlapping(self, first_day: int, last_day: int) -> List[int]:
+        """The items whose interval shares a day with [first_day, last_day], in order."""
+        if not self._items:
+            return []
+        min_start, max_end, size, items = self._min_start, self._max_end, self._size, self._items
+        result = []
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            if min_start[node] > last_day or max_end[node] < first_day:
+                continue
+            if node >= size:
+                result.append(items[node - size])
+            else:
+                # Right child first so that the left one is visited first
+                stack.append(2 * node + 1)
+                stack.append(2 * node)
+        return result
+
+
+class TaskIndex:
+    """
+    Lookups over the tasks of a schedule: an IntervalIndex of all the tasks
+    and one per assignee, built on first use. Queries return task positions.
+    """
+
+    def __init__(self, tasks: Sequence):
+        self._tasks = tasks
+        self._by_assignee: Dict[str, List[int]] = {}
+        for position, task in enumerate(tasks):
+            self._by_assignee.setdefault(task.assigned_to, []).append(position)
+        self._intervals: Dict[Optional[str], IntervalIndex] = {}
+
+    def positions(self, assigned_to: Optional[str] = None) -> Sequence[int]:
+        """Positions of every task, or of the tasks assigned to someone."""
+        if assigned_to is None:
+            return range(len(self._tasks))
+        return self._by_assignee.get(assigned_to, [])
+
+    def _interval_index(self, assigned_to: Optional[str]) -> IntervalIndex:
+        index = self._intervals.get(assigned_to)
+        if index is None:
+            positions = self.positions(assigned_to)
+            tasks = self._tasks
+            index = self._intervals[assigned_to] = IntervalIndex(
+                positions, [tasks[position].start_day for position in positions],
+                [tasks[position].end_day for position in positions])
+        return index
+
+    def query(self, first_day: Optional[int] = None, last_day: Optional[int] = None,
+              assigned_to: Optional[str] = None) -> Sequence[int]:
+        """
+        Positions of the tasks (of one assignee, if given) scheduled on any
+        day of [first_day, last_day], in task order; all of them without a
+        window. Either end of the window may be left open.
+        """
+        if first_day is None and last_day is None:
+            return self.positions(assigned_to)
+        return self._interval_index(assigned_to).overlapping(
+            first_day if first_day is not None else float('-inf'),
+            last_day if last_day is not None else float('inf'))
@@ -1,9 +1,52 @@
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Set
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import compress
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+import heapq
+import os
 import re
 
+import batch_scheduler
+import monte_carlo
+import parallel_scheduler
+from calendar_index import CalendarIndex, CalendarOverlay, weekday_of
+from date_ranges import DateLike, DateRangeSet, DaySpans, to_ordinal
+from holiday_rules import HolidayRule, RecurringHolidays, parse_holiday_rule
+from resource_levelling import FULL_CAPACITY, BookingTimeline
 
-def parse_date_ranges(date_input: str) -> Set[str]:
+
+# Weekday bitmask for the default Mon-Fri work pattern (bit 0 = Monday)
+WEEKDAYS_MASK = 0b0011111
+
+
+def from_ordinal(ordinal: int) -> datetime:
+    """Convert a day ordinal to a datetime at midnight."""
+    return datetime.fromordinal(ordinal)
+
+
+@lru_cache(maxsize=4096)
+def format_ordinal(ordinal: int, fmt: str = '%Y-%m-%d') -> str:
+    """Format a day ordinal as a string (default YYYY-MM-DD)."""
+    return date.fromordinal(ordinal).strftime(fmt)
+
+
+def pattern_to_mask(work_days) -> int:
+    """Convert a list of weekday numbers (0=Monday, 6=Sunday) to a bitmask."""
+    mask = 0
+    for day in work_days:
+        mask |= 1 << day
+    return mask
+
+
+def mask_to_pattern(mask: int) -> List[int]:
+    """Convert a weekday bitmask back to a sorted list of weekday numbers."""
+    return [day for day in range(7) if mask >> day & 1]
+
+
+def parse_holiday_ranges(date_input: str) -> DateRangeSet:
     """
     Parse date ranges and individual dates from a string.
 
@@ -12,12 +55,12 @@ def parse_date_ranges(date_input: str) -> Set[str]:
     - Date ranges: dd/mm/yyyy-dd/mm/yyyy or dd/mm/yyyy - dd/mm/yyyy
     - Multiple entries separated by commas
 
-    Returns a set of dates in YYYY-MM-DD format.
+    Returns the dates as a DateRangeSet, without expanding ranges.
     """
     if not date_input or not date_input.strip():
-        return set()
+        return DateRangeSet()
 
-    result_dates = set()
+    ranges = []
 
     # Split by commas
     entries = [entry.strip() for entry in date_input.split(',')]
@@ -44,203 +87,1830 @@ def parse_date_ranges(date_input: str) -> Set[str]:
                 if start_date > end_date:
                     raise ValueError(f"Start date {start_str} is after end date {end_str}")
 
-                # Generate all dates in the range
-                current_date = start_date
-                while current_date <= end_date:
-                    result_dates.add(current_date.strftime('%Y-%m-%d'))
-                    current_date += timedelta(days=1)
+                ranges.append((start_date.toordinal(), end_date.toordinal()))
             except ValueError as e:
                 raise ValueError(f"Invalid date range '{entry}': {str(e)}")
         else:
             # This is a single date
             try:
                 # Try dd/mm/yyyy format
-                date_obj = datetime.strptime(entry, '%d/%m/%Y')
-                result_dates.add(date_obj.strftime('%Y-%m-%d'))
+                day = datetime.strptime(entry, '%d/%m/%Y').toordinal()
+                ranges.append((day, day))
             except ValueError:
                 raise ValueError(f"Invalid date format '{entry}'. Expected dd/mm/yyyy or dd/mm/yyyy-dd/mm/yyyy")
 
-    return result_dates
+    return DateRangeSet.from_ranges(ranges)
 
 
-class Employee:
-    """Represents an employee with their work schedule and holidays."""
+def parse_date_ranges(date_input: str) -> Set[str]:
+    """
+    Parse date ranges and individual dates from a string.
 
-    def __init__(self, name: str):
+    Same input as parse_holiday_ranges(), but returns a set of dates in
+    YYYY-MM-DD format with ranges expanded to one entry per day.
+    """
+    return {format_ordinal(day) for day in parse_holiday_ranges(date_input)}
+
+
+class HolidaySchedule:
+    """
+    Base for anything that carries holidays: explicit dates and ranges plus
+    recurring rules. Subclasses report changes through _holidays_changed().
+    """
+
+    __slots__ = ('holidays', 'holiday_rules')
+
+    def __init__(self):
+        # Holidays, stored as merged ranges of day ordinals
+        self.holidays = DateRangeSet()
+        # Recurring holidays (e.g. a yearly local feast day)
+        self.holiday_rules = RecurringHolidays()
+
+    def _holidays_changed(self, changed_days):
+        """Called with the days (or rules) added or removed."""
+
+    def add_holiday(self, day: DateLike):
+        """Add a holiday date ('YYYY-MM-DD', date or ordinal)."""
+        self.add_holiday_range(day, day)
+
+    def add_holiday_range(self, start: DateLike, end: DateLike):
+        """Add every day from start to end (inclusive) as a holiday."""
+        start, end = to_ordinal(start), to_ordinal(end)
+        if self.holidays.ranges_between(start, end) == [(start, end)]:
+            return  # already a holiday throughout
+        self.holidays.add_range(start, end)
+        self._holidays_changed(DateRangeSet.from_ranges([(start, end)]))
+
+    def set_holidays(self, holidays):
+        """Replace the holidays (a DateRangeSet, or dates/ordinals)."""
+        if not isinstance(holidays, DateRangeSet):
+            holidays = DateRangeSet(holidays)
+        changed = holidays.symmetric_difference(self.holidays)
+        if not changed:
+            return
+        self.holidays = holidays
+        self._holidays_changed(changed)
+
+    def add_holiday_rule(self, rule):
+        """Add a recurring holiday (a HolidayRule or its text, e.g. 'yearly 17/03')."""
+        if not isinstance(rule, HolidayRule):
+            rule = parse_holiday_rule(rule)
+        self.set_holiday_rules(self.holiday_rules.rules + [rule])
+
+    def set_holiday_rules(self, rules):
+        """Replace the recurring holidays."""
+        if not isinstance(rules, RecurringHolidays):
+            rules = RecurringHolidays(rule if isinstance(rule, HolidayRule) else parse_holiday_rule(rule)
+                                      for rule in rules)
+        changed = rules.symmetric_difference(self.holiday_rules)
+        if not changed:
+            return
+        self.holiday_rules = rules
+        self._holidays_changed(changed)
+
+    def is_holiday(self, day: DateLike) -> bool:
+        day = to_ordinal(day)
+        return day in self.holidays or day in self.holiday_rules
+
+
+class WorkCalendar(HolidaySchedule):
+    """
+    A named working-time profile (work pattern and holidays), e.g. a regional
+    calendar. The project holds each calendar once and employees reference it
+    by name, so its working-day index is built once for all of them.
+    """
+
+    __slots__ = ('name', 'work_mask', '_project')
+
+    def __init__(self, name: str, work_pattern: Optional[List[int]] = None):
+        super().__init__()
         self.name = name
-        # Work pattern: list of weekday numbers (0=Monday, 4=Friday)
-        # Default is Mon-Fri (0,1,2,3,4)
-        self.work_pattern: List[int] = [0, 1, 2, 3, 4]
-        # Individual holidays: set of date strings in 'YYYY-MM-DD' format
-        self.holidays: Set[str] = set()
+        # Work pattern as a weekday bitmask (bit 0 = Monday), default Mon-Fri
+        self.work_mask: int = WEEKDAYS_MASK if work_pattern is None else pattern_to_mask(work_pattern)
+        # Project notified of schedule-affecting changes (set by Project.add_calendar)
+        self._project: Optional['Project'] = None
+
+    @property
+    def work_pattern(self) -> List[int]:
+        """Working weekdays as a sorted list (0=Monday, 6=Sunday)."""
+        return mask_to_pattern(self.work_mask)
 
     def set_work_pattern(self, work_days: List[int]):
-        """Set which days of the week the employee works (0=Monday, 6=Sunday)."""
-        self.work_pattern = sorted(work_days)
+        """Set which days of the week the calendar works (0=Monday, 6=Sunday)."""
+        work_mask = pattern_to_mask(work_days)
+        if work_mask == self.work_mask:
+            return
+        self.work_mask = work_mask
+        if self._project is not None:
+            self._project.mark_calendar_dirty(self)
+
+    def _holidays_changed(self, changed_days):
+        if self._project is not None:
+            self._project.mark_calendar_dirty(self, changed_days)
 
-    def add_holiday(self, date_str: str):
-        """Add a holiday date for this employee (format: 'YYYY-MM-DD')."""
-        self.holidays.add(date_str)
 
-    def is_working_day(self, date: datetime, global_holidays: Set[str]) -> bool:
+class Employee(HolidaySchedule):
+    """
+    Represents an employee with their work schedule and holidays.
+
+    An employee may follow a shared WorkCalendar (by name); their own work
+    pattern, if set, overrides the calendar's, and their own holidays are
+    taken on top of the calendar's.
+    """
+
+    __slots__ = ('name', 'calendar', 'work_mask_override', '_project')
+
+    def __init__(self, name: str, calendar: Optional[str] = None):
+        super().__init__()
+        self.name = name
+        # Name of the WorkCalendar followed (None = project defaults only)
+        self.calendar = calendar
+        # Personal work pattern as a weekday bitmask (bit 0 = Monday), or
+        # None to follow the calendar (Mon-Fri without one)
+        self.work_mask_override: Optional[int] = None
+        # Project notified of schedule-affecting changes (set by Project.add_employee)
+        self._project: Optional['Project'] = None
+
+    def _calendar(self) -> Optional[WorkCalendar]:
+        if self.calendar is None or self._project is None:
+            return None
+        return self._project.calendars.get(self.calendar)
+
+    @property
+    def work_mask(self) -> int:
+        """Effective work pattern as a weekday bitmask."""
+        if self.work_mask_override is not None:
+            return self.work_mask_override
+        calendar = self._calendar()
+        return calendar.work_mask if calendar is not None else WEEKDAYS_MASK
+
+    @property
+    def work_pattern(self) -> List[int]:
+        """Working weekdays as a sorted list (0=Monday, 6=Sunday)."""
+        return mask_to_pattern(self.work_mask)
+
+    def set_work_pattern(self, work_days: Optional[List[int]]):
+        """
+        Set which days of the week the employee works (0=Monday, 6=Sunday).
+        None drops a personal pattern and follows the calendar again.
+        """
+        override = None if work_days is None else pattern_to_mask(work_days)
+        if override == self.work_mask_override:
+            return
+        previous_mask = self.work_mask
+        self.work_mask_override = override
+        if self._project is not None and self.work_mask != previous_mask:
+            self._project.mark_employee_dirty(self)
+
+    def set_calendar(self, calendar: Optional[str]):
+        """Follow the named WorkCalendar (None for the project defaults)."""
+        if calendar == self.calendar:
+            return
+        self.calendar = calendar
+        if self._project is not None:
+            self._project.mark_employee_dirty(self)
+
+    def _holidays_changed(self, changed_days):
+        if self._project is not None:
+            self._project.mark_employee_dirty(self, changed_days)
+
+    def is_working_day(self, day: DateLike, global_holidays: DateRangeSet) -> bool:
         """Check if the employee works on a given date."""
-        date_str = date.strftime('%Y-%m-%d')
+        day = to_ordinal(day)
 
-        # Check if it's a holiday (global or personal)
-        if date_str in global_holidays or date_str in self.holidays:
+        # Check if it's a holiday (global, calendar or personal)
+        if day in global_holidays or self.is_holiday(day):
+            return False
+        calendar = self._calendar()
+        if calendar is not None and calendar.is_holiday(day):
+            return False
+        if self._project is not None and day in self._project.holiday_rules:
             return False
 
         # Check if it's in their work pattern
-        return date.weekday() in self.work_pattern
+        return bool(self.work_mask >> weekday_of(day) & 1)
+
+
+class TaskFields:
+    """
+    Derived task properties shared by Task and the TaskView rows of a
+    TaskTable. Dates are held as day ordinals; the *_date properties convert
+    to and from datetime for callers at the API and export edges.
+    """
+
+    __slots__ = ()
+
+    # Fields the scheduler reads; assigning a new value marks the task dirty
+    SCHEDULE_INPUTS = frozenset({
+        'name', 'estimated_duration', 'assigned_to', 'dependency',
+        'availability', 'contingency_margin', 'custom_start_day',
+    })
+    # Inputs that change the shape of the dependency graph
+    GRAPH_INPUTS = frozenset({'name', 'dependency', 'custom_start_day'})
+
+    @property
+    def custom_start_date(self) -> Optional[datetime]:
+        return from_ordinal(self.custom_start_day) if self.custom_start_day is not None else None
+
+    @custom_start_date.setter
+    def custom_start_date(self, value: Optional[DateLike]):
+        self.custom_start_day = to_ordinal(value) if value else None
+
+    @property
+    def start_date(self) -> Optional[datetime]:
+        return from_ordinal(self.start_day) if self.start_day is not None else None
+
+    @property
+    def end_date(self) -> Optional[datetime]:
+        return from_ordinal(self.end_day) if self.end_day is not None else None
+
+    @property
+    def working_dates(self) -> List[datetime]:
+        """Working days as datetimes (expands working_days; prefer the spans)."""
+        return [from_ordinal(day) for day in self.working_days]
 
+    @property
+    def holiday_dates(self) -> List[datetime]:
+        """Holidays as datetimes (expands holiday_days; prefer the spans)."""
+        return [from_ordinal(day) for day in self.holiday_days]
 
-class Task:
+    def schedule_inputs(self) -> tuple:
+        """The values of all scheduling inputs, for change detection."""
+        return (self.name, self.estimated_duration, self.assigned_to, self.dependency,
+                self.availability, self.contingency_margin, self.custom_start_day)
+
+    def calculate_actual_duration(self) -> int:
+        """Calculate actual duration based on availability and contingency margin."""
+        return actual_duration(self.estimated_duration, self.availability, self.contingency_margin)
+
+
+def actual_duration(estimated_duration, availability, contingency_margin) -> int:
+    """Working days a task takes given its estimate, availability (%) and contingency (%)."""
+    # Formula: actual_duration = estimated_duration / availability * 100 * (1 + contingency_margin/100)
+    duration = (estimated_duration / availability * 100) * (1 + contingency_margin / 100)
+    return round(duration)
+
+
+def dependency_names(dependency) -> Tuple[str, ...]:
+    """
+    The antecedent names of a dependency field: None, one task name, or a
+    list of names (duplicates and empty names are dropped).
+    """
+    if not dependency:
+        return ()
+    if isinstance(dependency, str):
+        return (dependency,)
+    return tuple(dict.fromkeys(name for name in dependency if name))
+
+
+def whole_number(value) -> int:
+    """
+    A task duration or percentage as an int: whole numbers are accepted in
+    any numeric form (3, 3.0, '3'); anything else raises ValueError.
+    """
+    if isinstance(value, int):
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{value!r} is not a whole number")
+    if not number.is_integer():
+        raise ValueError(f"{value!r} is not a whole number")
+    return int(number)
+
+
+def normalize_dependency(dependency):
+    """Store a dependency as None, a single name, or a tuple of two or more names."""
+    names = dependency_names(dependency)
+    if len(names) < 2:
+        return names[0] if names else None
+    return names
+
+
+class Task(TaskFields):
     """Represents a task in the Gantt chart."""
 
+    __slots__ = ('name', 'estimated_duration', 'assigned_to', 'dependency', 'availability',
+                 'contingency_margin', 'custom_start_day', 'actual_duration', 'start_day', 'end_day',
+                 'working_days', 'holiday_days', '_earliest_day', '_scheduled_after', '_project')
+
     def __init__(self, name: str, estimated_duration: int, assigned_to: str):
+        # Owning project, notified when a scheduling input changes
+        self._project: Optional['Project'] = None
+
         self.name = name
         self.estimated_duration = estimated_duration  # in days
         self.assigned_to = assigned_to  # employee name
-        self.dependency: Optional[str] = None  # name of antecedent task
+        # Name of the antecedent task, or a tuple of names when it has several
+        # (any list assigned is normalized, see normalize_dependency())
+        self.dependency = None
         self.availability: int = 100  # percentage (1-100)
         self.contingency_margin: int = 0  # percentage (0+)
-        self.custom_start_date: Optional[datetime] = None  # custom start date (overrides dependency)
+        self.custom_start_day: Optional[int] = None  # custom start date (overrides dependency)
 
         # Calculated fields
         self.actual_duration: int = 0
-        self.start_date: Optional[datetime] = None
-        self.end_date: Optional[datetime] = None
-        self.working_dates: List[datetime] = []
-        self.holiday_dates: List[datetime] = []  # Holiday dates within task's date range
+        self.start_day: Optional[int] = None
+        self.end_day: Optional[int] = None
+        # Working days and holidays within the task's date range, stored as
+        # (start ordinal, length) runs
+        self.working_days = DaySpans()
+        self.holiday_days = DaySpans()
 
-    def calculate_actual_duration(self) -> int:
-        """Calculate actual duration based on availability and contingency margin."""
-        # Formula: actual_duration = estimated_duration / availability * 100 * (1 + contingency_margin/100)
-        duration = (self.estimated_duration / self.availability * 100) * (1 + self.contingency_margin / 100)
-        return round(duration)
+        # Scheduling bookkeeping: the earliest start the last schedule used
+        # and the antecedents it was scheduled after
+        self._earliest_day: Optional[int] = None
+        self._scheduled_after: Tuple['Task', ...] = ()
+
+    def __setattr__(self, name, value):
+        if name in Task.SCHEDULE_INPUTS:
+            if name == 'dependency':
+                value = normalize_dependency(value)
+            project = self._project
+            if project is not None and getattr(self, name) != value:
+                object.__setattr__(self, name, value)
+                project.mark_task_dirty(self, name in Task.GRAPH_INPUTS, renamed=name == 'name')
+                return
+        object.__setattr__(self, name, value)
+
+
+class TaskTable:
+    """
+    Columnar storage for the tasks of a very large project.
+
+    Inputs and computed dates live in typed arrays with one entry per row,
+    so a project costs a handful of arrays instead of one object per task,
+    and the scheduler and exporter read the columns directly. Indexing or
+    iterating the table yields TaskView objects that behave like Task, so
+    code written against Task keeps working. Durations and percentages are
+    whole numbers (see whole_number(): 2.0 is stored as 2, 2.5 raises
+    ValueError) and a missing date is stored as 0.
+
+    Use Project.use_task_table() to switch a project over.
+    """
+
+    INT_COLUMNS = ('estimated_duration', 'availability', 'contingency_margin', 'custom_start_day',
+                   'actual_duration', 'start_day', 'end_day', 'earliest_day')
+    # dependency keeps the names given, which may not exist yet; the rows
+    # they resolve to are in the project's cached dependency graph.
+    # scheduled_after holds a tuple of antecedent rows per row
+    OBJECT_COLUMNS = ('names', 'assigned_to', 'dependency', 'working_days', 'holiday_days', 'scheduled_after')
+
+    def __init__(self, tasks: Iterable[TaskFields] = ()):
+        for column in self.INT_COLUMNS:
+            setattr(self, column, array('l'))
+        for column in self.OBJECT_COLUMNS:
+            setattr(self, column, [])
+        # View of each row, created on first access
+        self._views: List[Optional['TaskView']] = []
+        self._project: Optional['Project'] = None
+        for task in tasks:
+            self._append_task(task)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, row: int) -> 'TaskView':
+        view = self._views[row]
+        if view is None:
+            view = self._views[row] = TaskView(self, row)
+        return view
+
+    def __iter__(self):
+        for row in range(len(self.names)):
+            yield self[row]
+
+    def _append_task(self, task: TaskFields) -> 'TaskView':
+        """Copy a task (inputs and last schedule) into a new row."""
+        self.names.append(task.name)
+        self.assigned_to.append(task.assigned_to)
+        self.dependency.append(task.dependency)
+        self.estimated_duration.append(whole_number(task.estimated_duration))
+        self.availability.append(whole_number(task.availability))
+        self.contingency_margin.append(whole_number(task.contingency_margin))
+        self.custom_start_day.append(task.custom_start_day or 0)
+        self.actual_duration.append(task.actual_duration)
+        self.start_day.append(task.start_day or 0)
+        self.end_day.append(task.end_day or 0)
+        self.earliest_day.append(task._earliest_day or 0)
+        self.scheduled_after.append(())
+        self.working_days.append(task.working_days)
+        self.holiday_days.append(task.holiday_days)
+        self._views.append(None)
+        return self[len(self.names) - 1]
+
+    def extend_inputs(self, names: List[str], estimated_duration: Iterable[int], assigned_to: List[str],
+                      dependency: Iterable, availability: Iterable[int], contingency_margin: Iterable[int],
+                      custom_start_day: Iterable[int]):
+        """
+        Add unscheduled rows straight from columns of task inputs (0 for no
+        custom start), without building a Task per row.
+        """
+        first = len(self.names)
+        count = len(names)
+        self.names.extend(names)
+        self.assigned_to.extend(assigned_to)
+        self.dependency.extend(map(normalize_dependency, dependency))
+        self.estimated_duration.extend(map(whole_number, estimated_duration))
+        self.availability.extend(map(whole_number, availability))
+        self.contingency_margin.extend(map(whole_number, contingency_margin))
+        self.custom_start_day.extend(custom_start_day)
+        for column in ('actual_duration', 'start_day', 'end_day', 'earliest_day'):
+            getattr(self, column).extend([0] * count)
+        empty = DaySpans()
+        self.working_days.extend([empty] * count)
+        self.holiday_days.extend([empty] * count)
+        self.scheduled_after.extend([()] * count)
+        self._views.extend([None] * count)
+        if self._project is not None:
+            for row in range(first, first + count):
+                self._project.mark_task_dirty(self[row], True)
+
+    def append(self, task: TaskFields) -> 'TaskView':
+        """Add a task as a new row and return its view."""
+        view = self._append_task(task)
+        if self._project is not None:
+            self._project.mark_task_dirty(view, True)
+        return view
+
+    def remove(self, row: int) -> 'TaskView':
+        """
+        Delete a row; the rows after it move up one position. Returns the
+        view of the deleted row, detached from the table.
+        """
+        return self.remove_rows([row])[0]
+
+    def remove_rows(self, rows: Iterable[int]) -> List['TaskView']:
+        """
+        Delete several rows in one pass over the columns; the rows left keep
+        their order. Returns the views of the deleted rows, detached.
+        """
+        rows = sorted(set(rows))
+        if not rows:
+            return []
+        removed = [self[row] for row in rows]
+        if len(rows) == 1:
+            for column in self.INT_COLUMNS + self.OBJECT_COLUMNS:
+                del getattr(self, column)[rows[0]]
+            del self._views[rows[0]]
+        else:
+            keep = [True] * len(self.names)
+            for row in rows:
+                keep[row] = False
+            for column in self.INT_COLUMNS:
+                setattr(self, column, array('l', compress(getattr(self, column), keep)))
+            for column in self.OBJECT_COLUMNS:
+                setattr(self, column, list(compress(getattr(self, column), keep)))
+            self._views = list(compress(self._views, keep))
+        for row, view in enumerate(self._views[rows[0]:], rows[0]):
+            if view is not None:
+                view._row = row
+        # Antecedent rows are stored by position; deleted ones become -1
+        dropped = set(rows)
+        self.scheduled_after = [tuple(-1 if antecedent in dropped else antecedent - bisect_left(rows, antecedent)
+                                      for antecedent in antecedents) if antecedents else ()
+                                for antecedents in self.scheduled_after]
+        for view in removed:
+            view._table = None
+        return removed
+
+    def assign(self, tasks: List[TaskFields]) -> List['TaskView']:
+        """
+        Replace the rows with the given tasks, in order.
+
+        Views of this table keep their row data (and their identity); any
+        other task is copied into a new row. Views of dropped rows are
+        detached. Returns the view of each given task.
+        """
+        old_columns = {column: getattr(self, column) for column in self.INT_COLUMNS + self.OBJECT_COLUMNS}
+        old_views = self._views
+        old_rows = [task._row if isinstance(task, TaskView) and task._table is self else None for task in tasks]
+        project = self._project
+        self.__init__()
+        self._project = project
+
+        kept = set()
+        result = []
+        for task, old_row in zip(tasks, old_rows):
+            if old_row is None:
+                result.append(self._append_task(task))
+                continue
+            for column, values in old_columns.items():
+                getattr(self, column).append(values[old_row])
+            if old_row in kept:
+                # Listed twice: the second copy gets a view of its own
+                self._views.append(None)
+                result.append(self[len(self._views) - 1])
+            else:
+                kept.add(old_row)
+                task._row = len(self._views)
+                self._views.append(task)
+                result.append(task)
+
+        # Antecedent rows are stored by position, which just changed; a
+        # dropped antecedent becomes -1 so the row is rescheduled
+        new_row = {old: view._row for old, view in enumerate(old_views) if old in kept}
+        self.scheduled_after = [tuple(new_row.get(row, -1) for row in rows) if rows else ()
+                                for rows in self.scheduled_after]
+        for old, view in enumerate(old_views):
+            if view is not None and old not in kept:
+                view._table = None
+        return result
+
+
+def _column_property(column: str, optional: bool = False, input_field: Optional[str] = None, convert=None):
+    """
+    A TaskView attribute backed by one TaskTable column. Optional columns
+    store 0 for None; input columns notify the project like Task does, and
+    convert (if given) normalizes assigned values.
+    """
+    def fget(view):
+        value = getattr(view._table, column)[view._row]
+        return (value or None) if optional else value
+
+    def fset(view, value):
+        if convert is not None:
+            value = convert(value)
+        values = getattr(view._table, column)
+        stored = (value or 0) if optional else value
+        if input_field is None:
+            values[view._row] = stored
+            return
+        changed = values[view._row] != stored
+        values[view._row] = stored
+        project = view._table._project
+        if changed and project is not None:
+            project.mark_task_dirty(view, input_field in TaskFields.GRAPH_INPUTS, renamed=input_field == 'name')
+
+    return property(fget, fset)
+
+
+class TaskView(TaskFields):
+    """A row of a TaskTable, with the same attributes as Task."""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: TaskTable, row: int):
+        self._table = table
+        self._row = row
+
+    name = _column_property('names', input_field='name')
+    # The columns of these are integer arrays (see TaskTable)
+    estimated_duration = _column_property('estimated_duration', input_field='estimated_duration',
+                                          convert=whole_number)
+    assigned_to = _column_property('assigned_to', input_field='assigned_to')
+    dependency = _column_property('dependency', input_field='dependency', convert=normalize_dependency)
+    availability = _column_property('availability', input_field='availability', convert=whole_number)
+    contingency_margin = _column_property('contingency_margin', input_field='contingency_margin',
+                                          convert=whole_number)
+    custom_start_day = _column_property('custom_start_day', optional=True, input_field='custom_start_day')
+
+    actual_duration = _column_property('actual_duration')
+    start_day = _column_property('start_day', optional=True)
+    end_day = _column_property('end_day', optional=True)
+    working_days = _column_property('working_days')
+    holiday_days = _column_property('holiday_days')
+    _earliest_day = _column_property('earliest_day', optional=True)
+
+    @property
+    def _scheduled_after(self) -> Tuple['TaskView', ...]:
+        table = self._table
+        return tuple(table[row] for row in table.scheduled_after[self._row] if row >= 0)
+
+    @_scheduled_after.setter
+    def _scheduled_after(self, tasks: Iterable['TaskView']):
+        self._table.scheduled_after[self._row] = tuple(task._row for task in tasks)
+
+    @property
+    def _project(self) -> Optional['Project']:
+        return self._table._project if self._table is not None else None
+
+    def __repr__(self) -> str:
+        return f"TaskView({self.name!r})"
+
+
+class _TaskNameIndex:
+    """
+    Position of the first task of each name, kept up to date through adds
+    and removals without a rebuild.
+
+    Positions are stored as they were when the index was built (or the
+    task added); removed positions are kept sorted, and a task's current
+    position is its stored one less the removed positions before it.
+    """
+
+    __slots__ = ('count', '_positions', '_removed', '_shared')
+
+    def __init__(self, names: List[str]):
+        self.count = len(names)  # number of tasks
+        self._positions: Dict[str, int] = {}
+        self._removed: List[int] = []
+        # Names of several tasks: removing the first needs a rebuild
+        self._shared: Set[str] = set()
+        for position, name in enumerate(names):
+            if self._positions.setdefault(name, position) != position:
+                self._shared.add(name)
+
+    def get(self, name: str) -> Optional[int]:
+        position = self._positions.get(name)
+        if position is None:
+            return None
+        return position - bisect_right(self._removed, position)
+
+    def add(self, name: str):
+        """Index a task appended at the end."""
+        if name in self._positions:
+            self._shared.add(name)
+        else:
+            self._positions[name] = self.count + len(self._removed)
+        self.count += 1
+
+    def remove(self, name: str) -> bool:
+        """Forget the first task of a name; False if the index must be rebuilt instead."""
+        if name in self._shared or name not in self._positions:
+            return False
+        insort(self._removed, self._positions.pop(name))
+        self.count -= 1
+        return True
 
 
 class Project:
-    """Represents the entire project with tasks, employees, and scheduling."""
+    """
+    Represents the entire project with tasks, employees, and scheduling.
+
+    The project tracks which tasks are affected by edits made through its
+    methods (and through assignments to task inputs, holidays and work
+    patterns), so calculate_schedule() only recomputes the dirty tasks and
+    the dependents whose dates actually move. Large recomputes are split
+    into independent groups run in a process pool (parallel_scheduler) and
+    go through the NumPy engine (batch_scheduler) when NumPy is installed.
+    With resource_levelling on, any change reschedules the whole project so
+    that no employee is booked past full capacity. A task may depend on
+    several others; schedule_floats() gives the critical path.
+    """
 
-    def __init__(self, name: str, start_date: datetime):
+    # Smallest number of tasks to reschedule for the NumPy engine to pay off
+    BATCH_MIN_TASKS = 1000
+    # Smallest number of tasks to reschedule for a process pool to pay off
+    PARALLEL_MIN_TASKS = 20000
+
+    def __init__(self, name: str, start_date: DateLike):
         self.name = name
-        self.start_date = start_date
         self.tasks: List[Task] = []
         self.employees: Dict[str, Employee] = {}
-        self.global_holidays: Set[str] = set()
+        # Shared working-time profiles, referenced by Employee.calendar
+        self.calendars: Dict[str, WorkCalendar] = {}
+        # Global holidays, stored as merged ranges of day ordinals
+        self.global_holidays = DateRangeSet()
+        # Recurring public holidays, expanded only over the years scheduled
+        self.holiday_rules = RecurringHolidays()
+        # Working-day calendar index per (calendar name, work mask), shared by
+        # every employee on that calendar and pattern
+        self._calendar_indexes: Dict[tuple, CalendarIndex] = {}
+        # Index used by each employee: the shared one, or an overlay of it
+        # when the employee has personal holidays
+        self._employee_indexes: Dict[str, object] = {}
+
+        # Change tracking for incremental rescheduling
+        self._dirty_tasks: Set[Task] = set()
+        self._graph = None  # cached (tasks snapshot, predecessors, successors, positions)
+        # Position of each task by name, built on first lookup (see
+        # task_position())
+        self._task_positions: Optional[_TaskNameIndex] = None
+        self._floats = None  # cached (graph, schedule_floats() result)
+        # Last schedule published for readers (see schedule_snapshot.publish)
+        self.schedule_snapshot = None
+        # Recompute large batches level by level with NumPy when it is installed
+        self.batch_engine = True
+        # Process pool size for scheduling independent task groups
+        # (None = one per CPU, 1 = never use a pool)
+        self.schedule_workers: Optional[int] = None
+        # Delay tasks until their employee has capacity (see resource_levelling)
+        self._resource_levelling = False
+        self.start_day: int = to_ordinal(start_date)
+
+    @property
+    def resource_levelling(self) -> bool:
+        """Whether tasks wait for their employee's capacity instead of overlapping."""
+        return self._resource_levelling
+
+    @resource_levelling.setter
+    def resource_levelling(self, enabled: bool):
+        if bool(enabled) != self._resource_levelling:
+            self._resource_levelling = bool(enabled)
+            self.mark_all_dirty()
+
+    @property
+    def start_date(self) -> datetime:
+        return from_ordinal(self.start_day)
+
+    @start_date.setter
+    def start_date(self, value: DateLike):
+        start_day = to_ordinal(value)
+        if start_day == self.start_day:
+            return
+        self.start_day = start_day
+        # Tasks without a dependency or custom start begin on the project start
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            self._dirty_tasks.update(
+                table[row] for row in range(len(table))
+                if not table.custom_start_day[row] and not table.dependency[row]
+            )
+        else:
+            self._dirty_tasks.update(
+                task for task in self.tasks if task.custom_start_day is None and not task.dependency
+            )
+
+    def add_calendar(self, calendar: WorkCalendar):
+        """Add (or replace) a shared working-time calendar."""
+        previous = self.calendars.get(calendar.name)
+        if previous is not None:
+            previous._project = None
+        calendar._project = self
+        self.calendars[calendar.name] = calendar
+        self.mark_calendar_dirty(calendar)
+
+    def remove_calendar(self, name: str):
+        """Remove a calendar; employees still referencing it can no longer be scheduled."""
+        calendar = self.calendars.pop(name, None)
+        if calendar is not None:
+            calendar._project = None
+            self.mark_calendar_dirty(calendar)
+
+    def set_calendars(self, calendars: List[WorkCalendar]):
+        """
+        Replace the project's calendars.
+
+        Calendars that already exist are updated in place, so only the tasks
+        of employees on a calendar that changed are rescheduled.
+        """
+        new_names = {calendar.name for calendar in calendars}
+        for name in [name for name in self.calendars if name not in new_names]:
+            self.remove_calendar(name)
+
+        for calendar in calendars:
+            existing = self.calendars.get(calendar.name)
+            if existing is None:
+                self.add_calendar(calendar)
+            else:
+                existing.set_work_pattern(calendar.work_pattern)
+                existing.set_holidays(calendar.holidays)
+                existing.set_holiday_rules(calendar.holiday_rules)
 
     def add_employee(self, employee: Employee):
         """Add an employee to the project."""
+        previous = self.employees.get(employee.name)
+        if previous is not None:
+            previous._project = None
+        employee._project = self
         self.employees[employee.name] = employee
+        self.mark_employee_dirty(employee)
+
+    def remove_employee(self, name: str):
+        """Remove an employee from the project."""
+        employee = self.employees.pop(name, None)
+        if employee is not None:
+            employee._project = None
+            self.mark_employee_dirty(employee)
+
+    def set_employees(self, employees: List[Employee]):
+        """
+        Replace the project's employees.
+
+        Employees that already exist are updated in place, so only the tasks
+        of employees whose work pattern or holidays changed are rescheduled.
+        """
+        new_names = {employee.name for employee in employees}
+        for name in [name for name in self.employees if name not in new_names]:
+            self.remove_employee(name)
+
+        for employee in employees:
+            self.put_employee(employee)
+
+    def put_employee(self, employee: Employee) -> Employee:
+        """
+        Add an employee, or update the existing employee of that name in
+        place, so its tasks are only rescheduled if its calendar, work pattern
+        or holidays changed. Returns the stored employee.
+        """
+        existing = self.employees.get(employee.name)
+        if existing is None:
+            self.add_employee(employee)
+            return employee
+        existing.set_calendar(employee.calendar)
+        existing.set_work_pattern(None if employee.work_mask_override is None else employee.work_pattern)
+        existing.set_holidays(employee.holidays)
+        existing.set_holiday_rules(employee.holiday_rules)
+        return existing
 
     def add_task(self, task: Task):
-        """Add a task to the project."""
-        self.tasks.append(task)
+        """Add a task to the project. Returns the stored task (a TaskView with a TaskTable)."""
+        if isinstance(self.tasks, TaskTable):
+            task = self.tasks.append(task)
+        else:
+            task._project = self
+            self.tasks.append(task)
+            self.mark_task_dirty(task, True)
+        if self._task_positions is not None:
+            self._task_positions.add(task.name)
+        return task
+
+    def task_position(self, name: str) -> Optional[int]:
+        """
+        Position in self.tasks of the task with this name (the first one, if
+        several share it), or None.
+
+        Looks the name up in an index built on first use and kept up to date
+        by the project's methods and by renames, rather than scanning tasks.
+        """
+        tasks = self.tasks
+        names = tasks.names if isinstance(tasks, TaskTable) else None
+        index = self._task_positions
+        # A different count means tasks were added to or removed from the list directly
+        if index is not None and index.count == len(tasks):
+            position = index.get(name)
+            if position is None:
+                return None
+            if (names[position] if names is not None else tasks[position].name) == name:
+                return position
+        index = self._task_positions = _TaskNameIndex(
+            names if names is not None else [task.name for task in tasks])
+        return index.get(name)
+
+    def get_task(self, name: str) -> Optional[TaskFields]:
+        """The task with this name, or None (see task_position())."""
+        position = self.task_position(name)
+        return self.tasks[position] if position is not None else None
+
+    def put_task(self, task: Task) -> TaskFields:
+        """
+        Add a task, or update the inputs of the existing task of that name in
+        place (as set_tasks() does), so an unchanged task keeps its schedule.
+        Returns the stored task.
+        """
+        existing = self.get_task(task.name)
+        if existing is None:
+            return self.add_task(task)
+        for field in Task.SCHEDULE_INPUTS:
+            setattr(existing, field, getattr(task, field))
+        return existing
+
+    def remove_task(self, name: str):
+        """Remove a task; tasks that depend on it can't be scheduled until they are changed."""
+        self.remove_tasks([name])
+
+    def remove_tasks(self, names: Iterable[str]):
+        """
+        Remove the tasks with these names (unknown names are ignored) in one
+        pass over the task list, keeping the order of the others.
+        """
+        found = {}
+        for name in names:
+            position = self.task_position(name)
+            if position is not None:
+                found[position] = name
+        if not found:
+            return
+        if isinstance(self.tasks, TaskTable):
+            removed = self.tasks.remove_rows(found)
+        elif len(found) == 1:
+            removed = [self.tasks.pop(next(iter(found)))]
+        else:
+            removed = [self.tasks[position] for position in sorted(found)]
+            self.tasks[:] = [task for position, task in enumerate(self.tasks) if position not in found]
+        for task in removed:
+            self._dirty_tasks.discard(task)
+            if not isinstance(task, TaskView):
+                task._project = None
+        index = self._task_positions
+        if index is not None and not all(index.remove(name) for name in found.values()):
+            self._task_positions = None
+        # The dependency graph is stored by position; it is rebuilt once, by
+        # the next calculation
+        self._graph = None
+
+    def set_tasks(self, tasks: List[Task]):
+        """
+        Replace the project's tasks, keeping the given order.
+
+        A task whose name matches an existing task updates that task in place,
+        so its computed schedule survives when none of its inputs changed.
+        """
+        table = isinstance(self.tasks, TaskTable)
+        existing_by_name = {task.name: task for task in self.tasks}
+        new_tasks = []
+        added = []
+        for task in tasks:
+            existing = existing_by_name.pop(task.name, None)
+            if existing is None:
+                added.append(len(new_tasks))
+                new_tasks.append(task)
+                continue
+            for field in Task.SCHEDULE_INPUTS:
+                setattr(existing, field, getattr(task, field))
+            new_tasks.append(existing)
+
+        for removed in existing_by_name.values():
+            self._dirty_tasks.discard(removed)
+            if not table:
+                removed._project = None
+
+        if table:
+            # New tasks are copied into rows; keep their views instead
+            new_tasks = self.tasks.assign(new_tasks)
+        else:
+            for idx in added:
+                new_tasks[idx]._project = self
+            self.tasks[:] = new_tasks
+        self._dirty_tasks.update(new_tasks[idx] for idx in added)
+        self._task_positions = None
+        self._graph = None
+
+    def use_task_table(self):
+        """
+        Switch to columnar task storage (a TaskTable) for very large projects.
+
+        Tasks keep their inputs and last schedule. From now on self.tasks
+        yields TaskView objects; the Task objects added before are detached.
+        """
+        if isinstance(self.tasks, TaskTable):
+            return
+        tasks = self.tasks
+        table = TaskTable(tasks)
+        rows = {task: row for row, task in enumerate(tasks)}
+        for row, task in enumerate(tasks):
+            if task._scheduled_after:
+                table.scheduled_after[row] = tuple(rows.get(antecedent, -1) for antecedent in task._scheduled_after)
+            task._project = None
+        table._project = self
+        self._dirty_tasks = {table[rows[task]] for task in self._dirty_tasks if task in rows}
+        self.tasks = table
+        self._graph = None
+
+    def _tasks_assigned_to(self, names) -> list:
+        """The tasks assigned to any of the given employee names."""
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            return [table[row] for row, assigned_to in enumerate(table.assigned_to) if assigned_to in names]
+        return [task for task in self.tasks if task.assigned_to in names]
+
+    def add_global_holiday(self, day: DateLike):
+        """Add a global holiday ('YYYY-MM-DD', date or ordinal)."""
+        self.add_global_holiday_range(day, day)
+
+    def add_global_holiday_range(self, start: DateLike, end: DateLike):
+        """Add every day from start to end (inclusive) as a global holiday."""
+        start, end = to_ordinal(start), to_ordinal(end)
+        if self.global_holidays.ranges_between(start, end) == [(start, end)]:
+            return  # already a holiday throughout
+        self.global_holidays.add_range(start, end)
+        self._global_holidays_changed(DateRangeSet.from_ranges([(start, end)]))
+
+    def set_global_holidays(self, holidays):
+        """Replace the global holidays (a DateRangeSet, or dates/ordinals)."""
+        if not isinstance(holidays, DateRangeSet):
+            holidays = DateRangeSet(holidays)
+        changed = holidays.symmetric_difference(self.global_holidays)
+        if not changed:
+            return
+        self.global_holidays = holidays
+        self._global_holidays_changed(changed)
+
+    def add_global_holiday_rule(self, rule):
+        """Add a recurring global holiday (a HolidayRule or its text, e.g. 'Easter+1')."""
+        if not isinstance(rule, HolidayRule):
+            rule = parse_holiday_rule(rule)
+        self.set_global_holiday_rules(self.holiday_rules.rules + [rule])
+
+    def set_global_holiday_rules(self, rules):
+        """Replace the recurring global holidays."""
+        if not isinstance(rules, RecurringHolidays):
+            rules = RecurringHolidays(rule if isinstance(rule, HolidayRule) else parse_holiday_rule(rule)
+                                      for rule in rules)
+        changed = rules.symmetric_difference(self.holiday_rules)
+        if not changed:
+            return
+        self.holiday_rules = rules
+        self._global_holidays_changed(changed)
+
+    def mark_task_dirty(self, task: Task, graph_changed: bool = False, renamed: bool = False):
+        """
+        Flag a task for rescheduling; graph_changed drops the cached
+        dependency graph and renamed the index of task names.
+        """
+        self._dirty_tasks.add(task)
+        if graph_changed:
+            self._graph = None
+        if renamed:
+            self._task_positions = None
+
+    def mark_employee_dirty(self, employee: Employee, changed_days=None):
+        """
+        Flag the tasks of an employee for rescheduling.
+
+        With changed_days (the holidays or holiday rules added or removed)
+        only the tasks whose scheduled window covers one of those days are
+        flagged.
+        """
+        self._employee_indexes.pop(employee.name, None)
+        self._mark_tasks_touching(self._tasks_assigned_to({employee.name}), changed_days)
+
+    def mark_calendar_dirty(self, calendar: WorkCalendar, changed_days=None):
+        """Flag the tasks of every employee on a calendar for rescheduling."""
+        for key in [key for key in self._calendar_indexes if key[0] == calendar.name]:
+            del self._calendar_indexes[key]
+        names = {employee.name for employee in self.employees.values() if employee.calendar == calendar.name}
+        for name in names:
+            self._employee_indexes.pop(name, None)
+        self._mark_tasks_touching(self._tasks_assigned_to(names), changed_days)
+
+    def mark_all_dirty(self):
+        """Force the next calculate_schedule() to recompute every task."""
+        self._calendar_indexes.clear()
+        self._employee_indexes.clear()
+        self._dirty_tasks.update(self.tasks)
+        self._graph = None
 
-    def add_global_holiday(self, date_str: str):
-        """Add a global holiday (format: 'YYYY-MM-DD')."""
-        self.global_holidays.add(date_str)
+    def _global_holidays_changed(self, changed_days):
+        self._calendar_indexes.clear()
+        self._employee_indexes.clear()
+        self._mark_tasks_touching(self.tasks, changed_days)
 
-    def get_next_working_day(self, employee: Employee, from_date: datetime) -> datetime:
+    def _mark_tasks_touching(self, tasks, changed_days=None):
+        """Flag the tasks whose window [earliest start, end] contains a changed day."""
+        if changed_days is None:
+            self._dirty_tasks.update(tasks)
+            return
+
+        for task in tasks:
+            if (task._earliest_day is None or task.end_day is None
+                    or changed_days.overlaps(task._earliest_day, task.end_day)):
+                self._dirty_tasks.add(task)
+
+    def _get_calendar_index(self, employee: Employee):
+        """
+        Get (building on first use) the working-day calendar index for an employee.
+
+        The index for the employee's calendar and work pattern is shared;
+        personal holidays are layered on top with a CalendarOverlay.
+        """
+        index = self._employee_indexes.get(employee.name)
+        if index is not None:
+            return index
+
+        calendar = None
+        if employee.calendar is not None:
+            calendar = self.calendars.get(employee.calendar)
+            if calendar is None:
+                raise ValueError(f"Calendar '{employee.calendar}' not found for employee '{employee.name}'")
+
+        key = (employee.calendar, employee.work_mask)
+        index = self._calendar_indexes.get(key)
+        if index is None:
+            holiday_sources = (self.global_holidays, self.holiday_rules)
+            if calendar is not None:
+                holiday_sources += (calendar.holidays, calendar.holiday_rules)
+            index = CalendarIndex(employee.work_mask, holiday_sources, self.start_day, owner=employee.name)
+            self._calendar_indexes[key] = index
+
+        if employee.holidays or employee.holiday_rules:
+            index = CalendarOverlay(index, (employee.holidays, employee.holiday_rules))
+        self._employee_indexes[employee.name] = index
+        return index
+
+    def get_next_working_day(self, employee: Employee, from_date: DateLike) -> datetime:
         """Get the next working day for an employee starting from a given date."""
-        current = from_date
-        while not employee.is_working_day(current, self.global_holidays):
-            current += timedelta(days=1)
-        return current
+        first_day, _ = self._get_calendar_index(employee).add_working_days(to_ordinal(from_date), 1)
+        return from_ordinal(first_day)
 
-    def calculate_task_schedule(self, task: Task, earliest_start: datetime):
-        """Calculate the schedule for a single task."""
-        # Get the employee
-        employee = self.employees.get(task.assigned_to)
+    def _schedule_window(self, assigned_to: str, duration: int, earliest_day: int) -> tuple:
+        """
+        Place `duration` working days of an employee from earliest_day.
+
+        Returns (start_day, end_day, working_days, holiday_days); the days are
+        None and the spans empty when the duration is zero.
+        """
+        employee = self.employees.get(assigned_to)
         if not employee:
-            raise ValueError(f"Employee '{task.assigned_to}' not found")
+            raise ValueError(f"Employee '{assigned_to}' not found")
+
+        index = self._get_calendar_index(employee)
+
+        # Binary search for the first and last working day of the task
+        span = index.add_working_days(earliest_day, duration)
+        if span is None:
+            return None, None, DaySpans(), DaySpans()
+
+        first_day, last_day = span
+        # Holidays are collected from earliest_start, so those that pushed
+        # the start back are shown as well
+        return (first_day, last_day, index.working_spans_between(first_day, last_day),
+                DaySpans.from_days(index.holidays_between(earliest_day, last_day)))
+
+    def calculate_task_schedule(self, task: Task, earliest_start: DateLike):
+        """Calculate the schedule for a single task."""
+        earliest_day = to_ordinal(earliest_start)
+        duration = task.calculate_actual_duration()
+        start_day, end_day, working_days, holiday_days = self._schedule_window(
+            task.assigned_to, duration, earliest_day)
+
+        task.actual_duration = duration
+        task._earliest_day = earliest_day
+        task.start_day = start_day
+        task.end_day = end_day
+        task.working_days = working_days
+        task.holiday_days = holiday_days
+
+    def _reschedule_task(self, idx: int, preds: Tuple[int, ...]) -> bool:
+        """Reschedule self.tasks[idx] after its antecedents; returns whether its end moved."""
+        tasks = self.tasks
+        task = tasks[idx]
+        if task.custom_start_day is not None:
+            # Use custom start date, ignore dependency
+            earliest_day = task.custom_start_day
+        elif preds:
+            # Start the next available working day after the last dependency ends
+            earliest_day = max(tasks[pred_idx].end_day for pred_idx in preds) + 1
+        else:
+            # No dependency, start from project start date
+            earliest_day = self.start_day
+
+        previous_end = task.end_day
+        self.calculate_task_schedule(task, earliest_day)
+        task._scheduled_after = tuple(map(tasks.__getitem__, preds))
+        return task.end_day != previous_end
 
-        # Calculate actual duration
-        task.actual_duration = task.calculate_actual_duration()
+    def _reschedule_row(self, row: int, preds: Tuple[int, ...]) -> bool:
+        """_reschedule_task() for a TaskTable, reading and writing its columns."""
+        table = self.tasks
+        if table.custom_start_day[row]:
+            earliest_day = table.custom_start_day[row]
+        elif preds:
+            end_days = table.end_day
+            earliest_day = max(end_days[pred_row] or None for pred_row in preds) + 1
+        else:
+            earliest_day = self.start_day
+
+        duration = actual_duration(table.estimated_duration[row], table.availability[row],
+                                   table.contingency_margin[row])
+        start_day, end_day, working_days, holiday_days = self._schedule_window(
+            table.assigned_to[row], duration, earliest_day)
+
+        previous_end = table.end_day[row]
+        table.actual_duration[row] = duration
+        table.earliest_day[row] = earliest_day
+        table.start_day[row] = start_day or 0
+        table.end_day[row] = end_day or 0
+        table.working_days[row] = working_days
+        table.holiday_days[row] = holiday_days
+        table.scheduled_after[row] = preds
+        return table.end_day[row] != previous_end
+
+    def _build_dependency_graph(self):
+        """
+        Build the predecessor/successor index used by the scheduler.
+
+        Returns the tuple of predecessor indices of each task by position in
+        self.tasks (empty when it has no dependency or a custom start date),
+        and the indices of the tasks that depend on it.
+        """
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            names, dependencies, custom_starts = table.names, table.dependency, table.custom_start_day
+        else:
+            names = [task.name for task in self.tasks]
+            dependencies = [task.dependency for task in self.tasks]
+            custom_starts = [task.custom_start_day for task in self.tasks]
+
+        index_by_name = {}
+        for idx, name in enumerate(names):
+            if name in index_by_name:
+                raise ValueError(f"Duplicate task name '{name}'")
+            index_by_name[name] = idx
+
+        predecessors: List[Tuple[int, ...]] = [()] * len(names)
+        successors: List[List[int]] = [[] for _ in names]
+        for idx, dependency in enumerate(dependencies):
+            # A custom start date overrides the dependency, so it adds no edge
+            if custom_starts[idx] or not dependency:
+                continue
+            preds = []
+            for antecedent in ((dependency,) if isinstance(dependency, str) else dependency):
+                pred_idx = index_by_name.get(antecedent)
+                if pred_idx is None:
+                    raise ValueError(f"Dependency '{antecedent}' not found for task '{names[idx]}'")
+                preds.append(pred_idx)
+                successors[pred_idx].append(idx)
+            predecessors[idx] = tuple(preds)
+
+        return predecessors, successors
 
-        # Start iterating from earliest_start to capture all holidays
-        current_date = earliest_start
+    def _find_cycle(self, predecessors, unscheduled: Set[int]) -> List[str]:
+        """Return the names of tasks forming a dependency cycle among unscheduled tasks."""
+        # Every unscheduled task still waits on an unscheduled predecessor,
+        # so walking those predecessors from any of them must eventually loop back.
+        current = next(iter(unscheduled))
+        seen_at = {}
+        path = []
+        while current not in seen_at:
+            seen_at[current] = len(path)
+            path.append(current)
+            current = next(pred_idx for pred_idx in predecessors[current] if pred_idx in unscheduled)
 
-        # Count working days until we reach actual_duration
-        working_days_count = 0
-        task.working_dates = []
-        task.holiday_dates = []
-        task.start_date = None
-        task.end_date = None
+        cycle = path[seen_at[current]:]
+        cycle.reverse()  # report in dependency order (antecedent first)
+        return [self.tasks[idx].name for idx in cycle + [cycle[0]]]
 
-        while working_days_count < task.actual_duration:
-            date_str = current_date.strftime('%Y-%m-%d')
-            # Check if it's a holiday (global or personal for this employee)
-            is_holiday = date_str in self.global_holidays or date_str in employee.holidays
+    def _dependency_graph(self):
+        """
+        Return the dependency graph, rebuilding it if the task list changed.
 
-            if employee.is_working_day(current_date, self.global_holidays):
-                # Set start_date on the first working day
-                if task.start_date is None:
-                    task.start_date = current_date
+        Returns (predecessors, successors, positions) where positions maps each
+        task to its index in self.tasks (None for a TaskTable, whose views
+        know their row).
+        """
+        if isinstance(self.tasks, TaskTable):
+            return self._table_dependency_graph()
 
-                task.working_dates.append(current_date)
-                working_days_count += 1
-                task.end_date = current_date
-            elif is_holiday and current_date.weekday() in employee.work_pattern:
-                # It's a holiday on what would be a working day for this employee
-                task.holiday_dates.append(current_date)
+        graph = self._graph
+        if graph is not None:
+            snapshot, predecessors, successors, positions = graph
+            # Also catches tasks appended to or removed from the list directly
+            if len(snapshot) == len(self.tasks) and all(a is b for a, b in zip(snapshot, self.tasks)):
+                return predecessors, successors, positions
 
-            current_date += timedelta(days=1)
+        predecessors, successors = self._build_dependency_graph()
+        tasks = self.tasks
+        positions = {}
+        for idx, task in enumerate(tasks):
+            positions[task] = idx
+            task._project = self
+            # Never scheduled, or now depends on different tasks
+            if task._earliest_day is None or task._scheduled_after != tuple(map(tasks.__getitem__, predecessors[idx])):
+                self._dirty_tasks.add(task)
+
+        self._graph = (list(tasks), predecessors, successors, positions)
+        return predecessors, successors, positions
+
+    def _table_dependency_graph(self):
+        """_dependency_graph() for a TaskTable, checked against its columns."""
+        table = self.tasks
+        graph = self._graph
+        # Rows only change through the project, which drops the graph
+        if graph is not None and graph[0] is table:
+            return graph[1], graph[2], None
+
+        predecessors, successors = self._build_dependency_graph()
+        earliest_days, scheduled_after = table.earliest_day, table.scheduled_after
+        for row, preds in enumerate(predecessors):
+            # Never scheduled, or now depends on different tasks
+            if not earliest_days[row] or scheduled_after[row] != preds:
+                self._dirty_tasks.add(table[row])
+
+        self._graph = (table, predecessors, successors, None)
+        return predecessors, successors, None
 
     def calculate_schedule(self):
-        """Calculate the schedule for all tasks, respecting dependencies."""
-        # Build a map of task names to tasks
-        task_map = {task.name: task for task in self.tasks}
-
-        # Track completed tasks
-        scheduled_tasks = set()
-
-        # Keep scheduling tasks until all are done
-        while len(scheduled_tasks) < len(self.tasks):
-            made_progress = False
-
-            for task in self.tasks:
-                if task.name in scheduled_tasks:
-                    continue
-
-                # Check if task has a custom start date
-                if task.custom_start_date:
-                    # Use custom start date, ignore dependency
-                    earliest_start = task.custom_start_date
-                # Check if dependency is met
-                elif task.dependency:
-                    if task.dependency not in task_map:
-                        raise ValueError(f"Dependency '{task.dependency}' not found for task '{task.name}'")
-
-                    dep_task = task_map[task.dependency]
-                    if dep_task.name not in scheduled_tasks:
-                        continue  # Wait for dependency
-
-                    # Start the next available working day after dependency ends
-                    earliest_start = dep_task.end_date + timedelta(days=1)
-                else:
-                    # No dependency, start from project start date
-                    earliest_start = self.start_date
-
-                # Calculate this task's schedule
-                self.calculate_task_schedule(task, earliest_start)
-                scheduled_tasks.add(task.name)
-                made_progress = True
-
-            if not made_progress:
-                raise ValueError("Circular dependency detected or invalid dependency chain")
+        """
+        Calculate the schedule for all tasks, respecting dependencies.
+
+        Only the tasks flagged dirty since the last successful run are
+        recomputed, followed by those dependents whose start actually moves.
+        """
+        predecessors, successors, positions = self._dependency_graph()
+
+        if positions is None:
+            table = self.tasks
+            dirty = {task._row for task in self._dirty_tasks if isinstance(task, TaskView) and task._table is table}
+            reschedule = self._reschedule_row
+        else:
+            dirty = {positions[task] for task in self._dirty_tasks if task in positions}
+            reschedule = self._reschedule_task
+
+        # Everything downstream of a dirty task may have to move
+        affected = set(dirty)
+        stack = list(dirty)
+        while stack:
+            for succ_idx in successors[stack.pop()]:
+                if succ_idx not in affected:
+                    affected.add(succ_idx)
+                    stack.append(succ_idx)
+
+        if self._resource_levelling and affected:
+            # Tasks of one employee push each other around, so any change
+            # can move any task
+            affected = set(range(len(self.tasks)))
+
+        if affected:
+            self._floats = None
+        try:
+            if self._resource_levelling:
+                if affected:
+                    self._schedule_levelled(predecessors, successors)
+            elif not (self._schedule_parallel(affected, predecessors)
+                      or self._schedule_batch(affected, predecessors, successors)):
+                self._schedule_loop(affected, dirty, predecessors, successors, reschedule)
+        except Exception:
+            # Leave the whole affected subgraph dirty so the next run retries it
+            self._dirty_tasks.update(self.tasks[idx] for idx in affected)
+            raise
+
+        self._dirty_tasks.clear()
+
+    def _schedule_loop(self, affected: Set[int], dirty: Set[int], predecessors, successors, reschedule):
+        """Reschedule the affected tasks one at a time, stopping where dates stop moving."""
+        # Kahn's algorithm over the affected subgraph: each task is visited
+        # once, as soon as all of its antecedents are up to date.
+        waiting = {idx: len(affected.intersection(predecessors[idx])) for idx in affected}
+        ready = deque(sorted(idx for idx, count in waiting.items() if not count))
+        visited = 0
+        moved = set()
+
+        while ready:
+            idx = ready.popleft()
+            preds = predecessors[idx]
+
+            if (idx in dirty or not moved.isdisjoint(preds)) and reschedule(idx, preds):
+                moved.add(idx)
+
+            visited += 1
+            for succ_idx in successors[idx]:
+                waiting[succ_idx] -= 1
+                if not waiting[succ_idx]:
+                    ready.append(succ_idx)
+
+        if visited < len(affected):
+            cycle = self._find_cycle(predecessors, {idx for idx, count in waiting.items() if count})
+            raise ValueError(f"Circular dependency detected: {' -> '.join(cycle)}")
+
+    def _schedule_levelled(self, predecessors, successors):
+        """
+        Schedule every task without booking an employee past full capacity.
+
+        Each task takes its availability percentage of its employee on every
+        day it runs. Tasks are placed in dependency order, earliest possible
+        start first (then task order); one that does not fit what is left of
+        its employee's capacity moves to just after the first overbooked
+        stretch, until it fits.
+        """
+        _, estimated, assigned_to, _, availability, contingency, custom_starts = \
+            self._input_columns(range(len(self.tasks)))
+        timelines: Dict[str, BookingTimeline] = {}
+        results = []
+
+        # Antecedents still to place, and the latest end among those placed
+        waiting = [len(preds) for preds in predecessors]
+        after_day = [0] * len(predecessors)
+        ready = [(custom_start or self.start_day, idx)
+                 for idx, custom_start in enumerate(custom_starts) if not predecessors[idx]]
+        heapq.heapify(ready)
+        while ready:
+            earliest_day, idx = heapq.heappop(ready)
+            duration = actual_duration(estimated[idx], availability[idx], contingency[idx])
+            employee = self.employees.get(assigned_to[idx])
+            if not employee:
+                raise ValueError(f"Employee '{assigned_to[idx]}' not found")
+
+            start_from = earliest_day
+            span = self._get_calendar_index(employee).add_working_days(start_from, duration)
+            if span is not None:
+                timeline = timelines.setdefault(employee.name, BookingTimeline())
+                load = min(availability[idx], FULL_CAPACITY)
+                overload = timeline.first_overload(span[0], span[1], load)
+                while overload is not None:
+                    start_from = overload + 1
+                    span = self._get_calendar_index(employee).add_working_days(start_from, duration)
+                    overload = timeline.first_overload(span[0], span[1], load)
+                timeline.book(span[0], span[1], load)
+
+            start_day, end_day, working_days, holiday_days = self._schedule_window(
+                employee.name, duration, start_from)
+            results.append((idx, duration, earliest_day, start_day or 0, end_day or 0, working_days, holiday_days))
+            for succ_idx in successors[idx]:
+                after_day[succ_idx] = max(after_day[succ_idx], end_day + 1)
+                waiting[succ_idx] -= 1
+                if not waiting[succ_idx]:
+                    heapq.heappush(ready, (after_day[succ_idx], succ_idx))
+
+        if len(results) < len(self.tasks):
+            done = {row[0] for row in results}
+            cycle = self._find_cycle(predecessors, set(range(len(self.tasks))) - done)
+            raise ValueError(f"Circular dependency detected: {' -> '.join(cycle)}")
+        self._store_schedules(results, predecessors)
+
+    def _schedule_parallel(self, affected: Set[int], predecessors) -> bool:
+        """
+        Recompute independent groups of the affected tasks in a process pool.
+
+        Tasks linked by a dependency or sharing an employee stay in the same
+        group; groups are packed into one chunk per worker and each chunk is
+        scheduled by a throwaway Project in the worker. Returns False without
+        touching anything when the project is too small, there is a single
+        group, or a worker fails (the task loop then reports the error).
+        """
+        workers = self.schedule_workers or os.cpu_count() or 1
+        if workers < 2 or len(affected) < self.PARALLEL_MIN_TASKS:
+            return False
+
+        indices = sorted(affected)
+        columns = self._input_columns(indices)
+        components = parallel_scheduler.independent_components(indices, predecessors, columns[2])
+        if len(components) < 2:
+            return False
+
+        inputs = dict(zip(indices, zip(*columns)))
+        end_days = self._end_days()
+        chunks = []
+        loads = parallel_scheduler.balance(components, workers)
+        for load in loads:
+            employees = {inputs[idx][2] for idx in load}
+            if not employees <= self.employees.keys():
+                return False
+            employees = [self.employees[name] for name in sorted(employees)]
+            calendars = {employee.calendar for employee in employees} & self.calendars.keys()
+            # Antecedents that are not rescheduled keep their end
+            fixed_ends = {}
+            for idx in load:
+                for pred_idx in predecessors[idx]:
+                    if pred_idx not in affected:
+                        if not end_days[pred_idx]:
+                            return False
+                        fixed_ends[pred_idx] = end_days[pred_idx]
+            chunks.append({
+                'start_day': self.start_day,
+                'holidays': self.global_holidays,
+                'holiday_rules': self.holiday_rules,
+                'batch_engine': self.batch_engine,
+                'calendars': [(calendar.name, calendar.work_mask, calendar.holidays, calendar.holiday_rules)
+                              for calendar in (self.calendars[name] for name in sorted(calendars))],
+                'employees': [(employee.name, employee.calendar, employee.work_mask_override,
+                               employee.holidays, employee.holiday_rules) for employee in employees],
+                'tasks': [inputs[idx] for idx in load],
+                'fixed_ends': [(self.tasks[pred_idx].name, end_day) for pred_idx, end_day in fixed_ends.items()],
+            })
+
+        try:
+            results = parallel_scheduler.schedule_chunks(chunks, min(workers, len(chunks)))
+        except Exception:
+            return False
+
+        self._store_schedules(((idx,) + row for load, rows in zip(loads, results) for idx, row in zip(load, rows)),
+                              predecessors)
+        return True
+
+    def _schedule_batch(self, affected: Set[int], predecessors, successors) -> bool:
+        """
+        Recompute the affected tasks with the NumPy engine, a dependency level at a time.
+
+        Returns False without touching anything when the engine is off,
+        NumPy is missing, the batch is too small to pay off, or the inputs
+        hold an error (unknown employee, cycle...) that the task loop then
+        reports in its usual order.
+        """
+        if not self.batch_engine or len(affected) < self.BATCH_MIN_TASKS or not batch_scheduler.available():
+            return False
+
+        order, levels = self._dependency_levels(affected, predecessors, successors)
+        if len(order) < len(affected):
+            return False
+
+        _, estimated, assigned_to, _, availability, contingency, custom_starts = self._input_columns(order)
+        end_days = self._end_days()
+
+        # One entry per distinct calendar index (shared or overlay)
+        indexes: Dict[object, int] = {}
+        index_of_employee: Dict[str, int] = {}
+        calendar_ids = []
+        for name in assigned_to:
+            index_id = index_of_employee.get(name)
+            if index_id is None:
+                employee = self.employees.get(name)
+                if not employee:
+                    return False
+                try:
+                    index = self._get_calendar_index(employee)
+                except ValueError:
+                    return False
+                index_id = index_of_employee[name] = indexes.setdefault(index, len(indexes))
+            calendar_ids.append(index_id)
+
+        durations = batch_scheduler.actual_durations(estimated, availability, contingency)
+        if durations is None:
+            return False
+
+        position = {idx: pos for pos, idx in enumerate(order)}
+        batch_predecessors = []
+        fixed_earliest = []
+        for idx, custom_start in zip(order, custom_starts):
+            preds = predecessors[idx]
+            batch_predecessors.append(tuple(position[pred_idx] for pred_idx in preds if pred_idx in position))
+            if custom_start:
+                fixed_earliest.append(custom_start)
+            elif preds:
+                # The day after the latest antecedent outside the batch (0 if none)
+                earliest_day = 0
+                for pred_idx in preds:
+                    if pred_idx not in position:
+                        if not end_days[pred_idx]:
+                            return False
+                        earliest_day = max(earliest_day, end_days[pred_idx] + 1)
+                fixed_earliest.append(earliest_day)
+            else:
+                fixed_earliest.append(self.start_day)
+
+        result = batch_scheduler.schedule_levels(levels, batch_predecessors, fixed_earliest, durations,
+                                                 calendar_ids, list(indexes))
+        if result is None:
+            return False
+        earliest, first, last, working, holidays = result
+        self._store_schedules(zip(order, durations.tolist(), earliest.tolist(), first.tolist(), last.tolist(),
+                                  working, holidays), predecessors)
+        return True
+
+    def _dependency_levels(self, indices: Set[int], predecessors, successors):
+        """
+        Order a closed set of tasks (it holds every successor of its tasks)
+        by dependency level.
+
+        A task's level is one more than the highest level among its
+        antecedents in the set. Returns the task indices in level order, and
+        each level as a list of positions in that order. Tasks on a cycle
+        are left out.
+        """
+        waiting = {idx: len(indices.intersection(predecessors[idx])) for idx in indices}
+        ready = deque(sorted(idx for idx, count in waiting.items() if not count))
+        level_of = dict.fromkeys(ready, 0)
+        order = []
+        while ready:
+            idx = ready.popleft()
+            order.append(idx)
+            level = level_of[idx] + 1
+            for succ_idx in successors[idx]:
+                if level_of.get(succ_idx, 0) < level:
+                    level_of[succ_idx] = level
+                waiting[succ_idx] -= 1
+                if not waiting[succ_idx]:
+                    ready.append(succ_idx)
+        order.sort(key=level_of.__getitem__)
+
+        levels = []
+        for pos, idx in enumerate(order):
+            if level_of[idx] == len(levels):
+                levels.append([])
+            levels[-1].append(pos)
+        return order, levels
+
+    def _input_columns(self, indices: List[int]) -> List[list]:
+        """
+        The scheduling inputs of the given tasks, one list per field, in the
+        order of TaskFields.schedule_inputs(). A missing custom start day may
+        be None or 0.
+        """
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            return [[values[idx] for idx in indices] for values in (
+                table.names, table.estimated_duration, table.assigned_to, table.dependency,
+                table.availability, table.contingency_margin, table.custom_start_day)]
+        inputs = [self.tasks[idx].schedule_inputs() for idx in indices]
+        return [list(column) for column in zip(*inputs)] if inputs else [[] for _ in range(7)]
+
+    def task_inputs(self) -> Iterable[tuple]:
+        """The schedule_inputs() of every task, read from the columns with a TaskTable."""
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            return zip(table.names, table.estimated_duration, table.assigned_to, table.dependency,
+                       table.availability, table.contingency_margin,
+                       [day or None for day in table.custom_start_day])
+        return (task.schedule_inputs() for task in self.tasks)
+
+    def _end_days(self):
+        """End day of every task by index (None or 0 when it has none)."""
+        if isinstance(self.tasks, TaskTable):
+            return self.tasks.end_day
+        return [task.end_day for task in self.tasks]
+
+    def _store_schedules(self, rows, predecessors):
+        """
+        Write schedules computed outside the task loop back to the tasks.
+
+        rows yields (index, actual duration, earliest day, start day, end day,
+        working spans, holiday spans), with 0 for a missing day.
+        """
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            for idx, duration, earliest_day, start_day, end_day, working_days, holiday_days in rows:
+                table.actual_duration[idx] = duration
+                table.earliest_day[idx] = earliest_day
+                table.start_day[idx] = start_day
+                table.end_day[idx] = end_day
+                table.working_days[idx] = working_days
+                table.holiday_days[idx] = holiday_days
+                table.scheduled_after[idx] = predecessors[idx]
+            return
+
+        tasks = self.tasks
+        for idx, duration, earliest_day, start_day, end_day, working_days, holiday_days in rows:
+            task = tasks[idx]
+            task.actual_duration = duration
+            task._earliest_day = earliest_day or None
+            task.start_day = start_day or None
+            task.end_day = end_day or None
+            task.working_days = working_days
+            task.holiday_days = holiday_days
+            task._scheduled_after = tuple(map(tasks.__getitem__, predecessors[idx]))
+
+    def schedule_results(self) -> list:
+        """
+        The computed schedule of every task, in order, for restore_schedule().
+
+        Each entry is (actual duration, earliest day, start day, end day,
+        working spans, holiday spans, antecedent indices), with 0 for a
+        missing day.
+        """
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            return list(zip(table.actual_duration, table.earliest_day, table.start_day, table.end_day,
+                            table.working_days, table.holiday_days, table.scheduled_after))
+        positions = {task: idx for idx, task in enumerate(self.tasks)}
+        return [(task.actual_duration, task._earliest_day or 0, task.start_day or 0, task.end_day or 0,
+                 task.working_days, task.holiday_days,
+                 tuple(positions.get(antecedent, -1) for antecedent in task._scheduled_after))
+                for task in self.tasks]
+
+    def schedule_is_current(self) -> bool:
+        """Whether the computed schedule reflects every edit (no task awaits rescheduling)."""
+        return not self._dirty_tasks
+
+    def restore_schedule(self, results: list):
+        """
+        Put back the schedule_results() of a project with the same inputs,
+        instead of calculating the schedule again.
+        """
+        if len(results) != len(self.tasks):
+            raise ValueError(f"Expected a schedule for {len(self.tasks)} tasks, got {len(results)}")
+        self._store_schedules(((idx,) + row[:-1] for idx, row in enumerate(results)),
+                              [row[-1] for row in results])
+        self._dirty_tasks.clear()
+        self._floats = None
+
+    def schedule_floats(self) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+        """
+        Total and free float of every task, in working days of its employee.
+
+        A backward pass over the last calculated schedule (the forward pass),
+        visiting each task after all of its successors: a task has to finish
+        the day before the latest start of every successor, or by the project
+        end when it has none, and its total float is the number of working
+        days between its end and that latest finish. Free float only looks at
+        the scheduled starts of the successors, so taking it delays no other
+        task. Tasks with a total float of 0 make up the critical path.
+
+        Returns (total floats, free floats) by task position, None for tasks
+        without a scheduled window. Linear in tasks plus dependencies; the
+        result is kept until the schedule changes.
+        """
+        predecessors, successors, _ = self._dependency_graph()
+        cached = self._floats
+        if cached is not None and cached[0] is self._graph:
+            return cached[1]
+
+        if isinstance(self.tasks, TaskTable):
+            table = self.tasks
+            starts, ends, assigned_to = table.start_day, table.end_day, table.assigned_to
+        else:
+            starts = [task.start_day for task in self.tasks]
+            ends = [task.end_day for task in self.tasks]
+            assigned_to = [task.assigned_to for task in self.tasks]
+        count = len(starts)
+        project_end = max((end_day for end_day in ends if end_day), default=None)
+        total_floats: List[Optional[int]] = [None] * count
+        free_floats: List[Optional[int]] = [None] * count
+        latest_starts: List[Optional[int]] = [None] * count
+        indexes = {}
+
+        # Reverse Kahn: a task is ready once all of its successors are done
+        remaining = [len(succs) for succs in successors]
+        stack = [idx for idx in range(count) if not remaining[idx]]
+        while stack:
+            idx = stack.pop()
+            for pred_idx in predecessors[idx]:
+                remaining[pred_idx] -= 1
+                if not remaining[pred_idx]:
+                    stack.append(pred_idx)
+
+            start_day, end_day = starts[idx], ends[idx]
+            employee = self.employees.get(assigned_to[idx])
+            if not start_day or not end_day or employee is None:
+                continue
+            index = indexes.get(employee.name)
+            if index is None:
+                index = indexes[employee.name] = self._get_calendar_index(employee)
+
+            latest_finish = next_start = project_end
+            for succ_idx in successors[idx]:
+                # Successors of zero duration hold nothing back
+                if latest_starts[succ_idx] is not None:
+                    latest_finish = min(latest_finish, latest_starts[succ_idx] - 1)
+                    next_start = min(next_start, starts[succ_idx] - 1)
+            total_float = index.count_working_days(end_day + 1, latest_finish)
+            total_floats[idx] = total_float
+            free_floats[idx] = (total_float if next_start == latest_finish
+                                else index.count_working_days(end_day + 1, next_start))
+            # Shifting the whole window by the float gives the latest start
+            latest_starts[idx] = index.add_working_days(start_day, total_float + 1)[1]
+
+        result = (total_floats, free_floats)
+        self._floats = (self._graph, result)
+        return result
+
+    def forecast_completion(self, trials: int = 10000, optimistic: float = 10, pessimistic: float = 30,
+                            distributions: Optional[Dict[str, tuple]] = None,
+                            percentiles: Iterable[float] = (50, 80, 95), seed=None):
+        """
+        Monte Carlo forecast of the end dates (needs NumPy).
+
+        Each task's estimated duration is drawn from a triangular
+        distribution, from `optimistic` percent below the estimate to
+        `pessimistic` percent above it, or from the (low, most likely, high)
+        estimated days given for its name in `distributions`; the spread
+        stands in for the contingency margin. Samples go through the
+        dependencies and working-day calendars like calculate_schedule()
+        does, without resource levelling.
+
+        Returns (task days, project days): for every task in order the end
+        day ordinal at each percentile (None for a task that takes no time),
+        and the project end day at each percentile.
+        """
+        if not monte_carlo.available():
+            raise RuntimeError("Forecasting needs NumPy")
+        if trials < 1:
+            raise ValueError("The number of trials must be positive")
+        percentiles = list(percentiles)
+        distributions = distributions or {}
+
+        predecessors, successors, _ = self._dependency_graph()
+        indices = set(range(len(self.tasks)))
+        order, levels = self._dependency_levels(indices, predecessors, successors)
+        if len(order) < len(indices):
+            cycle = self._find_cycle(predecessors, indices - set(order))
+            raise ValueError(f"Circular dependency detected: {' -> '.join(cycle)}")
+
+        names, estimated, assigned_to, _, availability, _, custom_starts = self._input_columns(order)
+        indexes: Dict[object, int] = {}
+        calendar_ids = []
+        low, mode, high = [], [], []
+        for name, estimate, employee_name, task_availability in zip(names, estimated, assigned_to, availability):
+            employee = self.employees.get(employee_name)
+            if not employee:
+                raise ValueError(f"Employee '{employee_name}' not found")
+            if task_availability <= 0:
+                raise ValueError(f"Task '{name}' has no availability")
+            calendar_ids.append(indexes.setdefault(self._get_calendar_index(employee), len(indexes)))
+
+            distribution = distributions.get(name)
+            if distribution is None:
+                distribution = (estimate * (1 - optimistic / 100), estimate, estimate * (1 + pessimistic / 100))
+            if not 0 <= distribution[0] <= distribution[1] <= distribution[2]:
+                raise ValueError(f"Invalid duration distribution for task '{name}': {distribution}")
+            low.append(distribution[0])
+            mode.append(distribution[1])
+            high.append(distribution[2])
+
+        position = {idx: pos for pos, idx in enumerate(order)}
+        task_days, project_days = monte_carlo.simulate_levels(
+            levels, [tuple(position[pred_idx] for pred_idx in predecessors[idx]) for idx in order],
+            [custom_start or (0 if predecessors[idx] else self.start_day)
+             for idx, custom_start in zip(order, custom_starts)],
+            low, mode, high, availability, calendar_ids, list(indexes), trials, percentiles, seed)
+
+        results: List[Optional[List[int]]] = [None] * len(order)
+        for pos, idx in enumerate(order):
+            if high[pos] > 0:
+                results[idx] = task_days[:, pos].tolist()
+        return results, project_days.tolist()
+
+    def get_project_end_day(self) -> Optional[int]:
+        """Get the end date of the entire project as a day ordinal."""
+        if not self.tasks:
+            return None
+        if isinstance(self.tasks, TaskTable):
+            return max(end_day for end_day in self.tasks.end_day if end_day)
+        return max(task.end_day for task in self.tasks if task.end_day is not None)
 
     def get_project_end_date(self) -> Optional[datetime]:
         """Get the end date of the entire project."""
+        end_day = self.get_project_end_day()
+        return from_ordinal(end_day) if end_day is not None else None
+
+    def get_day_range(self) -> tuple:
+        """Get the full date range of the project as day ordinals."""
         if not self.tasks:
-            return None
-        return max(task.end_date for task in self.tasks if task.end_date)
+            return (self.start_day, self.start_day)
+
+        return (self.start_day, self.get_project_end_day())
 
     def get_date_range(self) -> tuple:
         """Get the full date range of the project."""
-        if not self.tasks:
-            return (self.start_date, self.start_date)
-
-        end_date = self.get_project_end_date()
-        return (self.start_date, end_date)
+        start_day, end_day = self.get_day_range()
+        return (from_ordinal(start_day), from_ordinal(end_day) if end_day is not None else None)
@@ -0,0 +1,114 @@
+from typing import Sequence
+
+from batch_scheduler import BatchCalendars
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; forecasting is unavailable without it
+    np = None
+
+
+# Trials simulated together; bounds the working arrays to a few of
+# CHUNK_TRIALS x tasks
+CHUNK_TRIALS = 1000
+
+
+def available() -> bool:
+    """Check if forecasting can run (NumPy is installed)."""
+    return np is not None
+
+
+def sample_durations(rng, low, mode, high, availability, trials: int):
+    """
+    Draw working-day durations for `trials` runs of every task.
+
+    low, mode and high are each task's triangular distribution in estimated
+    days; a sample is turned into working days like actual_duration() does
+    (without the contingency margin, which the distribution replaces) and
+    is at least one day unless the whole distribution is zero.
+    """
+    # Inverse CDF of the triangular distribution, which unlike
+    # Generator.triangular() accepts low == high
+    width = high - low
+    split = np.divide(mode - low, width, out=np.zeros_like(width), where=width > 0)
+    u = rng.random((trials, len(low)))
+    samples = np.where(u < split,
+                       low + np.sqrt(u * width * (mode - low)),
+                       high - np.sqrt((1 - u) * width * (high - mode)))
+    durations = np.rint(samples / availability * 100).astype(np.int64)
+    return np.where(high > 0, np.maximum(durations, 1), 0)
+
+
+def simulate_levels(levels: Sequence[Sequence[int]], predecessors, fixed_earliest, low, mode, high,
+                    availability, calendar_ids, indexes: Sequence, trials: int,
+                    percentiles: Sequence[float], seed=None):
+    """
+    Monte Carlo end days of a set of tasks, all trials of a level at a time.
+
+    Tasks are numbered 0..n-1. levels lists the tasks of each dependency
+    level, predecessors the tuple of each task's antecedents (all in the
+    set), fixed_earliest the earliest day of tasks without antecedents, and
+    calendar_ids picks each task's entry in indexes, as for
+    batch_scheduler.schedule_levels(). Durations are sampled per trial with
+    sample_durations().
+
+    Returns (task days, project days): the requested percentiles of each
+    task's end day (an array of percentiles x tasks) and of the last end
+    day of each trial. A task of zero duration ends the day before its
+    earliest start, so it holds nothing back.
+    """
+    count = len(predecessors)
+    low, mode, high, availability = (np.asarray(values, dtype=np.float64)
+                                     for values in (low, mode, high, availability))
+    fixed_earliest = np.asarray(fixed_earliest, dtype=np.int64)
+    calendar_ids = np.asarray(calendar_ids, dtype=np.int64)
+    levels = [np.asarray(level, dtype=np.int64) for level in levels]
+
+    # Edges grouped by the level of their task, then by task, so each level
+    # takes the latest antecedent of its tasks with one reduceat
+    level_of = np.zeros(count, dtype=np.int64)
+    for number, level in enumerate(levels):
+        level_of[level] = number
+    edge_tasks = np.fromiter((task for task, preds in enumerate(predecessors) for _ in preds), dtype=np.int64)
+    edge_preds = np.fromiter((pred for preds in predecessors for pred in preds), dtype=np.int64)
+    by_level = np.lexsort((edge_tasks, level_of[edge_tasks]))
+    edge_tasks, edge_preds = edge_tasks[by_level], edge_preds[by_level]
+    bounds = np.searchsorted(level_of[edge_tasks], np.arange(len(levels) + 1)).tolist()
+    groups = []
+    for number in range(len(levels)):
+        tasks = edge_tasks[bounds[number]:bounds[number + 1]]
+        starts = np.flatnonzero(np.diff(tasks, prepend=-1))
+        groups.append((tasks[starts], starts))
+
+    roots = fixed_earliest[np.bincount(edge_tasks, minlength=count) == 0]
+    lo = int(roots.min()) if roots.size else 0
+    calendars = BatchCalendars(indexes, lo, max(int(roots.max()) + 1 if roots.size else lo, lo) + 366)
+
+    rng = np.random.default_rng(seed)
+    ends = np.empty((trials, count), dtype=np.int32)
+    for chunk_start in range(0, trials, CHUNK_TRIALS):
+        size = min(CHUNK_TRIALS, trials - chunk_start)
+        durations = sample_durations(rng, low, mode, high, availability, size)
+        earliest = np.repeat(fixed_earliest[np.newaxis, :], size, axis=0)
+        last = np.zeros((size, count), dtype=np.int64)
+
+        for number, level in enumerate(levels):
+            tasks, starts = groups[number]
+            if tasks.size:
+                # Start the day after the last antecedent ends
+                after = last[:, edge_preds[bounds[number]:bounds[number + 1]]] + 1
+                earliest[:, tasks] = np.maximum(earliest[:, tasks], np.maximum.reduceat(after, starts, axis=1))
+            level_earliest = earliest[:, level]
+            level_durations = durations[:, level]
+            level_calendars = np.broadcast_to(calendar_ids[level], level_durations.shape)
+            while True:
+                placed = calendars.place(level_calendars, level_earliest, level_durations)
+                if placed is not None:
+                    break
+                calendars.grow()
+            last[:, level] = np.where(level_durations >= 1, placed[1], level_earliest - 1)
+        ends[chunk_start:chunk_start + size] = last
+
+    task_days = np.percentile(ends, percentiles, axis=0, method='inverted_cdf')
+    project_days = np.percentile(ends.max(axis=1), percentiles, method='inverted_cdf')
+    return task_days.astype(np.int64), project_days.astype(np.int64)
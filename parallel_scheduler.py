@@ -0,0 +1,150 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence
+
+# Worker processes are started by a fork server where there is one, else
+# spawned: forking a threaded server copies locks held by other threads
+_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+# One pool for the whole process, started on first use and kept, so each
+# calculation does not pay for starting workers
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def independent_components(indices: Sequence[int], predecessors, assigned_to: Sequence[str]) -> List[List[int]]:
+    """
+    Split tasks into groups that share no dependency and no employee.
+
+    indices are task positions and assigned_to their employees, in the
+    same order; predecessors gives the tuple of antecedent positions of
+    each task, indexed by task position. Each group lists
+    its task positions in ascending order; groups are ordered by their
+    first task.
+    """
+    parent = {idx: idx for idx in indices}
+
+    def find(idx):
+        while parent[idx] != idx:
+            parent[idx] = parent[parent[idx]]
+            idx = parent[idx]
+        return idx
+
+    def union(a, b):
+        a, b = find(a), find(b)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    first_task_of: Dict[str, int] = {}
+    for idx, employee in zip(indices, assigned_to):
+        for pred_idx in predecessors[idx]:
+            if pred_idx in parent:
+                union(idx, pred_idx)
+        union(idx, first_task_of.setdefault(employee, idx))
+
+    groups: Dict[int, List[int]] = {}
+    for idx in sorted(indices):
+        groups.setdefault(find(idx), []).append(idx)
+    return list(groups.values())
+
+
+def balance(components: List[List[int]], bins: int) -> List[List[int]]:
+    """Pack components into at most `bins` groups of similar size (largest first)."""
+    loads = [[] for _ in range(min(bins, len(components)))]
+    for component in sorted(components, key=len, reverse=True):
+        min(loads, key=len).extend(component)
+    for load in loads:
+        load.sort()
+    return loads
+
+
+def schedule_chunk(chunk: dict) -> list:
+    """
+    Schedule one chunk of independent tasks in a worker process.
+
+    The chunk holds plain data only: the project start and holidays, the
+    calendars and employees the tasks use, each task's inputs, and the
+    (name, end day) of the antecedents outside the chunk, which keep their
+    end. Returns (actual duration, earliest day, start day, end day,
+    working spans, holiday spans) per task, in order, with 0 for a missing
+    day.
+    """
+    # Imported here: models imports this module
+    from models import Employee, Project, Task, WorkCalendar
+
+    project = Project('chunk', chunk['start_day'])
+    project.set_global_holidays(chunk['holidays'])
+    project.set_global_holiday_rules(chunk['holiday_rules'])
+    project.batch_engine = chunk['batch_engine']
+    project.schedule_workers = 1
+    for name, work_mask, holidays, holiday_rules in chunk['calendars']:
+        calendar = WorkCalendar(name)
+        calendar.work_mask = work_mask
+        calendar.set_holidays(holidays)
+        calendar.set_holiday_rules(holiday_rules)
+        project.add_calendar(calendar)
+    for name, calendar, work_mask_override, holidays, holiday_rules in chunk['employees']:
+        employee = Employee(name, calendar)
+        employee.work_mask_override = work_mask_override
+        employee.set_holidays(holidays)
+        employee.set_holiday_rules(holiday_rules)
+        project.add_employee(employee)
+
+    # Outside antecedents become tasks that are already scheduled, so the
+    # project reads their end without rescheduling them
+    for name, end_day in chunk['fixed_ends']:
+        fixed = project.add_task(Task(name, 0, ''))
+        fixed._earliest_day = fixed.end_day = end_day
+        project._dirty_tasks.discard(fixed)
+
+    tasks = []
+    for inputs in chunk['tasks']:
+        name, estimated_duration, assigned_to, dependency, availability, contingency_margin, custom_start_day = inputs
+        task = Task(name, estimated_duration, assigned_to)
+        task.dependency = dependency
+        task.availability = availability
+        task.contingency_margin = contingency_margin
+        task.custom_start_day = custom_start_day or None
+        tasks.append(project.add_task(task))
+
+    project.calculate_schedule()
+    return [(task.actual_duration, task._earliest_day, task.start_day or 0, task.end_day or 0,
+             task.working_days, task.holiday_days) for task in tasks]
+
+
+def schedule_chunks(chunks: List[dict], workers: int) -> List[list]:
+    """
+    Run schedule_chunk() for every chunk in the shared pool, replacing it
+    by a larger one first if it has fewer than `workers` processes.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                # Work already submitted to the old pool still finishes
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_CONTEXT)
+            _pool_workers = workers
+        pool = _pool
+        futures = [pool.submit(schedule_chunk, chunk) for chunk in chunks]
+    try:
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        # A worker died: start a new pool next time
+        with _pool_lock:
+            if _pool is pool:
+                _pool, _pool_workers = None, 0
+        raise
+
+
+def shutdown():
+    """Stop the shared pool's workers; the next schedule_chunks() starts a new pool."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool, _pool_workers = None, 0
@@ -0,0 +1,164 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from models import Project
+
+
+class UnknownProjectError(LookupError):
+    """Raised for a project ID that was never created or has been evicted."""
+
+
+class _Entry:
+    __slots__ = ('project', 'lock', 'last_used', 'users', 'discarded')
+
+    def __init__(self, project: Project, now: float):
+        self.project = project
+        self.lock = threading.RLock()
+        self.last_used = now
+        self.users = 0  # requests holding or waiting for the project; pinned while non-zero
+        self.discarded = False
+
+
+class ProjectRegistry:
+    """
+    Projects held by the server, keyed by a project ID.
+
+    Each project has its own lock: checkout() serialises the requests of one
+    project while different projects are served concurrently. Memory is
+    bounded by evicting the least recently used projects beyond max_projects
+    and those idle for more than idle_timeout seconds (None keeps them until
+    the limit is reached). A project in use by a request is never evicted.
+
+    With a loader (e.g. ProjectStore.load_project), a project that is not in
+    memory is loaded on first access, so eviction only frees memory.
+    """
+
+    def __init__(self, max_projects: int = 100, idle_timeout: Optional[float] = 3600.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 loader: Optional[Callable[[str], Optional[Project]]] = None):
+        self.max_projects = max_projects
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._loader = loader
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, project_id: str) -> bool:
+        return project_id in self._entries
+
+    def add(self, project: Project) -> str:
+        """Register a project and return its new ID."""
+        project_id = uuid.uuid4().hex
+        with self._lock:
+            self._evict(reserve=1)
+            self._entries[project_id] = _Entry(project, self._clock())
+        return project_id
+
+    def _pin(self, project_id: str) -> _Entry:
+        """Find (or load) a project's entry and mark it in use."""
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(project_id)
+            if entry is not None:
+                self._entries.move_to_end(project_id)
+                entry.users += 1
+                return entry
+        if self._loader is None:
+            raise UnknownProjectError(project_id)
+
+        # Loaded without holding the registry lock; a concurrent load of the
+        # same project keeps whichever finishes first
+        project = self._loader(project_id)
+        if project is None:
+            raise UnknownProjectError(project_id)
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None:
+                self._evict(reserve=1)
+                entry = self._entries[project_id] = _Entry(project, self._clock())
+                self.loads += 1
+            self._entries.move_to_end(project_id)
+            entry.users += 1
+            return entry
+
+    @contextmanager
+    def checkout(self, project_id: str) -> Iterator[Project]:
+        """
+        Hold a project's lock for the duration of a with block.
+
+        Raises UnknownProjectError if there is no such project, or if it was
+        discarded while waiting for the lock.
+        """
+        entry = self._pin(project_id)
+        try:
+            with entry.lock:
+                if entry.discarded:
+                    raise UnknownProjectError(project_id)
+                yield entry.project
+        finally:
+            self._unpin(project_id, entry)
+
+    def get(self, project_id: str) -> Project:
+        """
+        A project without taking its lock, for readers of immutable state
+        such as its published schedule snapshot.
+
+        Raises UnknownProjectError if there is no such project.
+        """
+        entry = self._pin(project_id)
+        self._unpin(project_id, entry)
+        return entry.project
+
+    def _unpin(self, project_id: str, entry: _Entry):
+        with self._lock:
+            entry.users -= 1
+            entry.last_used = self._clock()
+            if self._entries.get(project_id) is entry:
+                self._entries.move_to_end(project_id)
+
+    def discard(self, project_id: str) -> bool:
+        """
+        Remove a project; returns False if it did not exist. Requests waiting
+        in checkout() for it get UnknownProjectError.
+        """
+        with self._lock:
+            entry = self._entries.pop(project_id, None)
+        if entry is None:
+            return False
+        entry.discarded = True
+        return True
+
+    def _evict(self, reserve: int = 0):
+        # Called with self._lock held; reserve makes room for entries about to be added
+        now = self._clock()
+        excess = len(self._entries) + reserve - self.max_projects
+        for project_id, entry in list(self._entries.items()):
+            idle = self.idle_timeout is not None and now - entry.last_used > self.idle_timeout
+            if excess <= 0 and not idle:
+                # Entries are in order of use, so the rest are more recent
+                break
+            if entry.users:
+                continue
+            del self._entries[project_id]
+            self.evictions += 1
+            excess -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                'projects': len(self._entries),
+                'in_use': sum(1 for entry in self._entries.values() if entry.users),
+                'max_projects': self.max_projects,
+                'evictions': self.evictions,
+                'loads': self.loads,
+            }
@@ -0,0 +1,392 @@
+import sqlite3
+import threading
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from date_ranges import DateRangeSet, DaySpans
+from models import Project, Task, TaskFields, Employee, WorkCalendar, dependency_names
+from schedule_cache import schedule_key
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    start_day INTEGER NOT NULL,
+    resource_levelling INTEGER NOT NULL DEFAULT 0,
+    schedule_key TEXT
+);
+CREATE TABLE IF NOT EXISTS calendars (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    work_mask INTEGER NOT NULL,
+    PRIMARY KEY (project_id, name)
+);
+CREATE TABLE IF NOT EXISTS employees (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    calendar TEXT,
+    work_mask_override INTEGER,
+    PRIMARY KEY (project_id, name)
+);
+-- Holiday ranges and recurring rules of the project (owner ''), of a
+-- calendar or of an employee
+CREATE TABLE IF NOT EXISTS holidays (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    owner_type TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    start_day INTEGER,
+    end_day INTEGER,
+    rule TEXT
+);
+CREATE INDEX IF NOT EXISTS holidays_owner ON holidays (project_id, owner_type, owner);
+CREATE TABLE IF NOT EXISTS tasks (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    estimated_duration INTEGER NOT NULL,
+    assigned_to TEXT NOT NULL,
+    dependency TEXT,
+    availability INTEGER NOT NULL,
+    contingency_margin INTEGER NOT NULL,
+    custom_start_day INTEGER,
+    PRIMARY KEY (project_id, position)
+);
+CREATE INDEX IF NOT EXISTS tasks_name ON tasks (project_id, name);
+CREATE INDEX IF NOT EXISTS tasks_assigned_to ON tasks (project_id, assigned_to);
+-- The last computed schedule, valid while projects.schedule_key matches
+-- the project's inputs. Each column holds the values of every task in
+-- order as packed int32 (see _pack_column() and _pack_groups()), so a
+-- schedule is read back with a few bulk conversions
+CREATE TABLE IF NOT EXISTS schedules (
+    project_id TEXT PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+    actual_duration BLOB NOT NULL,
+    earliest_day BLOB NOT NULL,
+    start_day BLOB NOT NULL,
+    end_day BLOB NOT NULL,
+    working_days BLOB NOT NULL,
+    holiday_days BLOB NOT NULL,
+    scheduled_after BLOB NOT NULL
+);
+"""
+
+
+# Projects with at least this many tasks are loaded into a TaskTable
+TABLE_MIN_TASKS = 1000
+
+# Separates the names of several antecedents in tasks.dependency
+DEPENDENCY_SEPARATOR = '\x1f'
+
+
+def _pack_column(values) -> bytes:
+    return array('i', values).tobytes()
+
+
+def _unpack_column(blob: bytes) -> List[int]:
+    values = array('i')
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def _pack_groups(groups: List[list], fields: int = 1) -> bytes:
+    """
+    Pack a list of groups of equal-length tuples (e.g. the spans of each
+    task): the size of every group, then each field of all the tuples.
+    """
+    values = array('i', map(len, groups))
+    for field in range(fields):
+        values.extend(item[field] for group in groups for item in group)
+    return values.tobytes()
+
+
+def _unpack_groups(blob: bytes, count: int, fields: int = 1) -> List[List[list]]:
+    """Inverse of _pack_groups(): per field, the values of each of the count groups."""
+    values = _unpack_column(blob)
+    sizes = values[:count]
+    total = (len(values) - count) // fields if fields else 0
+    result = []
+    for field in range(fields):
+        flat = values[count + field * total:count + (field + 1) * total]
+        groups = []
+        position = 0
+        for size in sizes:
+            groups.append(flat[position:position + size])
+            position += size
+        result.append(groups)
+    return result
+
+
+def _task_values(task: TaskFields) -> tuple:
+    """The columns of a task's row after project_id and position."""
+    return (task.name, task.estimated_duration, task.assigned_to,
+            DEPENDENCY_SEPARATOR.join(dependency_names(task.dependency)) or None,
+            task.availability, task.contingency_margin, task.custom_start_day)
+
+
+def _whole_numbers(values) -> bool:
+    """Whether every stored value fits the int columns of a TaskTable."""
+    return all(isinstance(value, int) or float(value).is_integer() for value in values)
+
+
+def _pack_spans(spans: List[DaySpans]) -> bytes:
+    return _pack_groups([task_spans.spans() for task_spans in spans], 2)
+
+
+def _unpack_spans(blob: bytes, count: int) -> List[DaySpans]:
+    starts, lengths = _unpack_groups(blob, count, 2)
+    return list(map(DaySpans.from_runs, starts, lengths))
+
+
+class ProjectStore:
+    """
+    SQLite persistence of projects, so they survive a restart.
+
+    The database runs in WAL mode, so readers are not blocked by a writer.
+    Each thread uses its own connection. Edits are written through with the
+    save_*() method for the part that changed (save_*_changes() for single
+    tasks or employees). load_project() rebuilds a project with its last
+    computed schedule when the inputs still match it. The database is
+    opened (and created) on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._created = False
+        self._create_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('PRAGMA foreign_keys=ON')
+            self._local.db = db
+            with self._create_lock:
+                if not self._created:
+                    with db:
+                        db.executescript(SCHEMA)
+                    self._created = True
+        return db
+
+    def close(self):
+        """Close this thread's connection."""
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # Writing
+
+    def save_project(self, project_id: str, project: Project):
+        """Write a whole project, replacing any stored version."""
+        with self._connection() as db:
+            self._write_info(db, project_id, project)
+            self._write_employees(db, project_id, project)
+            self._write_tasks(db, project_id, project)
+            self._write_schedule(db, project_id, project)
+
+    def save_info(self, project_id: str, project: Project):
+        """
+        Write the name, start date, levelling mode, global holidays and
+        calendars of a stored project (nothing if it was deleted meanwhile).
+        """
+        with self._connection() as db:
+            self._write_info(db, project_id, project, create=False)
+
+    def save_employees(self, project_id: str, project: Project):
+        with self._connection() as db:
+            self._write_employees(db, project_id, project)
+
+    def save_tasks(self, project_id: str, project: Project):
+        with self._connection() as db:
+            self._write_tasks(db, project_id, project)
+
+    def save_employee_changes(self, project_id: str, changed: Iterable[Employee] = (),
+                              deleted: Iterable[str] = ()):
+        """Write the given employees and remove the deleted ones (by name), leaving the others."""
+        changed = list(changed)
+        names = [(project_id, name) for name in [employee.name for employee in changed] + list(deleted)]
+        with self._connection() as db:
+            db.executemany('DELETE FROM employees WHERE project_id = ? AND name = ?', names)
+            db.executemany("DELETE FROM holidays WHERE project_id = ? AND owner_type = 'employee' AND owner = ?",
+                           names)
+            self._insert_employees(db, project_id, changed)
+
+    def save_task_changes(self, project_id: str, changed: Iterable[Tuple[str, TaskFields]] = (),
+                          deleted: Iterable[str] = ()):
+        """
+        Write single task edits without rewriting the task list. changed
+        pairs each task with the name it is stored under (its name before a
+        rename); a task not stored yet is appended. deleted are the names of
+        removed tasks, deleted first.
+        """
+        with self._connection() as db:
+            db.executemany('DELETE FROM tasks WHERE project_id = ? AND name = ?',
+                           [(project_id, name) for name in deleted])
+            for stored_name, task in changed:
+                values = _task_values(task)
+                updated = db.execute('UPDATE tasks SET name = ?, estimated_duration = ?, assigned_to = ?, '
+                                     'dependency = ?, availability = ?, contingency_margin = ?, '
+                                     'custom_start_day = ? WHERE project_id = ? AND name = ?',
+                                     values + (project_id, stored_name)).rowcount
+                if not updated:
+                    # Positions only order the rows, so gaps left by deletions are fine
+                    db.execute('INSERT INTO tasks SELECT ?, COALESCE(MAX(position) + 1, 0), ?, ?, ?, ?, ?, ?, ? '
+                               'FROM tasks WHERE project_id = ?', (project_id,) + values + (project_id,))
+
+    def save_schedule(self, project_id: str, project: Project):
+        """
+        Write the computed schedule, unless it is out of date or the stored
+        one is for the same inputs.
+        """
+        with self._connection() as db:
+            self._write_schedule(db, project_id, project)
+
+    def delete_project(self, project_id: str) -> bool:
+        """Remove a project; returns False if it was not stored."""
+        with self._connection() as db:
+            return db.execute('DELETE FROM projects WHERE id = ?', (project_id,)).rowcount > 0
+
+    def _write_info(self, db, project_id, project, create=True):
+        values = (project_id, project.name, project.start_day, int(project.resource_levelling))
+        if create:
+            db.execute('INSERT INTO projects (id, name, start_day, resource_levelling) VALUES (?, ?, ?, ?) '
+                       'ON CONFLICT (id) DO UPDATE SET name = excluded.name, start_day = excluded.start_day, '
+                       'resource_levelling = excluded.resource_levelling', values)
+        elif not db.execute('UPDATE projects SET name = ?, start_day = ?, resource_levelling = ? WHERE id = ?',
+                            values[1:] + values[:1]).rowcount:
+            return
+        db.execute('DELETE FROM calendars WHERE project_id = ?', (project_id,))
+        db.executemany('INSERT INTO calendars VALUES (?, ?, ?)',
+                       [(project_id, calendar.name, calendar.work_mask) for calendar in project.calendars.values()])
+        db.execute("DELETE FROM holidays WHERE project_id = ? AND owner_type IN ('project', 'calendar')",
+                   (project_id,))
+        self._write_holidays(db, project_id, 'project', '', project.global_holidays, project.holiday_rules)
+        for calendar in project.calendars.values():
+            self._write_holidays(db, project_id, 'calendar', calendar.name, calendar.holidays, calendar.holiday_rules)
+
+    def _write_employees(self, db, project_id, project):
+        db.execute('DELETE FROM employees WHERE project_id = ?', (project_id,))
+        db.execute("DELETE FROM holidays WHERE project_id = ? AND owner_type = 'employee'", (project_id,))
+        self._insert_employees(db, project_id, project.employees.values())
+
+    def _insert_employees(self, db, project_id, employees):
+        db.executemany('INSERT INTO employees VALUES (?, ?, ?, ?)',
+                       [(project_id, employee.name, employee.calendar, employee.work_mask_override)
+                        for employee in employees])
+        for employee in employees:
+            self._write_holidays(db, project_id, 'employee', employee.name, employee.holidays, employee.holiday_rules)
+
+    @staticmethod
+    def _write_holidays(db, project_id, owner_type, owner, holidays, rules):
+        db.executemany('INSERT INTO holidays (project_id, owner_type, owner, start_day, end_day) '
+                       'VALUES (?, ?, ?, ?, ?)',
+                       [(project_id, owner_type, owner, start, end) for start, end in holidays.ranges()])
+        db.executemany('INSERT INTO holidays (project_id, owner_type, owner, rule) VALUES (?, ?, ?, ?)',
+                       [(project_id, owner_type, owner, str(rule)) for rule in rules])
+
+    def _write_tasks(self, db, project_id, project):
+        db.execute('DELETE FROM tasks WHERE project_id = ?', (project_id,))
+        db.executemany('INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                       [(project_id, position) + _task_values(task) for position, task in enumerate(project.tasks)])
+
+    def _write_schedule(self, db, project_id, project):
+        if not project.schedule_is_current():
+            return
+        key = schedule_key(project)
+        stored = db.execute('SELECT schedule_key FROM projects WHERE id = ?', (project_id,)).fetchone()
+        if stored is not None and stored[0] == key:
+            return
+        columns = list(zip(*project.schedule_results())) or [()] * 7
+        durations, earliest_days, start_days, end_days, working_days, holiday_days, scheduled_after = columns
+        db.execute('INSERT OR REPLACE INTO schedules VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (
+            project_id, _pack_column(durations), _pack_column(earliest_days), _pack_column(start_days),
+            _pack_column(end_days), _pack_spans(working_days), _pack_spans(holiday_days),
+            _pack_groups([[(row,) for row in rows] for rows in scheduled_after])))
+        db.execute('UPDATE projects SET schedule_key = ? WHERE id = ?', (key, project_id))
+
+    # Reading
+
+    def load_project(self, project_id: str) -> Optional[Project]:
+        """Rebuild a stored project, or None if there is no such project."""
+        db = self._connection()
+        row = db.execute('SELECT name, start_day, resource_levelling, schedule_key FROM projects WHERE id = ?',
+                         (project_id,)).fetchone()
+        if row is None:
+            return None
+        name, start_day, resource_levelling, stored_key = row
+        project = Project(name, start_day)
+        project.resource_levelling = bool(resource_levelling)
+
+        holidays = {}
+        for owner_type, owner, start, end, rule in db.execute(
+                'SELECT owner_type, owner, start_day, end_day, rule FROM holidays WHERE project_id = ?',
+                (project_id,)):
+            ranges, rules = holidays.setdefault((owner_type, owner), ([], []))
+            if rule is None:
+                ranges.append((start, end))
+            else:
+                rules.append(rule)
+
+        def set_holidays(schedule, owner_type, owner):
+            ranges, rules = holidays.get((owner_type, owner), ((), ()))
+            schedule.set_holidays(DateRangeSet.from_ranges(ranges))
+            schedule.set_holiday_rules(rules)
+
+        ranges, rules = holidays.get(('project', ''), ((), ()))
+        project.set_global_holidays(DateRangeSet.from_ranges(ranges))
+        project.set_global_holiday_rules(rules)
+        for calendar_name, work_mask in db.execute(
+                'SELECT name, work_mask FROM calendars WHERE project_id = ?', (project_id,)):
+            calendar = WorkCalendar(calendar_name)
+            calendar.work_mask = work_mask
+            set_holidays(calendar, 'calendar', calendar_name)
+            project.add_calendar(calendar)
+        for employee_name, calendar_name, work_mask_override in db.execute(
+                'SELECT name, calendar, work_mask_override FROM employees WHERE project_id = ?', (project_id,)):
+            employee = Employee(employee_name, calendar_name)
+            employee.work_mask_override = work_mask_override
+            set_holidays(employee, 'employee', employee_name)
+            project.add_employee(employee)
+
+        rows = db.execute('SELECT name, estimated_duration, assigned_to, dependency, availability, '
+                          'contingency_margin, custom_start_day FROM tasks WHERE project_id = ? ORDER BY position',
+                          (project_id,)).fetchall()
+        columns = list(zip(*rows))
+        if len(rows) >= TABLE_MIN_TASKS and all(map(_whole_numbers, (columns[1], columns[4], columns[5]))):
+            # Straight into columns, without an object per task; the int
+            # columns cannot hold the fractions older databases may have
+            project.use_task_table()
+            (names, estimated_durations, assigned_to, dependencies, availabilities, contingency_margins,
+             custom_start_days) = columns
+            project.tasks.extend_inputs(
+                names, estimated_durations, assigned_to,
+                [dependency.split(DEPENDENCY_SEPARATOR) if dependency else None for dependency in dependencies],
+                availabilities, contingency_margins, [day or 0 for day in custom_start_days])
+        else:
+            tasks: List[Task] = []
+            for (task_name, estimated_duration, assigned_to, dependency, availability, contingency_margin,
+                 custom_start_day) in rows:
+                task = Task(task_name, estimated_duration, assigned_to)
+                task.dependency = dependency.split(DEPENDENCY_SEPARATOR) if dependency else None
+                task.availability = availability
+                task.contingency_margin = contingency_margin
+                task.custom_start_day = custom_start_day
+                tasks.append(task)
+            project.set_tasks(tasks)
+
+        # Put back the stored schedule if the inputs are the ones it was computed from
+        if stored_key is not None and stored_key == schedule_key(project):
+            stored = db.execute('SELECT actual_duration, earliest_day, start_day, end_day, working_days, '
+                                'holiday_days, scheduled_after FROM schedules WHERE project_id = ?',
+                                (project_id,)).fetchone()
+            if stored is not None:
+                count = len(rows)
+                durations, earliest_days, start_days, end_days = map(_unpack_column, stored[:4])
+                scheduled_after, = _unpack_groups(stored[6], count)
+                project.restore_schedule(list(zip(
+                    durations, earliest_days, start_days, end_days, _unpack_spans(stored[4], count),
+                    _unpack_spans(stored[5], count), map(tuple, scheduled_after))))
+        return project
@@ -0,0 +1,72 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Optional
+
+
+# An employee's full capacity, in availability percent
+FULL_CAPACITY = 100
+
+
+class BookingTimeline:
+    """
+    How much of one employee's capacity is booked on each day.
+
+    The load is a step function over day ordinals, stored as sorted
+    breakpoints: segment i covers [starts[i], starts[i + 1] - 1] at loads[i],
+    and the load is 0 before the first breakpoint and after the last. Finding
+    the segment holding a day is a binary search, and a query only walks the
+    segments inside the window asked about, never every booking.
+    """
+
+    __slots__ = ('_starts', '_loads')
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._loads: List[int] = []
+
+    def __len__(self) -> int:
+        """Number of load segments."""
+        return len(self._starts)
+
+    def load_at(self, day: int) -> int:
+        """Percent of capacity booked on a day."""
+        pos = bisect_right(self._starts, day) - 1
+        return self._loads[pos] if pos >= 0 else 0
+
+    def first_overload(self, start: int, end: int, amount: int) -> Optional[int]:
+        """
+        Check if `amount` percent more fits on every day of [start, end].
+
+        Returns None when it does; otherwise the last day of the first
+        segment in the window that would go over capacity, so the caller
+        can retry just after it.
+        """
+        starts, loads = self._starts, self._loads
+        pos = max(bisect_right(starts, start) - 1, 0)
+        while pos < len(starts) and starts[pos] <= end:
+            if loads[pos] + amount > FULL_CAPACITY:
+                # The last segment always has load 0, so pos + 1 exists here
+                return starts[pos + 1] - 1
+            pos += 1
+        return None
+
+    def _split(self, day: int) -> int:
+        """Make `day` a breakpoint and return its position."""
+        pos = bisect_left(self._starts, day)
+        if pos < len(self._starts) and self._starts[pos] == day:
+            return pos
+        self._starts.insert(pos, day)
+        self._loads.insert(pos, self._loads[pos - 1] if pos else 0)
+        return pos
+
+    def book(self, start: int, end: int, amount: int):
+        """Add `amount` percent of load on every day of [start, end]."""
+        first = self._split(start)
+        last = self._split(end + 1)
+        for pos in range(first, last):
+            self._loads[pos] += amount
+        # Drop breakpoints that no longer change the load
+        for pos in (last, first):
+            previous = self._loads[pos - 1] if pos else 0
+            if self._loads[pos] == previous:
+                del self._starts[pos]
+                del self._loads[pos]
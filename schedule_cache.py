@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Dict
+
+from models import Project
+
+
+# Rough footprint of one cached task and of one span of working or holiday
+# days, used to keep the cache within its memory bound
+TASK_ENTRY_BYTES = 200
+SPAN_BYTES = 16
+
+
+def schedule_key(project: Project) -> str:
+    """
+    Stable hash of everything calculate_schedule() reads.
+
+    Covers the start date, the levelling mode, global holidays and rules,
+    calendars, employees (work patterns, calendar, holidays) and every
+    task's inputs in order.
+    The project name does not affect the schedule and is left out.
+    """
+    digest = sha256()
+
+    def feed(*values):
+        digest.update(repr(values).encode())
+
+    def holidays(schedule):
+        return schedule.holidays.ranges(), sorted(str(rule) for rule in schedule.holiday_rules)
+
+    feed('start', project.start_day, project.resource_levelling)
+    feed('holidays', project.global_holidays.ranges(), sorted(str(rule) for rule in project.holiday_rules))
+    for name in sorted(project.calendars):
+        calendar = project.calendars[name]
+        feed('calendar', name, calendar.work_mask, *holidays(calendar))
+    for name in sorted(project.employees):
+        employee = project.employees[name]
+        feed('employee', name, employee.calendar, employee.work_mask_override, *holidays(employee))
+    for inputs in project.task_inputs():
+        feed('task', *inputs)
+    return digest.hexdigest()
+
+
+class ScheduleCache:
+    """
+    LRU cache of computed schedules, keyed by schedule_key().
+
+    A hit restores the tasks' computed fields with Project.restore_schedule()
+    instead of running the scheduler. Cached spans are shared with the
+    tasks (they are immutable), so the size kept under max_bytes is an
+    estimate of what the cache itself holds. The cache may be shared by
+    the projects of several threads; the scheduler itself runs unlocked.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (results, size)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def calculate(self, project: Project) -> bool:
+        """
+        Bring the project's schedule up to date, from the cache when possible.
+
+        Returns True on a hit. Errors from calculate_schedule() propagate and
+        nothing is cached for those inputs.
+        """
+        key = schedule_key(project)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            project.restore_schedule(entry[0])
+            return True
+
+        project.calculate_schedule()
+        self.store(key, project.schedule_results())
+        return False
+
+    def store(self, key: str, results: list):
+        """Cache a Project.schedule_results() under a key, evicting the least recently used."""
+        size = sum(TASK_ENTRY_BYTES + SPAN_BYTES * (len(row[4].spans()) + len(row[5].spans()))
+                   for row in results)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (results, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self.size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,131 @@
+import json
+import threading
+from collections import deque
+from itertools import count
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+
+class Event(NamedTuple):
+    """A server-sent event, formatted once for every subscriber."""
+    id: str
+    type: str
+    text: str  # the event in text/event-stream format
+
+
+class Subscription:
+    """
+    The events of one project waiting to be sent to one client. At most
+    max_queued wait; a client that falls further behind gets a single
+    'reset' event instead, telling it to fetch the whole state again.
+    """
+
+    def __init__(self, max_queued: int):
+        self.max_queued = max_queued
+        self._events: Deque[Event] = deque()
+        self._ready = threading.Condition()
+        self._reset: Optional[Event] = None
+
+    def push(self, event: Event):
+        with self._ready:
+            if self._reset is None and len(self._events) < self.max_queued:
+                self._events.append(event)
+            else:
+                self._events.clear()
+                self._reset = _format(event.id, 'reset', {})
+            self._ready.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """The next event, or None if there was none within timeout seconds."""
+        with self._ready:
+            self._ready.wait_for(lambda: self._events or self._reset is not None, timeout)
+            if self._reset is not None:
+                event, self._reset = self._reset, None
+                return event
+            return self._events.popleft() if self._events else None
+
+
+def _format(event_id: str, event_type: str, data: dict) -> Event:
+    text = f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+    return Event(event_id, event_type, text)
+
+
+class ScheduleEvents:
+    """
+    Fan-out of project events (schedule recalculated, inputs edited) to the
+    clients streaming them.
+
+    Event IDs are '<token>-<n>' with n increasing across all projects; the
+    last history events of each project are kept, so a client reconnecting
+    with the ID of the last event it got (Last-Event-ID) receives the ones
+    it missed, or a 'reset' event if they are no longer known. token tells
+    apart the IDs of another server run.
+    """
+
+    def __init__(self, token: str, history: int = 100, max_queued: int = 100):
+        self.token = token
+        self.max_queued = max_queued
+        self._history_size = history
+        self._counter = count(1)
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._history: Dict[str, Deque[Event]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, project_id: str, event_type: str, data: dict) -> Event:
+        """Send an event to every client of a project."""
+        with self._lock:
+            event = _format(f"{self.token}-{next(self._counter)}", event_type, data)
+            self._history.setdefault(project_id, deque(maxlen=self._history_size)).append(event)
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscription in subscribers:
+            subscription.push(event)
+        return event
+
+    def subscribe(self, project_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Start receiving a project's events, after those up to last_event_id
+        if given. Call unsubscribe() when the client goes away.
+        """
+        subscription = Subscription(self.max_queued)
+        with self._lock:
+            self._subscribers.setdefault(project_id, []).append(subscription)
+            if last_event_id:
+                history = list(self._history.get(project_id, ()))
+                ids = [event.id for event in history]
+                if last_event_id in ids:
+                    for event in history[ids.index(last_event_id) + 1:]:
+                        subscription.push(event)
+                elif not self._is_current(last_event_id, history):
+                    subscription.push(_format(last_event_id, 'reset', {}))
+        return subscription
+
+    def _is_current(self, last_event_id: str, history: List[Event]) -> bool:
+        """Whether a client that last got last_event_id has missed none of this project's events."""
+        token, _, number = last_event_id.rpartition('-')
+        if token != self.token or not number.isdigit():
+            return False
+        # An event of another project: fine if it is not older than the
+        # history of this one and nothing of this one came after it
+        number = int(number)
+        return not history or (int(history[0].id.rpartition('-')[2]) <= number
+                               and int(history[-1].id.rpartition('-')[2]) < number)
+
+    def unsubscribe(self, project_id: str, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(project_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(project_id, None)
+
+    def forget(self, project_id: str):
+        """Drop the history of a deleted project."""
+        with self._lock:
+            self._history.pop(project_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                'projects': len(self._subscribers),
+                'subscribers': sum(map(len, self._subscribers.values())),
+            }
@@ -0,0 +1,164 @@
+from bisect import bisect_left
+from itertools import count
+from types import MappingProxyType
+from typing import List, Mapping, NamedTuple, Optional, Tuple
+
+from date_ranges import DateRangeSet, DaySpans
+from holiday_rules import RecurringHolidays
+from interval_index import TaskIndex
+from models import Project, TaskTable
+
+
+class ScheduledTask(NamedTuple):
+    """One task of a snapshot, with the attribute names of Task (missing days are None)."""
+    name: str
+    dependency: object
+    assigned_to: str
+    estimated_duration: int
+    availability: int
+    contingency_margin: int
+    actual_duration: int
+    custom_start_day: Optional[int]
+    start_day: Optional[int]
+    end_day: Optional[int]
+    working_days: DaySpans
+    holiday_days: DaySpans
+    total_float: Optional[int]
+    free_float: Optional[int]
+
+
+class FrozenCalendar(NamedTuple):
+    name: str
+    work_mask: int
+    holidays: DateRangeSet
+    holiday_rules: RecurringHolidays
+
+
+class FrozenEmployee(NamedTuple):
+    name: str
+    calendar: Optional[str]
+    work_mask: int  # effective pattern, after the calendar's
+    holidays: DateRangeSet
+    holiday_rules: RecurringHolidays
+
+
+# Serial numbers of snapshots, unique within the process
+_serials = count(1)
+
+
+def _copy_holidays(schedule) -> Tuple[DateRangeSet, RecurringHolidays]:
+    # Holidays can be added in place, so the snapshot keeps copies
+    return DateRangeSet.from_ranges(schedule.holidays.ranges()), RecurringHolidays(schedule.holiday_rules.rules)
+
+
+class ScheduleSnapshot:
+    """
+    An immutable copy of a project's calculated schedule.
+
+    Readers (the Gantt view, exports) use the snapshot published last
+    instead of the project, so they never see a schedule that is being
+    recalculated and need no lock: publish() builds the next snapshot aside
+    and swaps it in with a single assignment. A snapshot offers the parts
+    of the Project interface that export_to_excel() reads.
+
+    version counts the snapshots of a project, but starts over when the
+    project is loaded again; serial is unique within the process, so it
+    identifies the schedule in cache keys.
+    """
+
+    __slots__ = ('version', 'serial', 'name', 'start_day', 'tasks', 'employees', 'calendars',
+                 'global_holidays', 'holiday_rules', '_day_range', '_task_index')
+
+    def __init__(self, project: Project, version: int):
+        self.version = version
+        self.serial = next(_serials)
+        self.name = project.name
+        self.start_day = project.start_day
+        try:
+            total_floats, free_floats = project.schedule_floats()
+        except ValueError:
+            # Broken dependencies; calculating reports them
+            total_floats = free_floats = [None] * len(project.tasks)
+
+        tasks = project.tasks
+        if isinstance(tasks, TaskTable):
+            # Read the columns directly rather than through a view per row
+            rows = zip(tasks.names, tasks.dependency, tasks.assigned_to, tasks.estimated_duration,
+                       tasks.availability, tasks.contingency_margin, tasks.actual_duration,
+                       tasks.custom_start_day, tasks.start_day, tasks.end_day,
+                       tasks.working_days, tasks.holiday_days, total_floats, free_floats)
+            self.tasks = tuple(ScheduledTask._make(row[:7] + (row[7] or None, row[8] or None, row[9] or None)
+                                                   + row[10:]) for row in rows)
+        else:
+            self.tasks = tuple(
+                ScheduledTask(task.name, task.dependency, task.assigned_to, task.estimated_duration,
+                              task.availability, task.contingency_margin, task.actual_duration,
+                              task.custom_start_day, task.start_day, task.end_day,
+                              task.working_days, task.holiday_days, total_float, free_float)
+                for task, total_float, free_float in zip(tasks, total_floats, free_floats))
+
+        self.calendars: Mapping[str, FrozenCalendar] = MappingProxyType({
+            name: FrozenCalendar(name, calendar.work_mask, *_copy_holidays(calendar))
+            for name, calendar in project.calendars.items()})
+        self.employees: Mapping[str, FrozenEmployee] = MappingProxyType({
+            name: FrozenEmployee(name, employee.calendar, employee.work_mask, *_copy_holidays(employee))
+            for name, employee in project.employees.items()})
+        self.global_holidays = DateRangeSet.from_ranges(project.global_holidays.ranges())
+        self.holiday_rules = RecurringHolidays(project.holiday_rules.rules)
+        self._day_range = project.get_day_range()
+        self._task_index: Optional[TaskIndex] = None
+
+    @property
+    def task_index(self) -> TaskIndex:
+        """Date window and assignee lookups over the tasks, built on first use."""
+        # Concurrent readers may both build it; either result is the same
+        if self._task_index is None:
+            self._task_index = TaskIndex(self.tasks)
+        return self._task_index
+
+    def get_day_range(self) -> tuple:
+        """(start day, end day) like Project.get_day_range()."""
+        return self._day_range
+
+    def schedule_floats(self):
+        """(total floats, free floats) like Project.schedule_floats()."""
+        return [task.total_float for task in self.tasks], [task.free_float for task in self.tasks]
+
+
+def publish(project: Project) -> ScheduleSnapshot:
+    """
+    Snapshot the project's current schedule and make it the one readers see.
+
+    Call with the schedule up to date and no concurrent edits of the project
+    (i.e. holding its lock); readers take project.schedule_snapshot.
+    """
+    previous = project.schedule_snapshot
+    snapshot = ScheduleSnapshot(project, previous.version + 1 if previous is not None else 1)
+    project.schedule_snapshot = snapshot
+    return snapshot
+
+
+def moved_tasks(previous: Optional[ScheduleSnapshot], snapshot: ScheduleSnapshot) -> Tuple[List[int], List[str]]:
+    """
+    What changed from one snapshot of a project to the next: the positions
+    in snapshot of the tasks that are new, whose dates (start, end, working
+    and holiday days) or floats differ, or whose position changed other than
+    by the removal of tasks before them; and the names of the tasks that
+    are gone. Tasks are matched by name.
+    """
+    if previous is None:
+        return list(range(len(snapshot.tasks))), []
+    before = {task.name: (position, task) for position, task in enumerate(previous.tasks)}
+    current = {task.name for task in snapshot.tasks}
+    removed = [name for name in before if name not in current]
+    removed_positions = sorted(before[name][0] for name in removed)
+    moved = []
+    for position, task in enumerate(snapshot.tasks):
+        old_position, old = before.get(task.name, (None, None))
+        if (old is None or position != old_position - bisect_left(removed_positions, old_position)
+                or old.start_day != task.start_day or old.end_day != task.end_day
+                or old.total_float != task.total_float or old.free_float != task.free_float
+                or old.working_days != task.working_days
+                or old.holiday_days != task.holiday_days):
+            moved.append(position)
+    return moved, removed
@@ -1,9 +1,86 @@
 // Global state
 let employees = [];
 let tasks = [];
+let calendars = []; // Shared calendars from an imported file
 let currentStep = 1;
 let dataAlreadySubmitted = false; // Track if employees/tasks already submitted to backend
 let projectCreated = false; // Track if project has been created
+let projectId = null; // ID of the project on the server
+// Employees and tasks last sent to the server (JSON by name); null = send the full list
+let submittedEmployees = null;
+let submittedTasks = null;
+// Gantt data shown (format=columns), kept current by the project's event stream
+let ganttData = null;
+let scheduleEvents = null;
+
+// URL of an API route of the current project
+function projectUrl(path = '') {
+    return `/api/projects/${projectId}${path}`;
+}
+
+// Create the project on the server, or update it once created
+async function saveProject(info) {
+    const options = {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(info)
+    };
+    if (projectId) {
+        const response = await fetch(projectUrl(), options);
+        // An idle project is evicted by the server; create it again
+        if (response.status !== 404) {
+            return response;
+        }
+        projectId = null;
+        stopFollowingSchedule();
+    }
+    const response = await fetch('/api/projects', options);
+    if (response.ok) {
+        projectId = (await response.clone().json()).project_id;
+        submittedEmployees = null;
+        submittedTasks = null;
+    }
+    return response;
+}
+
+// JSON of each item by name, to compare with later
+function itemsByName(items) {
+    return new Map(items.map(item => [item.name, JSON.stringify(item)]));
+}
+
+// Merge patch turning the submitted items into the current ones:
+// {name: item} for new or changed items, {name: null} for removed ones
+function diffByName(submitted, items) {
+    const patch = {};
+    const current = itemsByName(items);
+    submitted.forEach((json, name) => {
+        if (!current.has(name)) patch[name] = null;
+    });
+    current.forEach((json, name) => {
+        if (submitted.get(name) !== json) patch[name] = JSON.parse(json);
+    });
+    return patch;
+}
+
+// Send the items to a list route: the full list the first time, then only
+// the changes (PATCH), so an edit doesn't re-upload every row
+async function submitItems(path, key, items, submitted) {
+    let body = { [key]: items };
+    let method = 'POST';
+    if (submitted) {
+        const patch = diffByName(submitted, items);
+        if (Object.keys(patch).length === 0) {
+            return null;
+        }
+        body = { [key]: patch };
+        method = 'PATCH';
+    }
+    return fetch(projectUrl(path), {
+        method,
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+}
 
 // Utility functions
 function showMessage(message, type = 'success') {
@@ -35,9 +112,12 @@ function parseDateRanges(dateInput) {
      * Accepts formats:
      * - Individual dates: dd/mm/yyyy
      * - Date ranges: dd/mm/yyyy-dd/mm/yyyy or dd/mm/yyyy - dd/mm/yyyy
+     * - Recurring rules: yearly dd/mm, 1st Monday of May, last Monday of May, Easter+1
      * - Multiple entries separated by commas
      *
-     * Returns an array of dates in YYYY-MM-DD format.
+     * Returns an array of dates in YYYY-MM-DD format; ranges are kept
+     * compact as YYYY-MM-DD/YYYY-MM-DD instead of being expanded. Rules are
+     * passed through unchanged and validated by the server.
      */
     if (!dateInput || !dateInput.trim()) {
         return [];
@@ -51,6 +131,13 @@ function parseDateRanges(dateInput) {
     for (const entry of entries) {
         if (!entry) continue;
 
+        // Dates and ranges start with a date; everything else (including
+        // ordinal rules such as 1st Monday of May) is a recurring rule
+        if (!/^(\d{4}-\d{2}-\d{2}|\d{1,2}\/\d{1,2}\/\d{4})\b/.test(entry)) {
+            resultDates.push(entry);
+            continue;
+        }
+
         // Check if this is a date range (contains a dash)
         // Pattern: dd/mm/yyyy - dd/mm/yyyy or dd/mm/yyyy-dd/mm/yyyy
         const rangePattern = /(\d{1,2}\/\d{1,2}\/\d{4})\s*-\s*(\d{1,2}\/\d{1,2}\/\d{4})/;
@@ -81,15 +168,7 @@ function parseDateRanges(dateInput) {
                     throw new Error(`Start date ${startStr} is after end date ${endStr}`);
                 }
 
-                // Generate all dates in the range
-                let currentDate = new Date(startDate);
-                while (currentDate <= endDate) {
-                    const isoDate = convertToISODate(
-                        `${currentDate.getDate().toString().padStart(2, '0')}/${(currentDate.getMonth() + 1).toString().padStart(2, '0')}/${currentDate.getFullYear()}`
-                    );
-                    resultDates.push(isoDate);
-                    currentDate.setDate(currentDate.getDate() + 1);
-                }
+                resultDates.push(`${convertToISODate(startStr)}/${convertToISODate(endStr)}`);
             } catch (error) {
                 throw new Error(`Invalid date range '${entry}': ${error.message}`);
             }
@@ -107,8 +186,29 @@ function parseDateRanges(dateInput) {
     return resultDates;
 }
 
-// Convert YYYY-MM-DD to dd/mm/yyyy
+// Mark flat [day offset, number of days, ...] spans in a per-day array
+function markSpans(cells, spans, value) {
+    for (let i = 0; i < spans.length; i += 2) {
+        const first = Math.max(spans[i], 0);
+        const last = Math.min(spans[i] + spans[i + 1], cells.length);
+        for (let day = first; day < last; day++) {
+            if (!cells[day]) cells[day] = value;
+        }
+    }
+}
+
+// Date string of a day offset from the project start (YYYY-MM-DD)
+function offsetToISODate(startDate, offset) {
+    const day = new Date(startDate + 'T00:00:00Z');
+    day.setUTCDate(day.getUTCDate() + offset);
+    return day.toISOString().split('T')[0];
+}
+
+// Convert YYYY-MM-DD to dd/mm/yyyy (and YYYY-MM-DD/YYYY-MM-DD to dd/mm/yyyy-dd/mm/yyyy)
 function convertFromISODate(isoDate) {
+    if (/^\d{4}-\d{2}-\d{2}\/\d{4}-\d{2}-\d{2}$/.test(isoDate)) {
+        return isoDate.split('/').map(d => convertFromISODate(d)).join('-');
+    }
     const parts = isoDate.trim().split('-');
     if (parts.length !== 3) {
         return isoDate; // Return as-is if not in expected format
@@ -142,6 +242,7 @@ async function createProject() {
     const name = document.getElementById('projectName').value.trim();
     const startDate = document.getElementById('startDate').value;
     const globalHolidaysStr = document.getElementById('globalHolidays').value.trim();
+    const resourceLevelling = document.getElementById('resourceLevelling').checked;
 
     if (!name || !startDate) {
         showMessage('Please fill in all required fields', 'error');
@@ -160,10 +261,11 @@ async function createProject() {
     }
 
     try {
-        const response = await fetch('/api/project', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ name, start_date: startDate, global_holidays: globalHolidays })
+        const response = await saveProject({
+            name,
+            start_date: startDate,
+            global_holidays: globalHolidays,
+            resource_levelling: resourceLevelling
         });
 
         const data = await response.json();
@@ -221,7 +323,9 @@ function addEmployee() {
         }
     }
 
-    employees.push({ name, work_pattern: workPattern, holidays });
+    const calendar = document.getElementById('employeeCalendar').value || null;
+
+    employees.push({ name, work_pattern: workPattern, holidays, calendar });
 
     // Update display
     updateEmployeesList();
@@ -229,6 +333,7 @@ function addEmployee() {
     // Clear form
     document.getElementById('employeeName').value = '';
     document.getElementById('employeeHolidays').value = '';
+    document.getElementById('employeeCalendar').value = '';
 
     showMessage(`Employee "${name}" added!`, 'success');
 }
@@ -241,7 +346,7 @@ function updateEmployeesList() {
     } else {
         list.innerHTML = employees.map((emp, idx) =>
             `<div class="item-badge" style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                <span>${emp.name} (Works: ${emp.work_pattern.map(d => ['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][d]).join(', ')})</span>
+                <span>${emp.name} (Works: ${emp.work_pattern.map(d => ['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][d]).join(', ')}${emp.calendar ? `; Calendar: ${emp.calendar}` : ''})</span>
                 <div>
                     <button onclick="editEmployee(${idx})" class="btn-small" style="margin-left: 5px;">Edit</button>
                     <button onclick="deleteEmployee(${idx})" class="btn-small btn-danger" style="margin-left: 5px;">Delete</button>
@@ -256,11 +361,20 @@ function updateEmployeesList() {
         employees.map(emp => `<option value="${emp.name}">${emp.name}</option>`).join('');
 }
 
+// Fill the calendar dropdown; it is only shown when calendars were imported
+function updateCalendarSelect() {
+    const select = document.getElementById('employeeCalendar');
+    select.innerHTML = '<option value="">None</option>' +
+        calendars.map(cal => `<option value="${cal.name}">${cal.name}</option>`).join('');
+    document.getElementById('employeeCalendarGroup').style.display = calendars.length > 0 ? 'block' : 'none';
+}
+
 function editEmployee(idx) {
     const emp = employees[idx];
 
     // Populate the form with employee data
     document.getElementById('employeeName').value = emp.name;
+    document.getElementById('employeeCalendar').value = emp.calendar || '';
     // Convert holidays from YYYY-MM-DD to dd/mm/yyyy for display
     const holidaysDisplay = emp.holidays.map(d => convertFromISODate(d)).join(', ');
     document.getElementById('employeeHolidays').value = holidaysDisplay;
@@ -296,15 +410,15 @@ async function submitEmployees() {
     }
 
     try {
-        const response = await fetch('/api/employees', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ employees })
-        });
+        const response = await submitItems('/employees', 'employees', employees, submittedEmployees);
+        if (!response) {
+            return true; // Nothing changed
+        }
 
         const data = await response.json();
 
         if (response.ok) {
+            submittedEmployees = itemsByName(employees);
             return true;
         } else {
             showMessage(data.error || 'Error adding employees', 'error');
@@ -323,7 +437,8 @@ function addTask() {
     const estimatedDuration = parseInt(document.getElementById('taskDuration').value);
     const availability = parseInt(document.getElementById('taskAvailability').value);
     const contingencyMargin = parseInt(document.getElementById('taskContingency').value);
-    const dependency = document.getElementById('taskDependency').value;
+    // Any number of antecedents can be selected
+    const dependencies = Array.from(document.getElementById('taskDependency').selectedOptions, option => option.value);
     const customStartDate = document.getElementById('taskCustomStartDate').value;
 
     if (!name || !assignedTo || !estimatedDuration) {
@@ -347,7 +462,7 @@ function addTask() {
         estimated_duration: estimatedDuration,
         availability,
         contingency_margin: contingencyMargin,
-        dependency: dependency || null,
+        dependency: dependencies.length > 1 ? dependencies : (dependencies[0] || null),
         custom_start_date: customStartDate || null
     };
 
@@ -361,7 +476,7 @@ function addTask() {
     document.getElementById('taskDuration').value = '1';
     document.getElementById('taskAvailability').value = '100';
     document.getElementById('taskContingency').value = '0';
-    document.getElementById('taskDependency').value = '';
+    Array.from(document.getElementById('taskDependency').options).forEach(option => option.selected = false);
     document.getElementById('taskCustomStartDate').value = '';
 
     showMessage(`Task "${name}" added!`, 'success');
@@ -384,10 +499,9 @@ function updateTasksList() {
         ).join('');
     }
 
-    // Update dependency dropdown
+    // Update dependency list (nothing selected = no dependency)
     const select = document.getElementById('taskDependency');
-    select.innerHTML = '<option value="">No dependency</option>' +
-        tasks.map(task => `<option value="${task.name}">${task.name}</option>`).join('');
+    select.innerHTML = tasks.map(task => `<option value="${task.name}">${task.name}</option>`).join('');
 }
 
 function editTask(idx) {
@@ -399,7 +513,10 @@ function editTask(idx) {
     document.getElementById('taskDuration').value = task.estimated_duration;
     document.getElementById('taskAvailability').value = task.availability;
     document.getElementById('taskContingency').value = task.contingency_margin;
-    document.getElementById('taskDependency').value = task.dependency || '';
+    const dependencies = [].concat(task.dependency || []);
+    Array.from(document.getElementById('taskDependency').options).forEach(option => {
+        option.selected = dependencies.includes(option.value);
+    });
     document.getElementById('taskCustomStartDate').value = task.custom_start_date || '';
 
     // Remove the task from the array (will be re-added when user clicks "Add Task")
@@ -427,15 +544,15 @@ async function submitTasks() {
     }
 
     try {
-        const response = await fetch('/api/tasks', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ tasks })
-        });
+        const response = await submitItems('/tasks', 'tasks', tasks, submittedTasks);
+        if (!response) {
+            return true; // Nothing changed
+        }
 
         const data = await response.json();
 
         if (response.ok) {
+            submittedTasks = itemsByName(tasks);
             return true;
         } else {
             showMessage(data.error || 'Error adding tasks', 'error');
@@ -460,7 +577,7 @@ async function calculateAndView() {
 
     try {
         // Calculate schedule
-        const calcResponse = await fetch('/api/calculate', {
+        const calcResponse = await fetch(projectUrl('/calculate'), {
             method: 'POST'
         });
 
@@ -471,25 +588,93 @@ async function calculateAndView() {
             return;
         }
 
-        // Get Gantt data
-        const ganttResponse = await fetch('/api/gantt');
-        const ganttData = await ganttResponse.json();
+        // Get Gantt data (compact columnar layout)
+        const ganttResponse = await fetch(projectUrl('/gantt?format=columns'));
+        const data = await ganttResponse.json();
 
         if (ganttResponse.ok) {
+            ganttData = data;
             displayGanttChart(ganttData);
+            followSchedule();
             goToStep(4);
             showMessage('Schedule calculated successfully!', 'success');
         } else {
-            showMessage(ganttData.error || 'Error loading Gantt chart', 'error');
+            showMessage(data.error || 'Error loading Gantt chart', 'error');
         }
     } catch (error) {
         showMessage('Network error: ' + error.message, 'error');
     }
 }
 
-// Step 4: Display Gantt Chart
+// Follow the project's server-sent events, so that the chart stays current
+// when the schedule is recalculated elsewhere (another tab, a script)
+function followSchedule() {
+    if (scheduleEvents) return;
+    scheduleEvents = new EventSource(projectUrl('/events'));
+    scheduleEvents.addEventListener('schedule', event => {
+        const change = JSON.parse(event.data);
+        if (!ganttData || change.version <= ganttData.version) return;
+        if (applyScheduleChange(ganttData, change)) {
+            displayGanttChart(ganttData);
+        } else {
+            reloadGanttChart();
+        }
+    });
+    // Events were missed: fetch the whole chart again
+    scheduleEvents.addEventListener('reset', () => reloadGanttChart());
+    scheduleEvents.addEventListener('deleted', () => stopFollowingSchedule());
+}
+
+function stopFollowingSchedule() {
+    if (scheduleEvents) {
+        scheduleEvents.close();
+        scheduleEvents = null;
+    }
+    ganttData = null;
+}
+
+async function reloadGanttChart() {
+    const response = await fetch(projectUrl('/gantt?format=columns'));
+    if (response.ok) {
+        ganttData = await response.json();
+        displayGanttChart(ganttData);
+    }
+}
+
+// Apply the moved and removed tasks of a 'schedule' event to Gantt data in
+// place; false if it can't be (another start date, or new tasks)
+function applyScheduleChange(data, change) {
+    if (change.start_date !== data.start_date) return false;
+    const columns = data.columns;
+    if (change.removed.length) {
+        const removed = new Set(change.removed);
+        const kept = columns.name.map((name, row) => row).filter(row => !removed.has(columns.name[row]));
+        // The tasks after a removed one move up; moved tasks get their index below
+        const removedIndexes = columns.index.filter((index, row) => removed.has(columns.name[row]));
+        for (const key of Object.keys(columns)) {
+            columns[key] = kept.map(row => columns[key][row]);
+        }
+        columns.index = columns.index.map(index => index - removedIndexes.filter(other => other < index).length);
+    }
+    const rows = new Map(columns.name.map((name, row) => [name, row]));
+    const moved = change.moved;
+    if (moved.name.some(name => !rows.has(name))) return false;
+    moved.name.forEach((name, i) => {
+        const row = rows.get(name);
+        for (const key of ['index', 'start', 'end', 'working_spans', 'holiday_spans', 'total_float', 'free_float']) {
+            columns[key][row] = moved[key][i];
+        }
+    });
+    data.version = change.version;
+    data.end_date = change.end_date;
+    data.total = change.total;
+    return true;
+}
+
+// Step 4: Display Gantt Chart (data in the format=columns layout)
 function displayGanttChart(data) {
     const container = document.getElementById('ganttChart');
+    const columns = data.columns;
 
     // Parse dates
     const startDate = new Date(data.start_date);
@@ -503,11 +688,13 @@ function displayGanttChart(data) {
         currentDate.setDate(currentDate.getDate() + 1);
     }
 
-    // Sort tasks by start date (earliest first)
-    const sortedTasks = [...data.tasks].sort((a, b) => {
-        if (!a.start_date) return 1;  // Tasks without start date go to end
-        if (!b.start_date) return -1;
-        return new Date(a.start_date) - new Date(b.start_date);
+    // Sort rows by start date (earliest first)
+    const rows = columns.name.map((_, row) => row).sort((a, b) => {
+        const startA = columns.start[a];
+        const startB = columns.start[b];
+        if (startA === null) return startB === null ? 0 : 1;  // Tasks without start date go to end
+        if (startB === null) return -1;
+        return startA - startB;
     });
 
     // Build table
@@ -521,6 +708,7 @@ function displayGanttChart(data) {
     html += '<th>Actual Days</th>';
     html += '<th>Start Date</th>';
     html += '<th>End Date</th>';
+    html += '<th>Float</th>';
 
     dates.forEach(date => {
         const dateStr = `${date.getMonth() + 1}/${date.getDate()}`;
@@ -531,31 +719,26 @@ function displayGanttChart(data) {
     html += '</tr>';
 
     // Task rows
-    sortedTasks.forEach(task => {
-        html += '<tr>';
-        html += `<td>${task.name}</td>`;
-        html += `<td>${task.assigned_to}</td>`;
-        html += `<td>${task.estimated_duration}</td>`;
-        html += `<td>${task.actual_duration}</td>`;
-        html += `<td>${task.start_date || ''}</td>`;
-        html += `<td>${task.end_date || ''}</td>`;
-
-        const workingDatesSet = new Set(task.working_dates);
-        const holidayDatesSet = new Set(task.holiday_dates);
-
-        dates.forEach(date => {
-            const dateStr = date.toISOString().split('T')[0];
-            const isWorking = workingDatesSet.has(dateStr);
-            const isHoliday = holidayDatesSet.has(dateStr);
-
-            let cellClass = 'date-cell';
-            if (isWorking) {
-                cellClass += ' working';
-            } else if (isHoliday) {
-                cellClass += ' holiday';
-            }
-
-            html += `<td class="${cellClass}"></td>`;
+    const cellClasses = ['date-cell', 'date-cell working', 'date-cell holiday'];
+    rows.forEach(row => {
+        const start = columns.start[row];
+        const end = columns.end[row];
+        // Critical tasks (no float) are highlighted
+        html += columns.total_float[row] === 0 ? '<tr class="critical">' : '<tr>';
+        html += `<td>${columns.name[row]}</td>`;
+        html += `<td>${columns.assigned_to[row]}</td>`;
+        html += `<td>${columns.estimated_duration[row]}</td>`;
+        html += `<td>${columns.actual_duration[row]}</td>`;
+        html += `<td>${start === null ? '' : offsetToISODate(data.start_date, start)}</td>`;
+        html += `<td>${end === null ? '' : offsetToISODate(data.start_date, end)}</td>`;
+        html += `<td>${columns.total_float[row] ?? ''}</td>`;
+
+        // 1 = working day, 2 = holiday (working wins)
+        const cells = new Uint8Array(dates.length);
+        markSpans(cells, columns.working_spans[row], 1);
+        markSpans(cells, columns.holiday_spans[row], 2);
+        cells.forEach(cell => {
+            html += `<td class="${cellClasses[cell]}"></td>`;
         });
 
         html += '</tr>';
@@ -581,28 +764,42 @@ async function exportToExcel() {
     const filename = userFilename.trim() || defaultFilename;
 
     try {
-        const response = await fetch('/api/export', {
+        // The export runs in the background on the server; poll until done
+        const response = await fetch(projectUrl('/export/jobs'), {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ filename })
         });
-
-        if (response.ok) {
-            const blob = await response.blob();
-            const url = window.URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            // Ensure .xlsx extension for download
-            a.download = filename.endsWith('.xlsx') ? filename : filename + '.xlsx';
-            document.body.appendChild(a);
-            a.click();
-            window.URL.revokeObjectURL(url);
-            document.body.removeChild(a);
-            showMessage('Excel file downloaded successfully!', 'success');
-        } else {
-            const data = await response.json();
-            showMessage(data.error || 'Error exporting to Excel', 'error');
+        let job = await response.json();
+        if (!response.ok) {
+            showMessage(job.error || 'Error exporting to Excel', 'error');
+            return;
+        }
+        const jobUrl = response.headers.get('Location');
+        while (job.status === 'queued' || job.status === 'running') {
+            showMessage(`Exporting to Excel... ${job.progress}%`, 'info');
+            await new Promise(resolve => setTimeout(resolve, 500));
+            const statusResponse = await fetch(jobUrl);
+            job = await statusResponse.json();
+            if (!statusResponse.ok) {
+                showMessage(job.error || 'Error exporting to Excel', 'error');
+                return;
+            }
+        }
+        if (job.status === 'failed') {
+            showMessage(job.error || 'Error exporting to Excel', 'error');
+            return;
         }
+
+        // Let the browser download the finished workbook
+        const a = document.createElement('a');
+        a.href = jobUrl + '/download';
+        // Ensure .xlsx extension for download
+        a.download = filename.endsWith('.xlsx') ? filename : filename + '.xlsx';
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+        showMessage('Excel file downloaded successfully!', 'success');
     } catch (error) {
         showMessage('Network error: ' + error.message, 'error');
     }
@@ -615,10 +812,18 @@ async function resetProject() {
     }
 
     try {
-        await fetch('/api/reset', { method: 'POST' });
+        stopFollowingSchedule();
+        if (projectId) {
+            await fetch(projectUrl(), { method: 'DELETE' });
+            projectId = null;
+        }
+        submittedEmployees = null;
+        submittedTasks = null;
 
         employees = [];
         tasks = [];
+        calendars = [];
+        updateCalendarSelect();
         currentStep = 1;
         dataAlreadySubmitted = false; // Reset flag
         projectCreated = false; // Reset flag
@@ -628,6 +833,7 @@ async function resetProject() {
         const today = new Date().toISOString().split('T')[0];
         document.getElementById('startDate').value = today;
         document.getElementById('globalHolidays').value = '';
+        document.getElementById('resourceLevelling').checked = false;
         document.getElementById('nextToStep2').style.display = 'none';
 
         // Reset button text
@@ -718,14 +924,12 @@ async function populateFromImport(data) {
     }
 
     // Create the project on backend
-    const projectResponse = await fetch('/api/project', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-            name: projectInfo.name,
-            start_date: projectInfo.start_date,
-            global_holidays: projectInfo.global_holidays || []
-        })
+    const projectResponse = await saveProject({
+        name: projectInfo.name,
+        start_date: projectInfo.start_date,
+        global_holidays: projectInfo.global_holidays || [],
+        calendars: projectInfo.calendars || [],
+        resource_levelling: document.getElementById('resourceLevelling').checked
     });
 
     if (!projectResponse.ok) {
@@ -734,11 +938,13 @@ async function populateFromImport(data) {
     }
 
     // Step 2: Add employees
+    calendars = projectInfo.calendars || [];
+    updateCalendarSelect();
     employees = data.employees;
     updateEmployeesList();
 
     // Submit employees to backend
-    const employeesResponse = await fetch('/api/employees', {
+    const employeesResponse = await fetch(projectUrl('/employees'), {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ employees })
@@ -748,13 +954,14 @@ async function populateFromImport(data) {
         const errorData = await employeesResponse.json();
         throw new Error(errorData.error || 'Failed to add employees');
     }
+    submittedEmployees = itemsByName(employees);
 
     // Step 3: Add tasks
     tasks = data.tasks;
     updateTasksList();
 
     // Submit tasks to backend
-    const tasksResponse = await fetch('/api/tasks', {
+    const tasksResponse = await fetch(projectUrl('/tasks'), {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ tasks })
@@ -764,6 +971,7 @@ async function populateFromImport(data) {
         const errorData = await tasksResponse.json();
         throw new Error(errorData.error || 'Failed to add tasks');
     }
+    submittedTasks = itemsByName(tasks);
 
     // Mark data as already submitted since we sent it to backend
     dataAlreadySubmitted = true;
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test the NumPy batch scheduling engine against the task loop."""
+
+from datetime import datetime
+import batch_scheduler
+from conftest import make_project, schedule_rows
+from models import Task, Employee
+
+
+def _make_project(use_table=False):
+    employees = []
+    for idx in range(6):
+        employee = Employee(f"Emp {idx}")
+        if idx % 2:
+            employee.set_work_pattern([0, 1, 2, 3])
+        if idx % 3 == 0:
+            employee.add_holiday(f"2025-03-{10 + idx:02d}")
+        employees.append(employee)
+    tasks = []
+    for idx in range(300):
+        task = Task(f"Task {idx}", 1 + idx * 7 % 11, f"Emp {idx % 6}")
+        if idx and idx % 9:
+            task.dependency = f"Task {idx * 5 // 7}"
+        task.availability = (100, 80, 50, 30)[idx % 4]
+        task.contingency_margin = (0, 10, 25)[idx % 3]
+        if idx % 37 == 0:
+            task.custom_start_date = datetime(2025, 4, 1)
+        tasks.append(task)
+    project = make_project("Batch Test", employees, tasks, use_table)
+    project.add_global_holiday_range("2025-02-03", "2025-02-07")
+    project.add_global_holiday_rule("Easter+1")
+    return project
+
+
+def test_batch_matches_loop(use_table):
+    """The batch engine gives the same schedule as rescheduling task by task."""
+
+    print("\nTesting batch engine against the task loop...")
+
+    if not batch_scheduler.available():
+        print("   NumPy not installed, skipped")
+        return
+
+    looped = _make_project(use_table)
+    looped.batch_engine = False
+    looped.calculate_schedule()
+
+    batched = _make_project(use_table)
+    batched.BATCH_MIN_TASKS = 1
+    batched.calculate_schedule()
+    assert schedule_rows(batched) == schedule_rows(looped)
+
+    # Later edits reschedule incrementally on top of the batch result
+    for project in (looped, batched):
+        project.tasks[0].estimated_duration = 20
+        project.employees["Emp 1"].add_holiday("2025-05-05")
+        project.calculate_schedule()
+    assert schedule_rows(batched) == schedule_rows(looped)
+    print("   Test passed!")
+
+
+def test_batch_falls_back_to_loop():
+    """Without NumPy, or with invalid inputs, the task loop does the work."""
+
+    print("\nTesting batch engine fallback...")
+
+    numpy = batch_scheduler.np
+    batch_scheduler.np = None
+    try:
+        project = _make_project()
+        project.BATCH_MIN_TASKS = 1
+        project.calculate_schedule()
+        assert all(task.end_date is not None for task in project.tasks)
+    finally:
+        batch_scheduler.np = numpy
+
+    # Errors are reported exactly as the task loop reports them
+    project = _make_project()
+    project.BATCH_MIN_TASKS = 1
+    project.tasks[10].assigned_to = "Nobody"
+    try:
+        project.calculate_schedule()
+        assert False, "Should have failed with an unknown employee"
+    except ValueError as e:
+        assert str(e) == "Employee 'Nobody' not found"
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    for use_table in (False, True):
+        test_batch_matches_loop(use_table)
+    test_batch_falls_back_to_loop()
+
+    print("\n" + "=" * 60)
+    print("ALL BATCH ENGINE TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Test shared work calendars and their export/import."""
+
+import os
+from datetime import datetime
+from conftest import make_project
+from models import Employee, WorkCalendar
+from excel_export import export_to_excel
+from excel_import import import_from_excel
+
+
+def _make_project():
+    north = WorkCalendar("North")
+    north.add_holiday("2025-01-08")
+    south = WorkCalendar("South", [0, 1, 2, 3])  # Mon-Thu
+    south.add_holiday_rule("yearly 09/01")
+    employees = [("Alice", "North"), ("Bob", "North"), ("Carol", "South"), ("Dave", None)]
+    return make_project("Calendar Test", [Employee(name, calendar) for name, calendar in employees],
+                        [(f"{name} Task", 5, name, None) for name, _ in employees], calendars=[north, south])
+
+
+def test_shared_calendar_schedule():
+    """Employees follow their calendar, with personal overrides on top."""
+
+    print("\nTesting scheduling with shared calendars...")
+
+    project = _make_project()
+    project.employees["Bob"].add_holiday("2025-01-09")
+    project.calculate_schedule()
+    tasks = {task.name: task for task in project.tasks}
+
+    # North: 8 Jan off
+    assert tasks["Alice Task"].end_date == datetime(2025, 1, 13)
+    assert tasks["Alice Task"].holiday_dates == [datetime(2025, 1, 8)]
+    # Bob also takes 9 Jan off personally
+    assert tasks["Bob Task"].end_date == datetime(2025, 1, 14)
+    assert tasks["Bob Task"].holiday_dates == [datetime(2025, 1, 8), datetime(2025, 1, 9)]
+    # South: Mon-Thu, 9 Jan off every year
+    assert tasks["Carol Task"].end_date == datetime(2025, 1, 14)
+    assert tasks["Carol Task"].holiday_dates == [datetime(2025, 1, 9)]
+    # No calendar: project defaults
+    assert tasks["Dave Task"].end_date == datetime(2025, 1, 10)
+
+    # One index per calendar and pattern, shared by Alice and Bob
+    assert len(project._calendar_indexes) == 3
+    assert project.employees["Alice"].work_pattern == [0, 1, 2, 3, 4]
+    assert project.employees["Carol"].work_pattern == [0, 1, 2, 3]
+    print("   Test passed!")
+
+
+def test_calendar_change_reschedules_its_employees():
+    """Editing a calendar moves only the tasks of employees on it."""
+
+    print("\nTesting calendar edits...")
+
+    project = _make_project()
+    project.calculate_schedule()
+    tasks = {task.name: task for task in project.tasks}
+
+    recomputed = []
+    original = project.calculate_task_schedule
+
+    def tracking_schedule(task, earliest_start):
+        recomputed.append(task.name)
+        original(task, earliest_start)
+
+    project.calculate_task_schedule = tracking_schedule
+
+    project.calendars["North"].add_holiday("2025-01-10")
+    project.calculate_schedule()
+    assert sorted(recomputed) == ["Alice Task", "Bob Task"], f"Unexpected recompute {recomputed}"
+    assert tasks["Alice Task"].end_date == datetime(2025, 1, 14)
+
+    # A personal pattern overrides the calendar's
+    recomputed.clear()
+    project.employees["Carol"].set_work_pattern([0, 1, 2, 3, 4])
+    project.calculate_schedule()
+    assert recomputed == ["Carol Task"], f"Unexpected recompute {recomputed}"
+    assert tasks["Carol Task"].end_date == datetime(2025, 1, 13)
+
+    # Changing the calendar's pattern no longer affects Carol
+    recomputed.clear()
+    project.calendars["South"].set_work_pattern([0, 1, 2])
+    project.calculate_schedule()
+    assert tasks["Carol Task"].end_date == datetime(2025, 1, 13)
+
+    # An unknown calendar is reported
+    project.employees["Dave"].set_calendar("West")
+    try:
+        project.calculate_schedule()
+        assert False, "Should have failed with an unknown calendar"
+    except ValueError as e:
+        assert str(e) == "Calendar 'West' not found for employee 'Dave'"
+    print("   Test passed!")
+
+
+def test_calendar_export_import():
+    """Calendars and calendar assignments survive an export/import round trip."""
+
+    print("\nTesting calendar export/import...")
+
+    project = _make_project()
+    project.calculate_schedule()
+    filename = "test_calendars.xlsx"
+    export_to_excel(project, filename)
+
+    try:
+        data = import_from_excel(filename)
+    finally:
+        os.remove(filename)
+
+    calendars = {cal['name']: cal for cal in data['project_info']['calendars']}
+    assert calendars["North"] == {'name': "North", 'work_pattern': [0, 1, 2, 3, 4], 'holidays': ["2025-01-08"]}
+    assert calendars["South"] == {'name': "South", 'work_pattern': [0, 1, 2, 3], 'holidays': ["yearly 09/01"]}
+
+    employees = {emp['name']: emp for emp in data['employees']}
+    assert employees["Alice"]['calendar'] == "North"
+    assert employees["Carol"]['calendar'] == "South"
+    assert employees["Dave"]['calendar'] is None
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_shared_calendar_schedule()
+    test_calendar_change_reschedules_its_employees()
+    test_calendar_export_import()
+
+    print("\n" + "=" * 60)
+    print("ALL CALENDAR TESTS PASSED!")
+    print("=" * 60)
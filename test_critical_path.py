@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Test multiple predecessors and the critical path (total and free float)."""
+
+import os
+from datetime import datetime
+from openpyxl import load_workbook
+import batch_scheduler
+from conftest import make_project
+from models import Employee
+from excel_export import export_to_excel
+from excel_import import import_from_excel
+
+
+def _make_project(use_table=False):
+    alice = Employee("Alice")
+    alice.add_holiday("2025-01-14")
+    return make_project("Critical Path Test", [alice, "Bob"], [
+        ("Design", 3, "Alice", None),
+        ("Backend", 5, "Alice", ["Design"]),
+        ("Frontend", 2, "Bob", "Design"),
+        ("Review", 1, "Bob", "Frontend"),
+        ("Release", 1, "Bob", ["Backend", "Review"]),
+        ("Docs", 2, "Bob", None)], use_table)
+
+
+def test_multiple_predecessors(use_table):
+    """A task starts after the last of its antecedents, with every engine."""
+
+    print("\nTesting multiple predecessors...")
+
+    project = _make_project(use_table)
+    project.calculate_schedule()
+    tasks = {task.name: task for task in project.tasks}
+    # A single name is kept as a string, several as a tuple
+    assert tasks["Backend"].dependency == "Design"
+    assert tasks["Release"].dependency == ("Backend", "Review")
+    assert tasks["Backend"].end_date == datetime(2025, 1, 16)  # skips Alice's holiday
+    assert tasks["Review"].end_date == datetime(2025, 1, 13)
+    assert tasks["Release"].start_date == datetime(2025, 1, 17)
+
+    # Only moving the later antecedent moves the task
+    tasks["Review"].estimated_duration = 3
+    project.calculate_schedule()
+    assert tasks["Release"].start_date == datetime(2025, 1, 17)
+    tasks["Review"].estimated_duration = 5
+    project.calculate_schedule()
+    assert tasks["Release"].start_date == datetime(2025, 1, 20)
+
+    tasks["Design"].dependency = ["Docs", "Release"]
+    try:
+        project.calculate_schedule()
+        assert False, "Should have detected the cycle"
+    except ValueError as e:
+        cycle = str(e).split(": ")[1].split(" -> ")
+        assert cycle[0] == cycle[-1] and sorted(cycle[1:]) == ["Backend", "Design", "Release"]
+
+    # The NumPy engine combines several antecedents like the task loop does
+    if batch_scheduler.available():
+        schedules = []
+        for batch_engine in (False, True):
+            project = make_project("Batch", [f"Emp {idx}" for idx in range(4)], [
+                (f"Task {idx}", 1 + idx * 7 % 9, f"Emp {idx % 4}",
+                 [f"Task {pred}" for pred in (idx // 2, idx * 3 // 4, idx - 1) if 0 <= pred < idx])
+                for idx in range(200)], use_table)
+            project.BATCH_MIN_TASKS = 1
+            project.batch_engine = batch_engine
+            project.calculate_schedule()
+            schedules.append(project.schedule_results())
+        assert schedules[0] == schedules[1]
+    print("   Test passed!")
+
+
+def test_floats(use_table):
+    """Total and free float follow a backward pass over the schedule."""
+
+    print("\nTesting total and free float...")
+
+    project = _make_project(use_table)
+    project.calculate_schedule()
+    total_floats, free_floats = project.schedule_floats()
+    floats = {task.name: (total, free) for task, total, free in zip(project.tasks, total_floats, free_floats)}
+    assert floats == {
+        "Design": (0, 0),
+        "Backend": (0, 0),
+        # Review may slip to the 16th; Frontend would push Review along
+        "Frontend": (3, 0),
+        "Review": (3, 3),
+        "Release": (0, 0),
+        # Bob's working days from the 8th to the project end on the 17th
+        "Docs": (8, 8),
+    }
+    critical = [task.name for task, total in zip(project.tasks, total_floats) if total == 0]
+    assert critical == ["Design", "Backend", "Release"]
+
+    # Cached until the schedule changes
+    assert project.schedule_floats() is project.schedule_floats()
+    project.tasks[3].estimated_duration = 5  # Review now ends after Backend
+    project.calculate_schedule()
+    total_floats, _ = project.schedule_floats()
+    assert [task.name for task, total in zip(project.tasks, total_floats) if total == 0] == \
+        ["Design", "Frontend", "Review", "Release"]
+    print("   Test passed!")
+
+
+def test_export_import_multiple_predecessors():
+    """The Depends On column lists several antecedents; the floats get a sheet."""
+
+    print("\nTesting export and import of multiple predecessors...")
+
+    project = _make_project()
+    project.calculate_schedule()
+    filename = "test_critical_path.xlsx"
+    export_to_excel(project, filename)
+
+    try:
+        gantt = load_workbook(filename)["Gantt Chart"]
+        assert gantt["B7"].value == "Backend; Review"
+        sheet = load_workbook(filename)["Critical Path"]
+        rows = [[cell.value for cell in row] for row in sheet.iter_rows(min_row=2, max_col=6)]
+        assert rows[2] == ["Frontend", "09/01/2025", "10/01/2025", 3, 0, None]
+        assert rows[4] == ["Release", "17/01/2025", "17/01/2025", 0, 0, "Yes"]
+        data = import_from_excel(filename)
+    finally:
+        os.remove(filename)
+
+    dependencies = {task['name']: task['dependency'] for task in data['tasks']}
+    assert dependencies["Release"] == ["Backend", "Review"]
+    assert dependencies["Backend"] == "Design"
+    assert dependencies["Docs"] is None
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    for use_table in (False, True):
+        test_multiple_predecessors(use_table)
+    for use_table in (False, True):
+        test_floats(use_table)
+    test_export_import_multiple_predecessors()
+
+    print("\n" + "=" * 60)
+    print("ALL CRITICAL PATH TESTS PASSED!")
+    print("=" * 60)
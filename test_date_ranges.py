@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Test date range parsing functionality."""
 
-from models import parse_date_ranges
+from datetime import date
+from models import parse_date_ranges, parse_holiday_ranges
+from date_ranges import DateRangeSet, parse_iso_ranges
 from excel_import import _parse_date_ranges as excel_parse_date_ranges
+from excel_import import _parse_holiday_ranges as excel_parse_holiday_ranges
 
 
 def test_parse_date_ranges():
@@ -85,5 +88,52 @@ def test_parse_date_ranges():
     print("=" * 60)
 
 
+def test_holiday_range_storage():
+    """Test that holidays are stored as merged ranges."""
+
+    print("Testing DateRangeSet...")
+    print("-" * 60)
+
+    def day(iso):
+        return date.fromisoformat(iso).toordinal()
+
+    # Overlapping and adjacent ranges are merged
+    holidays = parse_holiday_ranges("01/07/2024-31/12/2024, 25/12/2024, 01/01/2025-05/01/2025, 10/01/2025")
+    print(f"Ranges: {holidays.iso_entries()}")
+    assert holidays.iso_entries() == ['2024-07-01/2025-01-05', '2025-01-10'], f"Got {holidays.iso_entries()}"
+    assert len(holidays) == 190, f"Expected 190 days, got {len(holidays)}"
+    assert day('2024-09-15') in holidays
+    assert '2025-01-10' in holidays
+    assert day('2025-01-06') not in holidays
+    print("✓ Merged range test passed\n")
+
+    # Adding a day that bridges two ranges joins them
+    holidays.add_range('2025-01-06', '2025-01-09')
+    assert holidays.ranges() == [(day('2024-07-01'), day('2025-01-10'))], f"Got {holidays}"
+    print("✓ Bridging range test passed\n")
+
+    # Symmetric difference works on range boundaries
+    before = parse_iso_ranges(['2025-03-01/2025-03-10'])
+    after = parse_iso_ranges(['2025-03-05/2025-03-15'])
+    changed = before.symmetric_difference(after)
+    assert changed.iso_entries() == ['2025-03-01/2025-03-04', '2025-03-11/2025-03-15'], f"Got {changed}"
+    assert not before.symmetric_difference(before.copy())
+    print("✓ Symmetric difference test passed\n")
+
+    # Compact API form round-trips
+    entries = ['2024-12-25', '2024-12-28/2024-12-30']
+    assert parse_iso_ranges(entries).iso_entries() == entries
+    assert parse_iso_ranges(entries) == DateRangeSet.from_ranges([(day('2024-12-25'), day('2024-12-25')),
+                                                                  (day('2024-12-28'), day('2024-12-30'))])
+    print("✓ ISO round-trip test passed\n")
+
+    # The Excel import keeps ranges compact
+    result = excel_parse_holiday_ranges("25/12/2024, 28/12/2024-30/12/2024, 31/12/2024")
+    print(f"Excel import output: {result}")
+    assert result == ['2024-12-25', '2024-12-28/2024-12-31'], f"Got {result}"
+    print("✓ Excel import range test passed\n")
+
+
 if __name__ == '__main__':
     test_parse_date_ranges()
+    test_holiday_range_storage()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Test background Excel exports."""
+
+import io
+import os
+import time
+from datetime import datetime
+from openpyxl import load_workbook
+from models import Project, Task, Employee
+from export_jobs import ExportJobs, ExportQueueFullError
+from schedule_snapshot import publish
+
+
+def _make_snapshot():
+    project = Project("Export Job Test", datetime(2025, 1, 6))  # Monday
+    project.add_employee(Employee("Alice"))
+    for idx in range(40):
+        task = Task(f"Task {idx}", 1 + idx % 3, "Alice")
+        task.dependency = f"Task {idx - 1}" if idx else None
+        project.add_task(task)
+    project.calculate_schedule()
+    return project, publish(project)
+
+
+def _wait(jobs, job):
+    deadline = time.monotonic() + 60
+    while jobs.get(job.id).status in ('queued', 'running'):
+        assert time.monotonic() < deadline, "Export did not finish"
+        time.sleep(0.05)
+    return jobs.get(job.id)
+
+
+def test_jobs_share_and_expire():
+    """Jobs for one key are shared, report progress and expire with their workbook."""
+
+    print("\nTesting export jobs...")
+
+    now = [0.0]
+    jobs = ExportJobs(workers=1, max_pending=4, expire_after=60, clock=lambda: now[0])
+    try:
+        _, snapshot = _make_snapshot()
+        job = jobs.submit("v1", snapshot, "plan.xlsx")
+        assert jobs.submit("v1", snapshot, "other.xlsx") is job
+        job = _wait(jobs, job)
+        assert job.status == 'done', job.error
+        assert job.to_dict()['progress'] == 100 and job.written == job.total == 40
+        with job.open() as reader, job.open() as other:
+            data = reader.read()
+            assert len(data) == job.size and other.read() == data
+        assert load_workbook(io.BytesIO(data))["Gantt Chart"].cell(row=3, column=1).value == "Task 0"
+        assert jobs.submit("v1", snapshot, "plan.xlsx") is job
+
+        # A download in progress keeps the workbook past the expiry
+        reader = job.open()
+        reader.read(100)
+        now[0] += 61
+        assert jobs.get(job.id) is None and not job.result.closed
+        assert job.open() is None
+        assert len(reader.read()) == job.size - 100
+        reader.close()
+        assert job.result.closed
+        assert jobs.stats()['expired'] == 1
+        assert jobs.submit("v1", snapshot, "plan.xlsx") is not job
+
+        full = ExportJobs(max_pending=0)
+        try:
+            full.submit("v1", snapshot, "plan.xlsx")
+            assert False, "Should have refused the job"
+        except ExportQueueFullError:
+            pass
+        finally:
+            full.shutdown()
+    finally:
+        jobs.shutdown()
+    print("   Test passed!")
+
+
+def test_export_job_routes():
+    """A background export is polled and downloaded through the API."""
+
+    print("\nTesting export job routes...")
+
+    import app as server
+
+    project, _ = _make_snapshot()
+    project_id = server.projects.add(project)
+    client = server.app.test_client()
+    url = f"/api/projects/{project_id}/export/jobs"
+    try:
+        response = client.post(url, json={'filename': 'plan'})
+        assert response.status_code == 202
+        job_url = response.headers['Location']
+        assert client.post(url, json={'filename': 'plan.xlsx'}).get_json()['job_id'] == response.get_json()['job_id']
+        # Another name is another job; no body at all gets the default name
+        other = client.post(url, json={'filename': 'copy'}).get_json()
+        assert other['job_id'] != response.get_json()['job_id'] and other['filename'] == 'copy.xlsx'
+        bodyless = client.post(url)
+        assert bodyless.status_code == 202 and bodyless.get_json()['filename'].endswith('_gantt.xlsx')
+
+        deadline = time.monotonic() + 60
+        while client.get(job_url).get_json()['status'] in ('queued', 'running'):
+            assert time.monotonic() < deadline, "Export did not finish"
+            time.sleep(0.05)
+        status = client.get(job_url).get_json()
+        assert status['status'] == 'done' and status['progress'] == 100
+
+        download = client.get(job_url + "/download")
+        assert download.status_code == 200
+        assert 'plan.xlsx' in download.headers['Content-Disposition']
+        workbook = load_workbook(io.BytesIO(download.data))
+        assert workbook["Gantt Chart"].cell(row=42, column=1).value == "Task 39"
+        download.close()
+
+        assert client.get(f"/api/projects/other/export/jobs/{status['job_id']}").status_code == 404
+    finally:
+        server.projects.discard(project_id)
+    print("   Test passed!")
+
+
+def test_export_leaves_no_files():
+    """The synchronous export is streamed from memory, without writing a file."""
+
+    print("\nTesting in-memory export...")
+
+    import app as server
+
+    project, _ = _make_snapshot()
+    project_id = server.projects.add(project)
+    client = server.app.test_client()
+    before = set(os.listdir('.'))
+    try:
+        response = client.post(f"/api/projects/{project_id}/export", json={'filename': 'memory test'})
+        assert response.status_code == 200
+        assert int(response.headers['Content-Length']) == len(response.data)
+        assert 'memory test.xlsx' in response.headers['Content-Disposition']
+        # Without a body the project name is used
+        response = client.post(f"/api/projects/{project_id}/export")
+        assert response.status_code == 200 and '_gantt.xlsx' in response.headers['Content-Disposition']
+        workbook = load_workbook(io.BytesIO(response.data))
+        assert workbook["Gantt Chart"].cell(row=42, column=1).value == "Task 39"
+        response.close()
+    finally:
+        server.projects.discard(project_id)
+    assert set(os.listdir('.')) == before
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_jobs_share_and_expire()
+    test_export_job_routes()
+    test_export_leaves_no_files()
+
+    print("\n" + "=" * 60)
+    print("ALL EXPORT JOB TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Test the compact columnar Gantt payload and its compression."""
+
+import gzip
+import json
+from datetime import datetime
+from models import Project, Task, Employee
+
+
+def _serve_project(server):
+    project = Project("Format Test", datetime(2025, 1, 6))  # Monday
+    alice = Employee("Alice")
+    alice.add_holiday("2025-01-08")
+    project.add_employee(alice)
+    project.add_employee(Employee("Bob"))
+    for idx in range(60):
+        task = Task(f"Task {idx}", 1 + idx % 5, ("Alice", "Bob")[idx % 2])
+        task.dependency = f"Task {idx - 2}" if idx >= 2 else None
+        project.add_task(task)
+    project.calculate_schedule()
+    server.publish(project)
+    return server.projects.add(project)
+
+
+def test_columns_match_tasks():
+    """format=columns carries the same data as the list of task objects."""
+
+    print("\nTesting columnar Gantt payload...")
+
+    import app as server
+    from date_ranges import to_ordinal
+    from models import format_ordinal
+
+    project_id = _serve_project(server)
+    client = server.app.test_client()
+    url = f"/api/projects/{project_id}/gantt"
+    try:
+        for query in ("", "?from=2025-01-20&to=2025-02-03", "?assignee=Bob&offset=3&limit=10"):
+            sep = "&" if query else "?"
+            verbose = client.get(url + query).get_json()
+            compact = client.get(url + query + sep + "format=columns").get_json()
+            assert compact['format'] == 'columns'
+            for key in ('project_name', 'version', 'start_date', 'end_date', 'total', 'offset'):
+                assert compact[key] == verbose[key]
+
+            start = to_ordinal(compact['start_date'])
+            columns = compact['columns']
+            assert len(columns['name']) == len(verbose['tasks']) > 0
+
+            def date(offset):
+                return format_ordinal(start + offset) if offset is not None else None
+
+            def spans(flat):
+                return [[date(flat[i]), flat[i + 1]] for i in range(0, len(flat), 2)]
+
+            for row, task in enumerate(verbose['tasks']):
+                assert columns['index'][row] == task['index']
+                assert columns['name'][row] == task['name']
+                assert columns['assigned_to'][row] == task['assigned_to']
+                assert columns['estimated_duration'][row] == task['estimated_duration']
+                assert date(columns['start'][row]) == task['start_date']
+                assert date(columns['end'][row]) == task['end_date']
+                assert date(columns['custom_start'][row]) == task['custom_start_date']
+                assert spans(columns['working_spans'][row]) == task['working_spans']
+                assert spans(columns['holiday_spans'][row]) == task['holiday_spans']
+                assert (columns['total_float'][row] == 0) == task['critical']
+
+        assert client.get(url + "?format=xml").status_code == 400
+    finally:
+        server.projects.discard(project_id)
+    print("   Test passed!")
+
+
+def test_gzip_negotiation():
+    """Responses are compressed only for clients accepting gzip, each with its own ETag."""
+
+    print("\nTesting gzip negotiation...")
+
+    import app as server
+
+    project_id = _serve_project(server)
+    client = server.app.test_client()
+    url = f"/api/projects/{project_id}/gantt?format=columns"
+    try:
+        plain = client.get(url)
+        assert 'Content-Encoding' not in plain.headers
+        assert 'Accept-Encoding' in plain.headers['Vary']
+
+        packed = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+        assert packed.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(packed.data)) == plain.get_json()
+        assert len(packed.data) < len(plain.data)
+        assert packed.headers['ETag'] != plain.headers['ETag']
+
+        again = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': packed.headers['ETag']})
+        assert again.status_code == 304
+        refused = client.get(url, headers={'Accept-Encoding': 'gzip;q=0'})
+        assert 'Content-Encoding' not in refused.headers
+    finally:
+        server.projects.discard(project_id)
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_columns_match_tasks()
+    test_gzip_negotiation()
+
+    print("\n" + "=" * 60)
+    print("ALL GANTT FORMAT TESTS PASSED!")
+    print("=" * 60)
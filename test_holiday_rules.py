@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test recurring holiday rules and their use by the scheduler."""
+
+import os
+from datetime import date, datetime
+from excel_export import export_to_excel
+from excel_import import import_from_excel
+from holiday_rules import RecurringHolidays, easter_sunday, parse_holiday_rule, parse_holiday_entries
+from models import Project, Task, Employee
+
+
+def test_rule_occurrences():
+    """Each rule type falls on the expected days."""
+
+    print("\nTesting holiday rule occurrences...")
+
+    assert easter_sunday(2025) == date(2025, 4, 20)
+    assert easter_sunday(2026) == date(2026, 4, 5)
+
+    test_cases = [
+        ("yearly 25/12", 2025, [date(2025, 12, 25)]),
+        ("yearly 29/02", 2025, []),
+        ("yearly 29/02", 2028, [date(2028, 2, 29)]),
+        ("1st Monday of May", 2025, [date(2025, 5, 5)]),
+        ("last Monday of May", 2025, [date(2025, 5, 26)]),
+        ("5th Monday of February", 2025, []),
+        ("Easter-2", 2025, [date(2025, 4, 18)]),
+        ("easter + 1", 2025, [date(2025, 4, 21)]),
+    ]
+    for text, year, expected in test_cases:
+        rule = parse_holiday_rule(text)
+        days = [date.fromordinal(day) for day in rule.occurrences(year)]
+        print(f"   {text!r} in {year}: {days}")
+        assert days == expected, f"Expected {expected}, got {days}"
+
+    # Canonical text round-trips
+    assert str(parse_holiday_rule("last mon of may")) == "last Monday of May"
+    assert str(parse_holiday_rule("easter + 1")) == "Easter+1"
+
+    for invalid in ("yearly 31/02", "6th Monday of May", "Christmas"):
+        try:
+            parse_holiday_rule(invalid)
+            assert False, f"Should have rejected {invalid!r}"
+        except ValueError as e:
+            print(f"   Correctly rejected {invalid!r}: {e}")
+    print("   Test passed!")
+
+
+def test_lazy_expansion():
+    """Only the years a lookup touches are expanded."""
+
+    print("\nTesting lazy per-year expansion...")
+
+    rules = RecurringHolidays([parse_holiday_rule("yearly 01/01"), parse_holiday_rule("Easter+1")])
+    start = date(2025, 3, 1).toordinal()
+    end = date(2025, 6, 30).toordinal()
+    assert [date.fromordinal(day) for day in rules.days_between(start, end)] == [date(2025, 4, 21)]
+    assert sorted(rules._years) == [2024, 2025, 2026]
+
+    assert "2030-01-01" in rules
+    assert "2030-01-02" not in rules
+    assert 2030 in rules._years and 2040 not in rules._years
+    print("   Test passed!")
+
+
+def test_schedule_skips_rule_holidays():
+    """The scheduler skips global and personal rule holidays in every year."""
+
+    print("\nTesting scheduling around recurring holidays...")
+
+    project = Project("Rules Test", datetime(2025, 12, 22))  # Monday
+    alice = Employee("Alice")
+    project.add_employee(alice)
+    holidays, rules = parse_holiday_entries(["2025-12-29/2025-12-31", "yearly 25/12", "yearly 01/01"])
+    project.set_global_holidays(holidays)
+    project.set_global_holiday_rules(rules)
+    alice.add_holiday_rule("Easter+1")
+
+    task = Task("Year End", 5, "Alice")
+    project.add_task(task)
+    project.calculate_schedule()
+
+    # Mon 22, Tue 23, Wed 24, (25 rule, 26), (29-31 range, 1 Jan rule), Fri 2 Jan
+    assert task.end_date == datetime(2026, 1, 2), f"Unexpected end {task.end_date}"
+    assert task.holiday_dates == [datetime(2025, 12, d) for d in (25, 29, 30, 31)] + [datetime(2026, 1, 1)]
+
+    # Easter Monday 2026 is a personal holiday for Alice
+    task.custom_start_date = datetime(2026, 4, 6)
+    project.calculate_schedule()
+    assert task.start_date == datetime(2026, 4, 7)
+    assert task.holiday_dates == [datetime(2026, 4, 6)]
+
+    # Removing the rule reschedules the task
+    alice.set_holiday_rules([])
+    project.calculate_schedule()
+    assert task.start_date == datetime(2026, 4, 6)
+    assert task.holiday_dates == []
+    print("   Test passed!")
+
+
+def test_ordinal_rule_entries():
+    """Ordinal rules start with a digit but are not dates, in the API and in workbooks."""
+
+    print("\nTesting ordinal rule entries...")
+
+    holidays, rules = parse_holiday_entries(["1st Monday of May", "2025-01-01/2025-01-02", "last Friday of June"])
+    assert [str(rule) for rule in rules] == ["1st Monday of May", "last Friday of June"]
+    assert holidays.iso_entries() == ["2025-01-01/2025-01-02"]
+
+    project = Project("Ordinal Test", datetime(2025, 4, 28))  # Monday
+    project.add_employee(Employee("Alice"))
+    project.set_global_holiday_rules(rules)
+    project.add_task(Task("Spring", 10, "Alice"))
+    project.calculate_schedule()
+    assert project.tasks[0].holiday_dates == [datetime(2025, 5, 5)]
+
+    filename = "test_ordinal_rules.xlsx"
+    export_to_excel(project, filename)
+    try:
+        data = import_from_excel(filename)
+    finally:
+        os.remove(filename)
+    assert data['project_info']['global_holidays'] == ["1st Monday of May", "last Friday of June"]
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_rule_occurrences()
+    test_lazy_expansion()
+    test_schedule_skips_rule_holidays()
+    test_ordinal_rule_entries()
+
+    print("\n" + "=" * 60)
+    print("ALL HOLIDAY RULE TESTS PASSED!")
+    print("=" * 60)
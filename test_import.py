@@ -25,6 +25,7 @@ def test_import():
     emp1 = Employee("Alice")
     emp1.set_work_pattern([0, 1, 2, 3, 4])  # Mon-Fri
     emp1.add_holiday("2025-01-22")
+    emp1.add_holiday_range("2025-03-03", "2025-03-14")
 
     emp2 = Employee("Bob")
     emp2.set_work_pattern([0, 1, 2, 3])  # Mon-Thu
@@ -91,7 +92,7 @@ def test_import():
         alice = next(emp for emp in employees if emp['name'] == 'Alice')
         print(f"   - {alice['name']}: works {len(alice['work_pattern'])} days/week, {len(alice['holidays'])} holidays")
         assert alice['work_pattern'] == [0, 1, 2, 3, 4], "Alice work pattern mismatch"
-        assert len(alice['holidays']) == 1, "Alice holidays count mismatch"
+        assert alice['holidays'] == ["2025-01-22", "2025-03-03/2025-03-14"], "Alice holidays mismatch"
 
         bob = next(emp for emp in employees if emp['name'] == 'Bob')
         print(f"   - {bob['name']}: works {len(bob['work_pattern'])} days/week, {len(bob['holidays'])} holidays")
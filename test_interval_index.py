@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test the interval index behind windowed Gantt queries."""
+
+import random
+from datetime import datetime
+from date_ranges import DaySpans
+from interval_index import IntervalIndex
+from models import Project, Task, Employee
+from schedule_snapshot import publish
+
+
+def test_interval_index_matches_scan():
+    """Window queries return exactly the overlapping intervals, in order."""
+
+    print("\nTesting interval index...")
+
+    rng = random.Random(5)
+    for count in (0, 1, 7, 300):
+        starts, ends = [], []
+        for _ in range(count):
+            if rng.random() < 0.1:
+                starts.append(None)
+                ends.append(None)
+            else:
+                start = rng.randrange(1000)
+                starts.append(start)
+                ends.append(start + rng.choice((0, 3, 20, 400)))
+        items = [10 * idx for idx in range(count)]
+        index = IntervalIndex(items, starts, ends)
+        assert len(index) == count
+        for _ in range(50):
+            first = rng.randrange(-50, 1500)
+            last = first + rng.randrange(60)
+            expected = [item for item, start, end in zip(items, starts, ends)
+                        if start is not None and start <= last and end >= first]
+            assert index.overlapping(first, last) == expected
+    print("   Test passed!")
+
+
+def test_task_index():
+    """Snapshots answer window and assignee queries over their tasks."""
+
+    print("\nTesting task index of a snapshot...")
+
+    project = Project("Index Test", datetime(2025, 1, 6))  # Monday
+    for name in ("Alice", "Bob"):
+        project.add_employee(Employee(name))
+    for idx in range(40):
+        task = Task(f"Task {idx}", 1 + idx % 4, ("Alice", "Bob")[idx % 2])
+        task.dependency = f"Task {idx - 2}" if idx >= 2 else None
+        project.add_task(task)
+    project.calculate_schedule()
+    index = publish(project).task_index
+
+    tasks = project.tasks
+    assert list(index.query()) == list(range(40))
+    assert list(index.query(assigned_to="Bob")) == list(range(1, 40, 2))
+    assert list(index.query(assigned_to="Carol")) == []
+    first, last = tasks[10].start_day, tasks[12].end_day
+    window = [idx for idx, task in enumerate(tasks) if task.start_day <= last and task.end_day >= first]
+    assert index.query(first, last) == window
+    assert index.query(first, last, "Alice") == [idx for idx in window if idx % 2 == 0]
+    assert index.query(first_day=tasks[-1].end_day) == [idx for idx, task in enumerate(tasks)
+                                                        if task.end_day >= tasks[-1].end_day]
+    assert index.query(last_day=tasks[0].end_day) == [0, 1]
+    print("   Test passed!")
+
+
+def test_clipped_spans():
+    """Spans are clipped to a window."""
+
+    print("\nTesting clipped spans...")
+
+    spans = DaySpans([(10, 3), (20, 5), (30, 1)])
+    assert spans.spans_between(11, 21) == [(11, 2), (20, 2)]
+    assert spans.spans_between(0, 100) == spans.spans()
+    assert spans.spans_between(13, 19) == []
+    assert spans.spans_between(24, 30) == [(24, 1), (30, 1)]
+    assert DaySpans().spans_between(0, 100) == []
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_interval_index_matches_scan()
+    test_task_index()
+    test_clipped_spans()
+
+    print("\n" + "=" * 60)
+    print("ALL INTERVAL INDEX TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test Monte Carlo forecasting of completion dates."""
+
+from datetime import datetime
+import monte_carlo
+from conftest import make_project
+from models import Task, Employee
+
+
+def _make_project(use_table=False):
+    employees = []
+    for idx in range(4):
+        employee = Employee(f"Emp {idx}")
+        if idx % 2:
+            employee.set_work_pattern([0, 1, 2, 3])
+        if idx == 2:
+            employee.add_holiday_range("2025-02-10", "2025-02-14")
+        employees.append(employee)
+    tasks = []
+    for idx in range(120):
+        task = Task(f"Task {idx}", 1 + idx * 5 % 8, f"Emp {idx % 4}")
+        task.dependency = [f"Task {pred}" for pred in (idx - 1, idx // 3) if 0 <= pred < idx]
+        task.availability = (100, 50, 80)[idx % 3]
+        if idx % 40 == 0:
+            task.custom_start_date = datetime(2025, 2, 3)
+        tasks.append(task)
+    project = make_project("Forecast Test", employees, tasks, use_table)
+    project.add_global_holiday_rule("Easter+1")
+    return project
+
+
+def test_forecast_without_spread_matches_schedule(use_table):
+    """With no uncertainty every trial reproduces calculate_schedule()."""
+
+    print("\nTesting forecast without spread...")
+
+    if not monte_carlo.available():
+        print("   NumPy not installed, skipped")
+        return
+
+    project = _make_project(use_table)
+    project.calculate_schedule()
+    task_days, project_days = project.forecast_completion(trials=20, optimistic=0, pessimistic=0)
+    assert task_days == [[task.end_day] * 3 for task in project.tasks]
+    assert project_days == [project.get_project_end_day()] * 3
+    print("   Test passed!")
+
+
+def test_forecast_percentiles():
+    """Percentiles are ordered, reproducible with a seed and follow the distributions."""
+
+    print("\nTesting forecast percentiles...")
+
+    if not monte_carlo.available():
+        print("   NumPy not installed, skipped")
+        return
+
+    project = _make_project()
+    project.calculate_schedule()
+    task_days, project_days = project.forecast_completion(trials=2000, seed=7)
+    assert project_days[0] <= project_days[1] <= project_days[2]
+    assert all(days[0] <= days[1] <= days[2] for days in task_days)
+    # Durations run up to 30% over the estimate against 10% under
+    assert project_days[0] > project.get_project_end_day()
+    assert project.forecast_completion(trials=2000, seed=7) == (task_days, project_days)
+
+    # An explicit distribution replaces the default spread for that task
+    last = project.tasks[-1]
+    task_days, _ = project.forecast_completion(trials=500, optimistic=0, pessimistic=0, seed=1,
+                                               distributions={last.name: (40, 40, 40)})
+    assert task_days[-2] == [project.tasks[-2].end_day] * 3
+    assert task_days[-1][0] > last.end_day
+
+    for kwargs, message in [({'distributions': {last.name: (5, 3, 8)}}, "Invalid duration distribution"),
+                            ({'trials': 0}, "trials must be positive")]:
+        try:
+            project.forecast_completion(**kwargs)
+            assert False, f"Should have failed with {message}"
+        except ValueError as e:
+            assert message in str(e)
+    print("   Test passed!")
+
+
+def test_forecast_needs_numpy():
+    """Without NumPy forecasting reports that it is unavailable."""
+
+    print("\nTesting forecast without NumPy...")
+
+    numpy = monte_carlo.np
+    monte_carlo.np = None
+    try:
+        _make_project().forecast_completion()
+        assert False, "Should have failed without NumPy"
+    except RuntimeError as e:
+        assert "NumPy" in str(e)
+    finally:
+        monte_carlo.np = numpy
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    for use_table in (False, True):
+        test_forecast_without_spread_matches_schedule(use_table)
+    test_forecast_percentiles()
+    test_forecast_needs_numpy()
+
+    print("\n" + "=" * 60)
+    print("ALL MONTE CARLO TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Test scheduling independent workstreams in a process pool."""
+
+from conftest import make_project, schedule_rows
+from models import Task, Employee, WorkCalendar
+import parallel_scheduler
+from parallel_scheduler import independent_components
+
+
+def _make_project(streams=3, tasks_per_stream=40):
+    employees, tasks = [], []
+    for stream in range(streams):
+        for idx in range(2):
+            employee = Employee(f"S{stream} Emp {idx}", "Part Time" if idx else None)
+            employee.add_holiday(f"2025-02-{stream + 3:02d}")
+            employees.append(employee)
+        for idx in range(tasks_per_stream):
+            task = Task(f"S{stream} Task {idx}", 1 + idx % 7, f"S{stream} Emp {idx % 2}")
+            if idx % 10:
+                task.dependency = f"S{stream} Task {idx - 1}"
+            task.availability = 50 if idx % 3 == 0 else 100
+            tasks.append(task)
+    project = make_project("Parallel Test", employees, tasks, calendars=[WorkCalendar("Part Time", [0, 1, 2])])
+    project.add_global_holiday("2025-01-20")
+    return project
+
+
+def test_independent_components():
+    """Tasks sharing a dependency or an employee end up in the same group."""
+
+    print("\nTesting independent components...")
+
+    project = _make_project()
+    predecessors, _, _ = project._dependency_graph()
+    indices = list(range(len(project.tasks)))
+    components = independent_components(indices, predecessors, [task.assigned_to for task in project.tasks])
+    assert components == [list(range(0, 40)), list(range(40, 80)), list(range(80, 120))]
+
+    # A shared employee joins two streams
+    project.tasks[45].assigned_to = "S0 Emp 1"
+    components = independent_components(indices, predecessors, [task.assigned_to for task in project.tasks])
+    assert components == [list(range(0, 80)), list(range(80, 120))]
+    print("   Test passed!")
+
+
+def test_parallel_matches_serial():
+    """The process pool gives the same schedule as the serial run."""
+
+    print("\nTesting parallel scheduling...")
+
+    serial = _make_project()
+    serial.schedule_workers = 1
+    serial.calculate_schedule()
+
+    parallel = _make_project()
+    parallel.schedule_workers = 2
+    parallel.PARALLEL_MIN_TASKS = 1
+    parallel.calculate_schedule()
+    assert schedule_rows(parallel) == schedule_rows(serial)
+    # Antecedents are linked to the project's own tasks
+    assert parallel.tasks[1]._scheduled_after == (parallel.tasks[0],)
+
+    # The pool is kept for the next calculation
+    pool = parallel_scheduler._pool
+    assert pool is not None
+    submit = pool.submit
+    submitted = []
+    pool.submit = lambda *args: submitted.append(args) or submit(*args)
+    for project in (serial, parallel):
+        project.tasks[5].estimated_duration += 1
+        project.tasks[45].estimated_duration += 1
+        project.calculate_schedule()
+    del pool.submit
+    assert parallel_scheduler._pool is pool and len(submitted) == 2
+    assert schedule_rows(parallel) == schedule_rows(serial)
+
+    # Errors raised in a worker are reported as the serial run reports them
+    parallel.tasks[5].estimated_duration = 3
+    parallel.tasks[50].availability = 0
+    try:
+        parallel.calculate_schedule()
+        assert False, "Should have failed with a zero availability"
+    except ZeroDivisionError:
+        pass
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_independent_components()
+    test_parallel_matches_serial()
+
+    print("\n" + "=" * 60)
+    print("ALL PARALLEL SCHEDULER TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Test the registry of projects held by the server."""
+
+import threading
+import time
+from datetime import datetime
+from models import Project
+from project_registry import ProjectRegistry, UnknownProjectError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _project(name):
+    return Project(name, datetime(2025, 1, 6))
+
+
+def test_lru_eviction():
+    """Beyond max_projects the least recently used project is dropped."""
+
+    print("\nTesting LRU eviction...")
+
+    registry = ProjectRegistry(max_projects=2, idle_timeout=None)
+    first = registry.add(_project("First"))
+    second = registry.add(_project("Second"))
+    with registry.checkout(first) as project:
+        assert project.name == "First"
+
+    third = registry.add(_project("Third"))
+    assert first in registry and third in registry and second not in registry
+    assert registry.stats()['evictions'] == 1
+
+    try:
+        with registry.checkout(second):
+            pass
+        assert False, "Should have failed for an evicted project"
+    except UnknownProjectError:
+        pass
+    # A request waiting for a project's lock finds it gone once discarded
+    waited = []
+
+    def wait_for_third():
+        try:
+            with registry.checkout(third):
+                waited.append("checked out")
+        except UnknownProjectError:
+            waited.append("gone")
+
+    with registry.checkout(third):
+        waiter = threading.Thread(target=wait_for_third)
+        waiter.start()
+        while registry._entries[third].users < 2:  # the waiter is blocked on the lock
+            time.sleep(0.001)
+        assert registry.discard(third)
+    waiter.join()
+    assert waited == ["gone"]
+
+    assert registry.discard(first) and not registry.discard(first)
+    assert len(registry) == 0
+    print("   Test passed!")
+
+
+def test_idle_eviction():
+    """Projects unused for idle_timeout seconds are dropped, unless in use."""
+
+    print("\nTesting idle eviction...")
+
+    clock = FakeClock()
+    registry = ProjectRegistry(max_projects=10, idle_timeout=60, clock=clock)
+    idle = registry.add(_project("Idle"))
+    busy = registry.add(_project("Busy"))
+    with registry.checkout(busy):
+        clock.now = 100
+        fresh = registry.add(_project("Fresh"))
+        # The busy project is pinned while a request holds it
+        assert idle not in registry and busy in registry
+        clock.now = 200
+        assert registry.stats()['in_use'] == 1
+    # Released at 200, so it counts as used then
+    clock.now = 250
+    with registry.checkout(busy):
+        pass
+    assert fresh not in registry
+    assert registry.stats() == {'projects': 1, 'in_use': 0, 'max_projects': 10, 'evictions': 2, 'loads': 0}
+    print("   Test passed!")
+
+
+def test_per_project_lock():
+    """Requests on one project are serialised; other projects are not held up."""
+
+    print("\nTesting per-project locks...")
+
+    registry = ProjectRegistry()
+    first = registry.add(_project("First"))
+    second = registry.add(_project("Second"))
+    entered = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def hold():
+        with registry.checkout(first):
+            entered.set()
+            release.wait(5)
+            order.append("holder")
+
+    def wait():
+        with registry.checkout(first):
+            order.append("waiter")
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait(5)
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    with registry.checkout(second) as project:
+        assert project.name == "Second"
+    release.set()
+    holder.join()
+    waiter.join()
+    assert order == ["holder", "waiter"]
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_lru_eviction()
+    test_idle_eviction()
+    test_per_project_lock()
+
+    print("\n" + "=" * 60)
+    print("ALL PROJECT REGISTRY TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Test the SQLite store of projects."""
+
+import os
+import tempfile
+from datetime import datetime
+import project_store
+from conftest import make_project, schedule_rows
+from models import Project, Employee, WorkCalendar, TaskTable
+from project_registry import ProjectRegistry, UnknownProjectError
+from project_store import ProjectStore
+
+
+def _make_project():
+    regional = WorkCalendar("Regional", [0, 1, 2, 3])
+    regional.add_holiday_rule("yearly 17/03")
+    alice = Employee("Alice", "Regional")
+    alice.add_holiday("2025-01-14")
+    bob = Employee("Bob")
+    bob.set_work_pattern([0, 2, 4])
+    project = make_project("Store Test", [alice, bob], [
+        ("Design", 3, "Alice", None),
+        ("Backend", 5, "Alice", "Design"),
+        ("Frontend", 2, "Bob", "Design"),
+        ("Release", 1, "Bob", ["Backend", "Frontend"])], calendars=[regional])
+    project.add_global_holiday_range("2025-01-20", "2025-01-21")
+    project.add_global_holiday_rule("Easter+1")
+    project.tasks[2].availability = 50
+    project.tasks[0].custom_start_date = datetime(2025, 1, 8)
+    project.resource_levelling = True
+    return project
+
+
+def test_save_and_load():
+    """A reloaded project has the same inputs and schedule, without recalculating."""
+
+    print("\nTesting save and load...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProjectStore(os.path.join(directory, "projects.db"))
+        project = _make_project()
+        store.save_project("p1", project)
+        # Not calculated yet: nothing to restore
+        assert not store.load_project("p1").schedule_is_current()
+
+        project.calculate_schedule()
+        store.save_schedule("p1", project)
+        loaded = store.load_project("p1")
+        assert loaded.schedule_is_current()
+        assert schedule_rows(loaded) == schedule_rows(project)
+        assert loaded.tasks[3].dependency == ("Backend", "Frontend")
+        assert loaded.employees["Bob"].work_pattern == [0, 2, 4]
+        assert loaded.employees["Alice"].work_pattern == [0, 1, 2, 3]
+        assert [str(rule) for rule in loaded.calendars["Regional"].holiday_rules] == ["yearly 17/03"]
+        assert loaded.resource_levelling
+        loaded.calculate_schedule()
+        assert schedule_rows(loaded) == schedule_rows(project)
+
+        # Edits are written through part by part
+        project.tasks[1].estimated_duration = 8
+        store.save_tasks("p1", project)
+        loaded = store.load_project("p1")
+        assert not loaded.schedule_is_current()
+        loaded.calculate_schedule()
+        project.calculate_schedule()
+        assert schedule_rows(loaded) == schedule_rows(project)
+
+        project.set_global_holidays([])
+        store.save_info("p1", project)
+        assert not store.load_project("p1").global_holidays
+
+        # Large projects are loaded into a TaskTable
+        project.calculate_schedule()
+        store.save_schedule("p1", project)
+        table_min_tasks = project_store.TABLE_MIN_TASKS
+        project_store.TABLE_MIN_TASKS = 1
+        try:
+            loaded = store.load_project("p1")
+            assert isinstance(loaded.tasks, TaskTable) and loaded.schedule_is_current()
+            assert schedule_rows(loaded) == schedule_rows(project)
+            assert loaded.tasks[3].dependency == ("Backend", "Frontend")
+            # Fractional inputs from older databases keep the list of tasks
+            project.tasks[1].estimated_duration = 2.5
+            store.save_tasks("p1", project)
+            loaded = store.load_project("p1")
+            assert not isinstance(loaded.tasks, TaskTable)
+            assert loaded.tasks[1].estimated_duration == 2.5
+        finally:
+            project_store.TABLE_MIN_TASKS = table_min_tasks
+
+        assert store.delete_project("p1") and not store.delete_project("p1")
+        assert store.load_project("p1") is None
+        # A late edit of a deleted project does not bring it back
+        store.save_info("p1", project)
+        assert store.load_project("p1") is None
+        store.close()
+    print("   Test passed!")
+
+
+def test_registry_loads_lazily():
+    """An evicted or restarted project is loaded from the store on first access."""
+
+    print("\nTesting lazy loading...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProjectStore(os.path.join(directory, "projects.db"))
+        registry = ProjectRegistry(max_projects=1, loader=store.load_project)
+        first = registry.add(_make_project())
+        with registry.checkout(first) as project:
+            store.save_project(first, project)
+        registry.add(Project("Other", datetime(2025, 1, 6)))
+        assert first not in registry
+
+        with registry.checkout(first) as project:
+            assert project.name == "Store Test" and len(project.tasks) == 4
+        assert registry.stats()['loads'] == 1
+
+        try:
+            with registry.checkout("missing"):
+                pass
+            assert False, "Should have failed for an unknown project"
+        except UnknownProjectError:
+            pass
+        store.close()
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_save_and_load()
+    test_registry_loads_lazily()
+
+    print("\n" + "=" * 60)
+    print("ALL PROJECT STORE TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Test resource-levelled scheduling."""
+
+from datetime import date, datetime
+from conftest import make_project
+from models import Project, Task, Employee
+from resource_levelling import BookingTimeline
+
+
+def test_booking_timeline():
+    """Bookings add up per day and report the first overbooked stretch."""
+
+    print("\nTesting booking timeline...")
+
+    timeline = BookingTimeline()
+    timeline.book(10, 19, 50)
+    timeline.book(15, 24, 50)
+    assert [timeline.load_at(day) for day in (9, 10, 14, 15, 19, 20, 24, 25)] == [0, 50, 50, 100, 100, 50, 50, 0]
+    assert len(timeline) == 4
+
+    assert timeline.first_overload(0, 9, 100) is None
+    assert timeline.first_overload(0, 12, 60) == 14
+    assert timeline.first_overload(12, 30, 10) == 19
+    assert timeline.first_overload(20, 30, 50) is None
+    print("   Test passed!")
+
+
+def _make_project():
+    alice = Employee("Alice")
+    alice.add_holiday("2025-01-15")
+    return make_project("Levelling Test", [alice, "Bob"])
+
+
+def _add_task(project, name, duration, assigned_to, availability=100, dependency=None):
+    task = Task(name, duration, assigned_to)
+    task.availability = availability
+    task.dependency = dependency
+    project.add_task(task)
+    return task
+
+
+def test_levelled_schedule():
+    """Tasks wait until their employee has enough capacity left."""
+
+    print("\nTesting levelled scheduling...")
+
+    project = _make_project()
+    project.resource_levelling = True
+    first = _add_task(project, "First", 3, "Alice")
+    second = _add_task(project, "Second", 3, "Alice")
+    bob = _add_task(project, "Bob Task", 3, "Bob")
+    after = _add_task(project, "After", 2, "Bob", dependency="First")
+    project.calculate_schedule()
+
+    # Alice works one task at a time; Bob is not held up by her
+    assert (first.start_date, first.end_date) == (datetime(2025, 1, 6), datetime(2025, 1, 8))
+    assert (second.start_date, second.end_date) == (datetime(2025, 1, 9), datetime(2025, 1, 13))
+    assert (bob.start_date, bob.end_date) == (datetime(2025, 1, 6), datetime(2025, 1, 8))
+    # Bob is busy until the 8th anyway
+    assert (after.start_date, after.end_date) == (datetime(2025, 1, 9), datetime(2025, 1, 10))
+
+    # Two half-time tasks share a person; a third has to wait
+    project.set_tasks([Task("Half A", 2, "Alice"), Task("Half B", 2, "Alice"), Task("Half C", 2, "Alice")])
+    for task in project.tasks:
+        task.availability = 50
+    project.calculate_schedule()
+    starts = [task.start_date for task in project.tasks]
+    assert starts == [datetime(2025, 1, 6), datetime(2025, 1, 6), datetime(2025, 1, 10)]
+    # Alice's holiday on the 15th is skipped as usual
+    assert project.tasks[2].end_date == datetime(2025, 1, 16)
+    assert project.tasks[2].holiday_dates == [datetime(2025, 1, 15)]
+
+    # Turning levelling off lets the tasks overlap again
+    project.resource_levelling = False
+    project.calculate_schedule()
+    assert [task.start_date for task in project.tasks] == [datetime(2025, 1, 6)] * 3
+    print("   Test passed!")
+
+
+def test_levelled_schedule_never_overbooks():
+    """No employee is ever booked past full capacity."""
+
+    print("\nTesting capacity on a larger project...")
+
+    project = Project("Levelling Load", datetime(2025, 1, 6))
+    for idx in range(30):
+        project.add_employee(Employee(f"Emp {idx}"))
+    for idx in range(600):
+        _add_task(project, f"Task {idx}", 1 + idx % 9, f"Emp {idx * 7 % 30}", availability=(100, 50, 25)[idx % 3],
+                  dependency=f"Task {idx - 40}" if idx >= 40 and idx % 4 == 0 else None)
+    project.resource_levelling = True
+    project.calculate_schedule()
+
+    load = {}
+    for task in project.tasks:
+        assert task.start_date is not None
+        for day in range(task.start_day, task.end_day + 1):
+            key = (task.assigned_to, day)
+            load[key] = load.get(key, 0) + task.availability
+        if task.dependency:
+            predecessor = next(t for t in project.tasks if t.name == task.dependency)
+            assert task.start_day > predecessor.end_day
+    assert max(load.values()) <= 100
+    assert date.fromordinal(project.get_project_end_day()) > date(2025, 3, 1)
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_booking_timeline()
+    test_levelled_schedule()
+    test_levelled_schedule_never_overbooks()
+
+    print("\n" + "=" * 60)
+    print("ALL RESOURCE LEVELLING TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Test the cache of serialized Gantt responses."""
+
+from datetime import datetime
+from models import Project, Task, Employee
+from response_cache import ResponseCache
+
+
+def test_response_cache_is_bounded():
+    """The least recently used bodies go once the size bound is reached."""
+
+    print("\nTesting response cache bound...")
+
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", b"x" * 40)
+    cache.put("b", b"y" * 40)
+    assert cache.get("a") == b"x" * 40  # "b" is now the least recently used
+    cache.put("c", b"z" * 40)
+    assert cache.get("b") is None
+    assert cache.get("c") == b"z" * 40
+    cache.put("huge", b"!" * 101)
+    assert cache.get("huge") is None and len(cache) == 2
+
+    stats = cache.stats()
+    assert stats == {'entries': 2, 'size_bytes': 80, 'max_bytes': 100,
+                     'hits': 2, 'misses': 2, 'evictions': 1}
+    print("   Test passed!")
+
+
+def test_gantt_etag():
+    """The Gantt route answers 304 while the schedule version is unchanged."""
+
+    print("\nTesting Gantt ETags...")
+
+    import app as server
+
+    project = Project("ETag Test", datetime(2025, 1, 6))
+    project.add_employee(Employee("Alice"))
+    project.add_task(Task("Design", 3, "Alice"))
+    project.calculate_schedule()
+    server.publish(project)
+    project_id = server.projects.add(project)
+    client = server.app.test_client()
+    url = f"/api/projects/{project_id}/gantt"
+    try:
+        first = client.get(url)
+        assert first.status_code == 200 and first.get_json()['tasks'][0]['name'] == "Design"
+        etag = first.headers['ETag']
+        assert first.headers['Cache-Control'] == 'no-cache'
+
+        again = client.get(url, headers={'If-None-Match': etag})
+        assert again.status_code == 304 and again.headers['ETag'] == etag and not again.data
+
+        # Another query has its own tag; the same query is served from the cache
+        assert client.get(url + "?limit=0").headers['ETag'] != etag
+        hits = server.gantt_cache.hits
+        assert client.get(url).data == first.data
+        assert server.gantt_cache.hits == hits + 1
+
+        # Recalculating publishes a new version, so the old tag no longer matches
+        project.tasks[0].estimated_duration = 4
+        project.calculate_schedule()
+        server.publish(project)
+        changed = client.get(url, headers={'If-None-Match': etag})
+        assert changed.status_code == 200 and changed.headers['ETag'] != etag
+        assert changed.get_json()['tasks'][0]['estimated_duration'] == 4
+    finally:
+        server.projects.discard(project_id)
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_response_cache_is_bounded()
+    test_gantt_etag()
+
+    print("\n" + "=" * 60)
+    print("ALL RESPONSE CACHE TESTS PASSED!")
+    print("=" * 60)
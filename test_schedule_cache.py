@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Test the content-addressed schedule cache."""
+
+from datetime import datetime
+from conftest import make_project, schedule_rows
+from models import Employee
+from schedule_cache import ScheduleCache, schedule_key
+
+
+def _make_project(use_table=False):
+    alice = Employee("Alice")
+    alice.add_holiday_rule("yearly 20/01")
+    project = make_project("Cache Test", [alice, "Bob"], [
+        (f"Task {idx}", 3, "Alice" if idx % 2 else "Bob", f"Task {idx - 1}" if idx else None)
+        for idx in range(10)], use_table)
+    project.add_global_holiday("2025-01-15")
+    return project
+
+
+def test_schedule_key():
+    """The key changes with every scheduling input and nothing else."""
+
+    print("\nTesting schedule keys...")
+
+    key = schedule_key(_make_project())
+    assert schedule_key(_make_project()) == key
+    assert schedule_key(_make_project(use_table=True)) == key
+
+    project = _make_project()
+    project.name = "Renamed"
+    assert schedule_key(project) == key
+
+    edits = [
+        lambda p: setattr(p.tasks[3], 'availability', 50),
+        lambda p: setattr(p.tasks[3], 'custom_start_date', datetime(2025, 2, 3)),
+        lambda p: p.employees["Bob"].set_work_pattern([0, 1, 2]),
+        lambda p: p.employees["Bob"].add_holiday("2025-01-07"),
+        lambda p: p.add_global_holiday_rule("Easter"),
+        lambda p: setattr(p, 'start_date', datetime(2025, 1, 7)),
+    ]
+    for edit in edits:
+        project = _make_project()
+        edit(project)
+        assert schedule_key(project) != key
+    print("   Test passed!")
+
+
+def test_cache_hits_restore_schedule(use_table):
+    """A hit restores the schedule of earlier inputs without scheduling."""
+
+    print("\nTesting schedule cache hits...")
+
+    cache = ScheduleCache()
+    project = _make_project(use_table)
+    assert cache.calculate(project) is False
+    original = schedule_rows(project)
+
+    project.tasks[0].estimated_duration = 8
+    assert cache.calculate(project) is False
+    changed = schedule_rows(project)
+    assert changed != original
+
+    # Going back to the earlier inputs is a hit
+    project.tasks[0].estimated_duration = 3
+    calls = []
+    project.calculate_task_schedule = lambda *args: calls.append(args)
+    project._reschedule_row = lambda *args: calls.append(args)
+    assert cache.calculate(project) is True
+    assert calls == []
+    assert schedule_rows(project) == original
+    assert project.tasks[1]._scheduled_after == (project.tasks[0],)
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+    # The project stays consistent for incremental edits afterwards
+    del project.calculate_task_schedule, project._reschedule_row
+    project.tasks[0].estimated_duration = 8
+    project.calculate_schedule()
+    assert schedule_rows(project) == changed
+    print("   Test passed!")
+
+
+def test_cache_memory_bound():
+    """Least recently used schedules are evicted to stay under the bound."""
+
+    print("\nTesting schedule cache eviction...")
+
+    project = _make_project()
+    cache = ScheduleCache()
+    cache.calculate(project)
+    entry_size = cache.size
+
+    cache = ScheduleCache(max_bytes=2 * entry_size)
+    for duration in (1, 2, 3):
+        project.tasks[0].estimated_duration = duration
+        cache.calculate(project)
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache.size <= cache.max_bytes
+
+    # Duration 1 was evicted, duration 3 is still there
+    project.tasks[0].estimated_duration = 1
+    assert cache.calculate(project) is False
+    project.tasks[0].estimated_duration = 3
+    assert cache.calculate(project) is True
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_schedule_key()
+    for use_table in (False, True):
+        test_cache_hits_restore_schedule(use_table)
+    test_cache_memory_bound()
+
+    print("\n" + "=" * 60)
+    print("ALL SCHEDULE CACHE TESTS PASSED!")
+    print("=" * 60)
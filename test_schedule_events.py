@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Test the server-sent events of project and schedule changes."""
+
+import json
+from datetime import datetime
+from models import Project, Task, Employee
+from schedule_events import ScheduleEvents
+from schedule_snapshot import ScheduleSnapshot, moved_tasks
+
+
+def _parse(text):
+    """(id, event type, data) of one event in text/event-stream format."""
+    fields = dict(line.split(': ', 1) for line in text.strip().split('\n'))
+    return fields['id'], fields['event'], json.loads(fields['data'])
+
+
+def test_replay_and_overflow():
+    """Reconnecting clients get what they missed, or a reset when it is gone or they fall behind."""
+
+    print("\nTesting event replay and overflow...")
+
+    events = ScheduleEvents('run1', history=3, max_queued=2)
+    live = events.subscribe('a')
+    first = events.publish('a', 'project', {'changed': 'tasks'})
+    events.publish('b', 'project', {'changed': 'info'})
+    second = events.publish('a', 'schedule', {'version': 1})
+    assert live.get(0).text == first.text
+    assert _parse(live.get(0).text) == (second.id, 'schedule', {'version': 1})
+    assert live.get(0.01) is None
+
+    # Replay after the last event received, and none after a current one
+    assert [events.subscribe('a', first.id).get(0).id] == [second.id]
+    assert events.subscribe('a', second.id).get(0.01) is None
+    # Unknown, too old or from another server run: reset
+    for last_event_id in ('run0-4', 'run1-0', 'garbage'):
+        assert events.subscribe('a', last_event_id).get(0).type == 'reset'
+    for _ in range(3):
+        events.publish('a', 'schedule', {})
+    assert events.subscribe('a', first.id).get(0).type == 'reset'
+
+    # A client further behind than max_queued gets one reset instead
+    slow = events.subscribe('a')
+    for _ in range(3):
+        events.publish('a', 'schedule', {})
+    assert slow.get(0).type == 'reset'
+    assert slow.get(0.01) is None
+
+    events.unsubscribe('a', live)
+    assert events.stats() == {'projects': 1, 'subscribers': 7}
+    print("   Test passed!")
+
+
+def test_moved_tasks():
+    """The delta between two snapshots lists the tasks whose dates changed, by name."""
+
+    print("\nTesting moved tasks...")
+
+    project = Project("Events Test", datetime(2025, 1, 6))  # Monday
+    project.add_employee(Employee("Alice"))
+    project.add_employee(Employee("Bob"))
+    for idx in range(6):
+        task = Task(f"Task {idx}", (2, 1)[idx % 2], ("Alice", "Bob")[idx % 2])
+        task.dependency = f"Task {idx - 2}" if idx >= 2 else None
+        project.add_task(task)
+    project.calculate_schedule()
+    before = ScheduleSnapshot(project, 1)
+    assert moved_tasks(None, before) == (list(range(6)), [])
+    assert moved_tasks(before, ScheduleSnapshot(project, 2)) == ([], [])
+
+    # Bob's chain has slack: a longer Task 3 moves nothing else, Task 5 is gone
+    project.get_task("Task 3").estimated_duration = 2
+    project.remove_task("Task 5")
+    project.add_task(Task("Task 6", 1, "Bob"))
+    project.calculate_schedule()
+    after = ScheduleSnapshot(project, 2)
+    moved, removed = moved_tasks(before, after)
+    assert [after.tasks[position].name for position in moved] == ["Task 3", "Task 6"]
+    assert removed == ["Task 5"]
+
+    # Tasks after a removed one keep their place; reordered ones have moved
+    project = Project("Order Test", datetime(2025, 1, 6))
+    for name in "ABCDE":
+        project.add_employee(Employee(name))
+        project.add_task(Task(name, 1, name))
+    project.calculate_schedule()
+    before = ScheduleSnapshot(project, 1)
+    project.set_tasks([project.get_task(name) for name in "DCBE"])
+    project.calculate_schedule()
+    after = ScheduleSnapshot(project, 2)
+    moved, removed = moved_tasks(before, after)
+    assert [after.tasks[position].name for position in moved] == ["D", "B"]
+    assert removed == ["A"]
+    print("   Test passed!")
+
+
+def test_event_stream():
+    """/events streams a delta of the schedule after a recalculation."""
+
+    print("\nTesting event stream route...")
+
+    import app as server
+
+    default_keepalive = server.app.config['EVENTS_KEEPALIVE']
+    server.app.config['EVENTS_KEEPALIVE'] = 0.01
+    project = Project("Stream Test", datetime(2025, 1, 6))
+    project.add_employee(Employee("Alice"))
+    for idx in range(4):
+        task = Task(f"Task {idx}", 2, "Alice")
+        task.dependency = f"Task {idx - 1}" if idx else None
+        project.add_task(task)
+    project_id = server.projects.add(project)
+    server.store.save_project(project_id, project)
+    client = server.app.test_client()
+    url = f"/api/projects/{project_id}"
+    try:
+        assert client.get("/api/projects/unknown/events").status_code == 404
+        assert client.post(url + "/calculate").status_code == 200
+        response = client.get(url + "/events", buffered=False)
+        assert response.mimetype == 'text/event-stream'
+        chunks = iter(response.response)
+        assert next(chunks) == b'retry: 3000\n\n'
+        assert next(chunks) == b': keep-alive\n\n'
+
+        assert client.patch(url + "/tasks/Task 1", json={'estimated_duration': 3}).status_code == 200
+        assert client.post(url + "/calculate").status_code == 200
+        _, kind, data = _parse(next(chunks).decode())
+        assert kind == 'project' and data == {'changed': 'tasks', 'version': 1, 'schedule_current': False}
+        event_id, kind, data = _parse(next(chunks).decode())
+        assert kind == 'schedule' and data['version'] == 2 and data['removed'] == []
+        moved = data['moved']
+        assert moved['name'] == ["Task 1", "Task 2", "Task 3"]
+        assert moved['start'] == [2, 7, 9] and moved['end'] == [4, 8, 10]
+        assert moved['working_spans'] == [[2, 3], [7, 2], [9, 2]]
+        # Reconnecting after the last event: nothing missed until the deletion
+        resumed = client.get(url + "/events", headers={'Last-Event-ID': event_id}, buffered=False)
+        resumed_chunks = iter(resumed.response)
+        next(resumed_chunks)
+        assert next(resumed_chunks) == b': keep-alive\n\n'
+        assert client.delete(url).status_code == 200
+        assert _parse(next(chunks).decode())[1] == 'deleted'
+        assert list(chunks) == []
+        response.close()
+        resumed.close()
+        assert server.events.stats()['subscribers'] == 0
+    finally:
+        server.projects.discard(project_id)
+        server.app.config['EVENTS_KEEPALIVE'] = default_keepalive
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_replay_and_overflow()
+    test_moved_tasks()
+    test_event_stream()
+
+    print("\n" + "=" * 60)
+    print("ALL SCHEDULE EVENT TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test immutable schedule snapshots."""
+
+import os
+import threading
+from datetime import datetime
+from openpyxl import load_workbook
+from conftest import make_project
+from models import Employee
+from excel_export import export_to_excel
+from project_registry import ProjectRegistry
+from schedule_snapshot import publish
+
+
+def _make_project(use_table=False):
+    alice = Employee("Alice")
+    alice.add_holiday("2025-01-08")
+    return make_project("Snapshot Test", [alice, "Bob"], [
+        ("Design", 3, "Alice", None),
+        ("Build", 4, "Bob", "Design"),
+        ("Docs", 2, "Alice", None)], use_table)
+
+
+def test_snapshot_is_isolated_from_edits(use_table):
+    """A published snapshot keeps its schedule while the project changes."""
+
+    print("\nTesting snapshot isolation...")
+
+    project = _make_project(use_table)
+    assert project.schedule_snapshot is None
+    project.calculate_schedule()
+    first = publish(project)
+    assert project.schedule_snapshot is first and first.version == 1
+    build = first.tasks[1]
+    assert (build.name, build.start_day, build.end_day) == ("Build", project.tasks[1].start_day,
+                                                             project.tasks[1].end_day)
+    assert first.schedule_floats() == project.schedule_floats()
+
+    # Edits and a recalculation leave the published snapshot alone
+    project.tasks[0].estimated_duration = 5
+    project.employees["Alice"].add_holiday("2025-01-09")
+    project.calculate_schedule()
+    assert first.tasks[1].start_day != project.tasks[1].start_day
+    assert first.tasks[0].holiday_days.spans() == [(datetime(2025, 1, 8).toordinal(), 1)]
+    assert datetime(2025, 1, 9).toordinal() not in first.employees["Alice"].holidays
+
+    second = publish(project)
+    assert second.version == 2 and project.schedule_snapshot is second
+    assert second.tasks[1].start_day == project.tasks[1].start_day
+    print("   Test passed!")
+
+
+def test_export_from_snapshot():
+    """Exporting a snapshot writes the same workbook as exporting the project."""
+
+    print("\nTesting export from a snapshot...")
+
+    project = _make_project()
+    project.calculate_schedule()
+    snapshot = publish(project)
+    sheets = []
+    for source, filename in [(project, "test_snapshot_project.xlsx"), (snapshot, "test_snapshot.xlsx")]:
+        export_to_excel(source, filename)
+        try:
+            workbook = load_workbook(filename)
+            sheets.append({ws.title: [[cell.value for cell in row] for row in ws.iter_rows()]
+                           for ws in workbook.worksheets})
+        finally:
+            os.remove(filename)
+    assert sheets[0] == sheets[1]
+    print("   Test passed!")
+
+
+def test_readers_do_not_wait_for_the_lock():
+    """Readers get the published snapshot while a writer holds the project."""
+
+    print("\nTesting lock-free readers...")
+
+    registry = ProjectRegistry()
+    project = _make_project()
+    project.calculate_schedule()
+    publish(project)
+    project_id = registry.add(project)
+
+    holding = threading.Event()
+    release = threading.Event()
+
+    def recalculate():
+        with registry.checkout(project_id) as locked:
+            holding.set()
+            release.wait(5)
+            locked.calculate_schedule()
+            publish(locked)
+
+    writer = threading.Thread(target=recalculate)
+    writer.start()
+    holding.wait(5)
+    assert registry.get(project_id).schedule_snapshot.version == 1
+    release.set()
+    writer.join()
+    assert registry.get(project_id).schedule_snapshot.version == 2
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    for use_table in (False, True):
+        test_snapshot_is_isolated_from_edits(use_table)
+    test_export_from_snapshot()
+    test_readers_do_not_wait_for_the_lock()
+
+    print("\n" + "=" * 60)
+    print("ALL SCHEDULE SNAPSHOT TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Test the dependency-driven scheduler in models.Project."""
+
+from datetime import date, datetime
+from conftest import make_project
+from models import Task, Employee
+
+
+def test_reverse_order_chain():
+    """A chain listed in reverse order is scheduled in dependency order."""
+
+    print("\nTesting reverse-order dependency chain...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    chain_length = 50
+    for idx in reversed(range(chain_length)):
+        task = Task(f"Step {idx}", 1, "Alice")
+        if idx > 0:
+            task.dependency = f"Step {idx - 1}"
+        project.add_task(task)
+
+    project.calculate_schedule()
+
+    tasks = {task.name: task for task in project.tasks}
+    for idx in range(1, chain_length):
+        previous = tasks[f"Step {idx - 1}"]
+        current = tasks[f"Step {idx}"]
+        assert current.start_date > previous.end_date, f"Step {idx} starts before Step {idx - 1} ends"
+
+    # 50 working days from Monday 6 Jan 2025 ends on Friday 14 Mar 2025
+    assert tasks["Step 49"].end_date == datetime(2025, 3, 14), f"Unexpected end {tasks['Step 49'].end_date}"
+    print("   Test passed!")
+
+
+def test_custom_start_breaks_dependency():
+    """A custom start date overrides the dependency edge."""
+
+    print("\nTesting custom start date overriding dependency...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    first = Task("First", 5, "Alice")
+    first.dependency = "Second"
+    first.custom_start_date = datetime(2025, 2, 3)
+    second = Task("Second", 2, "Alice")
+    second.dependency = "First"
+    project.add_task(first)
+    project.add_task(second)
+
+    project.calculate_schedule()
+
+    assert first.start_date == datetime(2025, 2, 3)
+    assert second.start_date == datetime(2025, 2, 10)
+    print("   Test passed!")
+
+
+def test_cycle_reports_tasks():
+    """A dependency cycle is reported with the tasks that form it."""
+
+    print("\nTesting circular dependency reporting...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    for name, dependency in [("Build", "Design"), ("Design", "Review"), ("Review", "Build"), ("Docs", "Build")]:
+        task = Task(name, 1, "Alice")
+        task.dependency = dependency
+        project.add_task(task)
+    project.add_task(Task("Kickoff", 1, "Alice"))
+
+    try:
+        project.calculate_schedule()
+        assert False, "Should have failed with a circular dependency"
+    except ValueError as e:
+        error_msg = str(e)
+        print(f"   Correctly caught error: {error_msg}")
+        assert error_msg.startswith("Circular dependency detected")
+        for name in ("Build", "Design", "Review"):
+            assert name in error_msg
+        assert "Docs" not in error_msg
+        assert "Kickoff" not in error_msg
+    print("   Test passed!")
+
+
+def test_missing_dependency():
+    """A dependency on an unknown task is reported by name."""
+
+    print("\nTesting missing dependency...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    task = Task("Orphan", 1, "Alice")
+    task.dependency = "Ghost"
+    project.add_task(task)
+
+    try:
+        project.calculate_schedule()
+        assert False, "Should have failed with a missing dependency"
+    except ValueError as e:
+        assert str(e) == "Dependency 'Ghost' not found for task 'Orphan'"
+    print("   Test passed!")
+
+
+def test_long_low_availability_task():
+    """Long tasks past the initial calendar horizon keep their holidays."""
+
+    print("\nTesting long task with low availability...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    project.add_global_holiday("2026-12-25")
+    project.employees["Alice"].add_holiday("2025-01-07")
+    task = Task("Migration", 100, "Alice")
+    task.availability = 20  # 500 working days
+    project.add_task(task)
+
+    project.calculate_schedule()
+
+    assert task.actual_duration == 500
+    assert len(task.working_dates) == 500
+    assert task.start_date == datetime(2025, 1, 6)
+    assert task.end_date == datetime(2026, 12, 7), f"Unexpected end {task.end_date}"
+    assert task.holiday_dates == [datetime(2025, 1, 7)]
+    print("   Test passed!")
+
+
+def test_empty_work_pattern():
+    """An employee who never works is reported instead of hanging the scheduler."""
+
+    print("\nTesting empty work pattern...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    project.employees["Alice"].set_work_pattern([])
+    project.add_task(Task("Never Ends", 3, "Alice"))
+
+    try:
+        project.calculate_schedule()
+        assert False, "Should have failed with an empty work pattern"
+    except ValueError as e:
+        print(f"   Correctly caught error: {e}")
+        assert "Alice" in str(e)
+        assert "work pattern" in str(e)
+    print("   Test passed!")
+
+
+def test_incremental_reschedule():
+    """Edits reschedule only the affected tasks and their moved dependents."""
+
+    print("\nTesting incremental rescheduling...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    project.add_employee(Employee("Bob"))
+    for name, assigned_to, dependency in [("Design", "Alice", None), ("Build", "Alice", "Design"),
+                                          ("Test", "Alice", "Build"), ("Docs", "Bob", None)]:
+        task = Task(name, 3, assigned_to)
+        task.dependency = dependency
+        project.add_task(task)
+    project.calculate_schedule()
+    tasks = {task.name: task for task in project.tasks}
+
+    recomputed = []
+    original = project.calculate_task_schedule
+
+    def tracking_schedule(task, earliest_start):
+        recomputed.append(task.name)
+        original(task, earliest_start)
+
+    project.calculate_task_schedule = tracking_schedule
+
+    # Nothing changed: nothing is recomputed
+    project.calculate_schedule()
+    assert recomputed == [], f"Unexpected recompute {recomputed}"
+
+    # A longer design pushes the whole chain but leaves Docs alone
+    tasks["Design"].estimated_duration = 5
+    project.calculate_schedule()
+    assert recomputed == ["Design", "Build", "Test"], f"Unexpected recompute {recomputed}"
+    assert tasks["Test"].end_date == datetime(2025, 1, 20)
+
+    # A holiday outside every task window only touches unscheduled work
+    recomputed.clear()
+    project.employees["Bob"].add_holiday("2025-03-03")
+    project.calculate_schedule()
+    assert recomputed == [], f"Unexpected recompute {recomputed}"
+
+    # A holiday inside Bob's task moves only that task
+    project.employees["Bob"].add_holiday("2025-01-07")
+    project.calculate_schedule()
+    assert recomputed == ["Docs"], f"Unexpected recompute {recomputed}"
+    assert tasks["Docs"].end_date == datetime(2025, 1, 9)
+
+    # Resubmitting identical tasks keeps their schedules
+    recomputed.clear()
+    resubmitted = []
+    for task in project.tasks:
+        copy = Task(task.name, task.estimated_duration, task.assigned_to)
+        copy.dependency = task.dependency
+        resubmitted.append(copy)
+    project.set_tasks(resubmitted)
+    project.calculate_schedule()
+    assert recomputed == [], f"Unexpected recompute {recomputed}"
+    print("   Test passed!")
+
+
+def test_working_day_spans():
+    """Working days and holidays are stored as runs of consecutive days."""
+
+    print("\nTesting span-encoded working days...")
+
+    project = make_project("Scheduler Test", ["Alice"])
+    project.employees["Alice"].add_holiday_range("2025-01-15", "2025-01-16")
+    task = Task("Spans", 10, "Alice")
+    project.add_task(task)
+    project.calculate_schedule()
+
+    def day(iso):
+        return date.fromisoformat(iso).toordinal()
+
+    # Mon 6 - Fri 10, Mon 13 - Tue 14, (Wed 15 - Thu 16 off), Fri 17, Mon 20 - Tue 21
+    assert task.working_days.spans() == [(day("2025-01-06"), 5), (day("2025-01-13"), 2),
+                                         (day("2025-01-17"), 1), (day("2025-01-20"), 2)], f"Got {task.working_days}"
+    assert task.holiday_days.spans() == [(day("2025-01-15"), 2)]
+    assert len(task.working_days) == 10
+    assert day("2025-01-14") in task.working_days
+    assert day("2025-01-15") not in task.working_days
+    assert day("2025-01-18") not in task.working_days
+
+    # The datetime accessors still expand to one entry per day
+    assert task.working_dates[5] == datetime(2025, 1, 13)
+    assert task.holiday_dates == [datetime(2025, 1, 15), datetime(2025, 1, 16)]
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_reverse_order_chain()
+    test_custom_start_breaks_dependency()
+    test_cycle_reports_tasks()
+    test_missing_dependency()
+    test_long_low_availability_task()
+    test_empty_work_pattern()
+    test_incremental_reschedule()
+    test_working_day_spans()
+
+    print("\n" + "=" * 60)
+    print("ALL SCHEDULER TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Test editing single tasks and employees instead of replacing the lists."""
+
+from datetime import datetime
+from conftest import make_project, schedule_rows
+from models import Task, TaskTable
+
+
+def _make_project(use_table=False):
+    return make_project("Edit Test", ["Alice", "Bob"], [
+        (f"Task {idx}", 1 + idx % 3, ("Alice", "Bob")[idx % 2], f"Task {idx - 1}" if idx else None)
+        for idx in range(8)], use_table)
+
+
+def _rebuilt(project):
+    """The same tasks in a new project, scheduled from scratch."""
+    fresh = make_project(project.name, list(project.employees), [
+        (task.name, task.estimated_duration, task.assigned_to, task.dependency) for task in project.tasks])
+    fresh.calculate_schedule()
+    return fresh
+
+
+def test_edit_single_tasks(use_table):
+    """Tasks found, added, renamed and removed by name give the schedule of a full rebuild."""
+
+    print("\nTesting single task edits...")
+
+    project = _make_project(use_table)
+    project.calculate_schedule()
+    assert project.task_position("Task 5") == 5
+    assert project.get_task("Task 9") is None
+
+    project.remove_task("Task 3")
+    project.get_task("Task 4").dependency = "Task 2"
+    assert project.task_position("Task 4") == 3
+    stored = project.put_task(Task("Task 8", 4, "Alice"))
+    assert project.get_task("Task 8") is stored
+    # Putting an unchanged task keeps its schedule
+    unchanged = Task("Task 1", 2, "Bob")
+    unchanged.dependency = "Task 0"
+    project.calculate_schedule()
+    project.put_task(unchanged)
+    assert project.schedule_is_current()
+
+    project.get_task("Task 7").name = "Last"
+    assert project.get_task("Task 7") is None and project.task_position("Last") == 6
+    project.calculate_schedule()
+    assert isinstance(project.tasks, TaskTable) == use_table
+    assert schedule_rows(project) == schedule_rows(_rebuilt(project))
+
+    # Removing several tasks keeps the order of the others and updates
+    # the name index in place instead of rebuilding it
+    index = project._task_positions
+    project.remove_tasks(["Task 0", "Task 5", "Task 9"])
+    assert project._task_positions is index
+    names = [task.name for task in project.tasks]
+    assert names == ["Task 1", "Task 2", "Task 4", "Task 6", "Last", "Task 8"]
+    assert [project.task_position(name) for name in names] == list(range(6))
+    assert project.task_position("Task 5") is None
+    project.get_task("Task 1").dependency = None
+    project.get_task("Task 6").dependency = None
+    project.calculate_schedule()
+    assert schedule_rows(project) == schedule_rows(_rebuilt(project))
+    print("   Test passed!")
+
+
+def test_edit_routes():
+    """The task and employee routes edit the project and write the changes through."""
+
+    print("\nTesting task and employee routes...")
+
+    import app as server
+
+    project = _make_project()
+    project_id = server.projects.add(project)
+    server.store.save_project(project_id, project)
+    client = server.app.test_client()
+    url = f"/api/projects/{project_id}"
+    try:
+        assert client.put(f"{url}/tasks/Extra", json={
+            'estimated_duration': 2, 'assigned_to': 'Carol', 'dependency': 'Task 7'}).status_code == 200
+        assert client.patch(f"{url}/tasks/Task 2", json={'estimated_duration': 5}).status_code == 200
+        assert client.patch(f"{url}/tasks/Task 2", json={'name': 'Task 4'}).status_code == 400
+        assert client.delete(f"{url}/tasks/Task 6").status_code == 200
+        assert client.delete(f"{url}/tasks/Task 6").status_code == 404
+        assert client.patch(f"{url}/tasks/Missing", json={}).status_code == 404
+        assert client.put(f"{url}/employees/Carol", json={'work_pattern': [0, 1, 2]}).status_code == 200
+        assert client.patch(f"{url}/employees/Bob", json={'holidays': ['2025-01-08']}).status_code == 200
+        assert client.delete(f"{url}/employees/Dave").status_code == 404
+
+        # Bodies of another shape are rejected, not a server error
+        for path, body in (("tasks", [1]), ("tasks", {'tasks': ['x']}), ("tasks", {'tasks': {'Task 1': 3}}),
+                           ("employees", [1]), ("employees", {'employees': {'Bob': 'x'}}),
+                           ("tasks/Task 1", [1]), ("employees/Bob", [1])):
+            response = client.patch(f"{url}/{path}", json=body)
+            assert response.status_code == 400 and 'error' in response.get_json(), (path, body)
+
+        # A bulk patch applies every change or none
+        response = client.patch(f"{url}/tasks", json={'tasks': {
+            'Task 7': {'dependency': ['Task 5', 'Task 4']},
+            'Task 0': {'name': 'Extra'},
+        }})
+        assert response.status_code == 400
+        assert project.get_task("Task 7").dependency == "Task 6"
+        # Fields of the wrong type too, before the deletions
+        response = client.patch(f"{url}/tasks", json={'tasks': {'Task 3': None, 'Task 7': {'dependency': 5}}})
+        assert response.status_code == 400
+        assert project.task_position("Task 3") is not None
+        for method, fields in ((client.patch, {'estimated_duration': None}), (client.patch, {'availability': 'x'}),
+                               (client.patch, {'contingency_margin': 2.5}), (client.patch, {'name': 7}),
+                               (client.patch, {'dependency': ['Task 1', 2]}),
+                               (client.put, {'estimated_duration': [2], 'assigned_to': 'Alice'}),
+                               (client.put, {'estimated_duration': 2, 'assigned_to': {'name': 'Alice'}})):
+            response = method(f"{url}/tasks/Task 3", json=fields)
+            assert response.status_code == 400 and 'error' in response.get_json(), fields
+        assert client.patch(f"{url}/tasks/Task 3", json={'estimated_duration': '3'}).status_code == 200
+        assert project.get_task("Task 3").estimated_duration == 3
+        response = client.patch(f"{url}/tasks", json={'tasks': {
+            'Task 7': {'dependency': ['Task 5', 'Task 4']},
+            'Extra': None,
+            'Task 0': {'name': 'Extra'},
+            'Task 1': {'dependency': 'Extra'},
+            'New': {'estimated_duration': 1, 'assigned_to': 'Alice', 'custom_start_date': '2025-02-03'},
+        }})
+        assert response.status_code == 200, response.get_json()
+        response = client.patch(f"{url}/employees", json={'employees': {
+            'Carol': None, 'Erin': {'work_pattern': [0, 1, 2, 3, 4, 5]}}})
+        assert response.status_code == 200, response.get_json()
+
+        assert [task.name for task in project.tasks] == [
+            'Extra', 'Task 1', 'Task 2', 'Task 3', 'Task 4', 'Task 5', 'Task 7', 'New']
+        assert project.get_task("Task 2").estimated_duration == 5
+        assert project.get_task("Task 7").dependency == ("Task 5", "Task 4")
+        assert sorted(project.employees) == ['Alice', 'Bob', 'Erin']
+        assert project.employees["Erin"].work_pattern == [0, 1, 2, 3, 4, 5]
+        assert datetime(2025, 1, 8).toordinal() in project.employees["Bob"].holidays
+
+        loaded = server.store.load_project(project_id)
+        assert [task.schedule_inputs() for task in loaded.tasks] == \
+            [task.schedule_inputs() for task in project.tasks]
+        assert sorted(loaded.employees) == sorted(project.employees)
+        assert datetime(2025, 1, 8).toordinal() in loaded.employees["Bob"].holidays
+
+        assert client.post(f"{url}/calculate").status_code == 200
+        # The server schedules in the request thread unless configured otherwise
+        assert project.schedule_workers == server.app.config['SCHEDULE_WORKERS'] == 1
+        loaded.calculate_schedule()
+        assert schedule_rows(loaded) == schedule_rows(project)
+    finally:
+        server.projects.discard(project_id)
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    for use_table in (False, True):
+        test_edit_single_tasks(use_table)
+    test_edit_routes()
+
+    print("\n" + "=" * 60)
+    print("ALL TASK EDIT TESTS PASSED!")
+    print("=" * 60)
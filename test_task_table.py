@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Test columnar task storage (TaskTable) against the default task list."""
+
+import os
+from conftest import make_project, schedule_rows
+from models import Task, Employee, TaskTable, TaskView
+from excel_export import export_to_excel
+from excel_import import import_from_excel
+
+
+def _make_project(use_table=False):
+    alice = Employee("Alice")
+    alice.add_holiday("2025-01-09")
+    tasks = []
+    for idx in range(20):
+        task = Task(f"Task {idx}", 2 + idx % 4, "Alice" if idx % 2 else "Bob")
+        if idx:
+            task.dependency = f"Task {idx // 2}"
+        task.availability = 50 if idx % 5 == 0 else 100
+        tasks.append(task)
+    project = make_project("Table Test", [alice, "Bob"], tasks, use_table)
+    project.add_global_holiday("2025-01-15")
+    return project
+
+
+def test_table_matches_list():
+    """A TaskTable project schedules exactly like a list-backed one."""
+
+    print("\nTesting TaskTable schedule...")
+
+    listed = _make_project()
+    listed.calculate_schedule()
+
+    tabled = _make_project(use_table=True)
+    assert isinstance(tabled.tasks, TaskTable)
+    tabled.calculate_schedule()
+    assert schedule_rows(tabled) == schedule_rows(listed)
+    assert tabled.get_date_range() == listed.get_date_range()
+
+    # Switching after scheduling keeps the computed dates
+    listed.use_task_table()
+    assert all(isinstance(task, TaskView) for task in listed.tasks)
+    assert schedule_rows(listed) == schedule_rows(tabled)
+    print("   Test passed!")
+
+
+def test_table_edits_reschedule_incrementally():
+    """Edits through a view only recompute the tasks they affect."""
+
+    print("\nTesting TaskTable edits...")
+
+    project = _make_project(use_table=True)
+    project.calculate_schedule()
+
+    recomputed = []
+    original = project._reschedule_row
+
+    def tracking_reschedule(row, pred_row):
+        recomputed.append(project.tasks[row].name)
+        return original(row, pred_row)
+
+    project._reschedule_row = tracking_reschedule
+
+    # Task 19 has no dependents
+    project.tasks[19].estimated_duration = 9
+    project.calculate_schedule()
+    assert recomputed == ["Task 19"], f"Unexpected recompute {recomputed}"
+
+    # Replacing the task list keeps surviving views and their schedule
+    recomputed.clear()
+    view = project.tasks[3]
+    end_date = view.end_date
+    tasks = list(project.tasks)[:10] + [Task("Extra", 1, "Bob")]
+    project.set_tasks(tasks)
+    assert project.tasks[3] is view and view.end_date == end_date
+    assert len(project.tasks) == 11
+    project.calculate_schedule()
+    assert recomputed == ["Extra"], f"Unexpected recompute {recomputed}"
+
+    expected = _make_project()
+    expected.set_tasks(list(expected.tasks)[:10] + [Task("Extra", 1, "Bob")])
+    expected.calculate_schedule()
+    assert schedule_rows(project) == schedule_rows(expected)
+
+    # Whole numbers in any form are stored; fractions are rejected clearly
+    project.tasks[0].estimated_duration = 3.0
+    project.tasks[0].availability = "80"
+    assert project.tasks[0].estimated_duration == 3 and project.tasks[0].availability == 80
+    for field, value in (('estimated_duration', 2.5), ('contingency_margin', 'ten')):
+        try:
+            setattr(project.tasks[0], field, value)
+            assert False, f"Should have rejected {field}={value!r}"
+        except ValueError:
+            pass
+    print("   Test passed!")
+
+
+def test_table_export():
+    """The exporter reads TaskTable columns."""
+
+    print("\nTesting TaskTable export...")
+
+    project = _make_project(use_table=True)
+    project.calculate_schedule()
+    filename = "test_task_table.xlsx"
+    export_to_excel(project, filename)
+
+    try:
+        data = import_from_excel(filename)
+    finally:
+        os.remove(filename)
+
+    assert [task['name'] for task in data['tasks']] == [task.name for task in project.tasks]
+    assert data['tasks'][3]['dependency'] == "Task 1"
+    print("   Test passed!")
+
+
+if __name__ == '__main__':
+    test_table_matches_list()
+    test_table_edits_reschedule_incrementally()
+    test_table_export()
+
+    print("\n" + "=" * 60)
+    print("ALL TASK TABLE TESTS PASSED!")
+    print("=" * 60)